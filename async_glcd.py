@@ -0,0 +1,162 @@
+""" asyncio interface to the ST7565 display.
+
+SPI transfers run on a single dedicated worker thread so they never block the
+event loop and stay in order.  Power up delays use asyncio.sleep.  Drawing
+primitives are forwarded to the Glcd unchanged since they only touch the
+back buffer.
+
+Usage:
+    async def main():
+        display = AsyncGlcd(st7565.Glcd())
+        await display.init()
+        display.draw_line(0, 0, 127, 63)
+        await display.flip()
+"""
+from __future__ import print_function
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import time
+
+
+class AsyncGlcd(object):
+    """asyncio wrapper around a Glcd object
+    Attributes:
+        glcd: Wrapped Glcd object
+        flips: Number of frames sent
+        coalesced: Number of flip requests merged into another flip
+    Note:
+        Flip packs the back buffer when the transfer starts.  Flips requested
+        while a frame is being sent are merged into one following frame.
+    """
+
+    def __init__(self, glcd, executor=None):
+        """Constructor for async display.
+        Args:
+            glcd (Glcd object): Display
+            executor (Optional Executor): Runs SPI transfers. Default is None
+                (a dedicated single thread).
+        """
+        self.glcd = glcd
+        self.own_executor = executor is None
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1)
+        self.executor = executor
+        self.flips = 0
+        self.coalesced = 0
+        # Flip being sent and flip waiting to start
+        self.__current = None
+        self.__pending = None
+
+    def __getattr__(self, name):
+        # Drawing primitives and other attributes come from the Glcd
+        return getattr(self.glcd, name)
+
+    def run(self, func, *args, **kwargs):
+        """Runs a blocking function on the transfer thread
+        Args:
+            func (function): Function to run
+            args, kwargs: Function arguments
+        Returns:
+            Future: Awaitable result of the function
+        """
+        loop = asyncio.get_event_loop()
+        return loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def run_steps(self, steps):
+        """Runs a generator of blocking steps with asyncio delays between them
+        Args:
+            steps (generator): Yields the seconds to wait after each step
+        """
+        while True:
+            delay = await self.run(next, steps, None)
+            if delay is None:
+                return
+            await asyncio.sleep(delay)
+
+    async def init(self, warm=False):
+        """Initialize ST7565 display (see Glcd.init)"""
+        await self.run_steps(self.glcd.init_steps(warm))
+
+    async def reset(self):
+        """Reset ST7565 display"""
+        await self.run_steps(self.glcd.reset_steps())
+
+    async def flip(self):
+        """Send back buffer to ST7565 display
+        Note:
+            Returns once a frame packed after the call has been sent.
+        """
+        if self.__pending is None:
+            self.__pending = asyncio.ensure_future(self.__send_flip(self.__current))
+        else:
+            self.coalesced += 1
+        # Cancelling one caller must not cancel the shared flip
+        await asyncio.shield(self.__pending)
+
+    async def __send_flip(self, previous):
+        """Sends a frame once the previous flip finishes"""
+        if previous is not None:
+            await asyncio.wait([previous])
+        task = self.__pending
+        self.__current, self.__pending = task, None
+        try:
+            # Snapshot the back buffer on the event loop so drawing cannot tear it
+            frame = self.glcd.pack_frame()
+            await self.run(self.glcd.send_frame, frame)
+            self.flips += 1
+        finally:
+            if self.__current is task:
+                self.__current = None
+
+    async def flip_region(self, x, y, w, h):
+        """Send a rectangular region of the back buffer (see Glcd.flip_region)"""
+        await self.run(self.glcd.flip_region, x, y, w, h)
+
+    async def clear_display(self):
+        """Clear the display RAM"""
+        await self.run(self.glcd.clear_display)
+
+    async def set_contrast(self, level):
+        """Sets display contrast (see Glcd.set_contrast)"""
+        await self.run(self.glcd.set_contrast, level)
+
+    async def set_orientation(self, rotation=0, mirror_x=False, mirror_y=False, invert=False):
+        """Sets display orientation (see Glcd.set_orientation)"""
+        await self.run(self.glcd.set_orientation, rotation, mirror_x, mirror_y, invert)
+
+    async def frame_loop(self, draw, fps=30, frames=None):
+        """Calls a drawing function and flips at a target frame rate
+        Args:
+            draw (function or coroutine function): Called with the frame number
+                to draw the next frame.  Returning False stops the loop.
+            fps (Optional float): Target frames per second. Default is 30.
+            frames (Optional int): Number of frames. Default is None (until stopped).
+        Returns:
+            int: Number of frames drawn
+        """
+        interval = 1.0 / fps
+        next_frame = time.time()
+        count = 0
+        while frames is None or count < frames:
+            result = draw(count)
+            if asyncio.iscoroutine(result):
+                result = await result
+            if result is False:
+                break
+            await self.flip()
+            count += 1
+            # Pace frames against a fixed schedule to avoid drift
+            next_frame += interval
+            delay = next_frame - time.time()
+            if delay <= 0:
+                next_frame = time.time()
+                delay = 0
+            await asyncio.sleep(delay)
+        return count
+
+    async def cleanup(self):
+        """Cleans up the display and stops the transfer thread"""
+        await self.run(self.glcd.cleanup)
+        if self.own_executor:
+            self.executor.shutdown(wait=False)
@@ -0,0 +1,51 @@
+""" Measures the achievable temporal grayscale subframe rate.
+
+Shows a gray level test pattern and times unpaced subframes.  Runs against
+the emulated board by default or against the real display with --hardware.
+Around 60 subframes per second or more per gray step is needed to keep
+flicker low, i.e. 180 for 4 levels.
+"""
+from __future__ import print_function
+import argparse
+import emulator
+import st7565
+from grayscale import GrayscaleDriver
+
+
+def draw_pattern(canvas):
+    """Draws vertical bars of every gray level with a solid frame"""
+    bar = canvas.width // canvas.levels
+    for level in range(canvas.levels):
+        canvas.fill_rectangle(level * bar, 8, bar, canvas.height - 16, color=level)
+    canvas.fill_rectangle(0, 0, canvas.width, 8, color=canvas.levels - 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--hardware', action='store_true', help='use the real display')
+    parser.add_argument('--count', type=int, default=200, help='subframes per test')
+    parser.add_argument('--speed', type=int, default=250000, help='emulated SPI clock in Hz')
+    args = parser.parse_args()
+
+    if args.hardware:
+        glcd = st7565.Glcd()
+    else:
+        board = emulator.EmulatedBoard(speed_hz=args.speed, realtime=True)
+        glcd = board.glcd()
+    glcd.init()
+
+    for levels in (3, 4, 5):
+        driver = GrayscaleDriver(glcd, levels)
+        draw_pattern(driver.canvas)
+        driver.update()
+        # First subframe sends every page
+        driver.show_subframe()
+        rate, size = driver.measure_rate(args.count)
+        print('{0} levels: {1:8.1f} subframes/s, {2:7.1f} bytes/subframe, '
+              '{3:6.1f} Hz per level cycle'.format(levels, rate, size,
+                                                   rate / max(levels - 1, 1)))
+    glcd.cleanup()
+
+
+if __name__ == '__main__':
+    main()
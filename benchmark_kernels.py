@@ -0,0 +1,84 @@
+""" Compares the Python and Numba raster kernel backends.
+
+Draws the same random shapes with each available backend, checks that every
+shape gives identical pixels and prints the average time per primitive.
+"""
+from __future__ import print_function
+import argparse
+import time
+import numpy as np
+from canvas import Canvas
+import kernels
+
+PRIMITIVES = ('draw_line', 'draw_circle', 'fill_circle', 'draw_ellipse',
+              'fill_ellipse', 'fill_polygon')
+
+
+def random_args(name, rng):
+    """Random on grid arguments for a primitive"""
+    if name == 'draw_line':
+        return (int(rng.integers(0, 128)), int(rng.integers(0, 64)),
+                int(rng.integers(0, 128)), int(rng.integers(0, 64)))
+    r = int(rng.integers(1, 31))
+    x0, y0 = int(rng.integers(r, 128 - r)), int(rng.integers(r, 64 - r))
+    if name in ('draw_circle', 'fill_circle'):
+        return x0, y0, r
+    if name in ('draw_ellipse', 'fill_ellipse'):
+        return x0, y0, int(rng.integers(1, min(x0, 127 - x0) + 1)), r
+    return int(rng.integers(3, 9)), x0, y0, r, float(rng.uniform(0, 360))
+
+
+def run(name, shapes):
+    """Draws shapes with the current backend
+    Returns:
+        float: Seconds per shape
+    """
+    canvas = Canvas(128, 64)
+    draw = getattr(canvas, name)
+    start = time.time()
+    for idx, args in enumerate(shapes):
+        if idx % 16 == 0:
+            canvas.clear()
+        draw(*args)
+    return (time.time() - start) / len(shapes)
+
+
+def render(name, shapes):
+    """Draws each shape on its own canvas with the current backend
+    Returns:
+        Numpy 3D array: Pixels of every shape
+    """
+    pixels = np.zeros((len(shapes), 64, 128), dtype='uint8')
+    for idx, args in enumerate(shapes):
+        getattr(Canvas(128, 64, pixels[idx]), name)(*args)
+    return pixels
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=2000, help='shapes per primitive')
+    args = parser.parse_args()
+
+    backends = sorted(kernels.BACKENDS)
+    if len(backends) == 1:
+        print('Numba is not installed, only the Python backend is available.')
+    rng = np.random.default_rng(0)
+    print('{0:14}'.format('') + ''.join('{0:>12}'.format(b) for b in backends))
+    for name in PRIMITIVES:
+        shapes = [random_args(name, rng) for _ in range(args.count)]
+        times = []
+        results = []
+        for backend in backends:
+            kernels.use_backend(backend)
+            # Warm up
+            run(name, shapes[:16])
+            times.append(run(name, shapes))
+            results.append(render(name, shapes))
+        same = all((pixels == results[0]).all() for pixels in results)
+        print('{0:14}'.format(name) +
+              ''.join('{0:9.1f} us'.format(t * 1e6) for t in times) +
+              ('' if same else '  MISMATCH'))
+
+
+if __name__ == '__main__':
+    main()
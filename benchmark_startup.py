@@ -0,0 +1,75 @@
+""" Measures time from process start to content on screen.
+
+Cold start resets and powers up the display.  Warm start reuses the state of
+a display left running (e.g. by a crashed service).  Runs against the
+emulated board by default or against the real display with --hardware.
+"""
+from __future__ import print_function
+import argparse
+import time
+import numpy as np
+import emulator
+import st7565
+
+
+def time_to_content(create_glcd, warm):
+    """Times display setup, init and the first flip
+    Args:
+        create_glcd (function): Returns a new Glcd object
+        warm (boolean): Warm init
+    Returns:
+        float, float: Seconds until init completes and until content is shown
+    """
+    start = time.time()
+    glcd = create_glcd()
+    glcd.init(warm=warm)
+    ready = time.time() - start
+    glcd.draw_rectangle(0, 0, 128, 64)
+    glcd.flip()
+    return ready, time.time() - start
+
+
+def warm_start_keeps_ram(board):
+    """Checks that a warm start leaves the display RAM untouched
+    Args:
+        board (EmulatedBoard): Emulated board
+    Returns:
+        boolean: Frame after the warm init equals the frame before the restart
+    """
+    glcd = board.glcd()
+    glcd.init()
+    glcd.draw_circle(64, 32, 20)
+    glcd.draw_line(0, 63, 127, 0)
+    glcd.flip()
+    before = board.controller.frame()
+    # Emulated restart: a new Glcd on the same board, sampled before any flip
+    board.glcd().init(warm=True)
+    after = board.controller.frame()
+    return bool(before.any() and (after == before).all())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--hardware', action='store_true', help='use the real display')
+    parser.add_argument('--runs', type=int, default=3, help='runs per mode')
+    parser.add_argument('--speed', type=int, default=250000, help='emulated SPI clock in Hz')
+    args = parser.parse_args()
+
+    if args.hardware:
+        create_glcd = st7565.Glcd
+    else:
+        board = emulator.EmulatedBoard(speed_hz=args.speed, realtime=True)
+        create_glcd = board.glcd
+
+    # First start is always cold
+    time_to_content(create_glcd, warm=False)
+    for warm in (False, True):
+        results = np.array([time_to_content(create_glcd, warm) for _ in range(args.runs)])
+        print('{0} start: init {1:7.2f} ms, content {2:7.2f} ms'.format(
+            'Warm' if warm else 'Cold', *(results.mean(axis=0) * 1000)))
+    if not args.hardware:
+        print('Display RAM intact after warm start:', warm_start_keeps_ram(board))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+""" Measures display throughput per SPI clock and transfer chunk size.
+
+Sends random frames through the emulated transport for every combination of
+clock and chunk size, checks that the emulated panel shows each frame and
+prints the achieved throughput.  The fastest combination that delivered
+every frame intact is recommended as Glcd(speed_hz=..., chunk_size=...).
+
+Model a board whose wiring fails above 2 MHz:
+    python calibrate_spi.py --max-reliable 2000000 --realtime
+"""
+from __future__ import print_function
+import argparse
+import time
+import numpy as np
+import emulator
+
+SPEEDS = (250000, 500000, 1000000, 2000000, 4000000, 8000000)
+CHUNK_SIZES = (8, 16, 32, 64, 128)
+
+
+class Result(object):
+    """Throughput of one SPI setting
+    Attributes:
+        speed_hz: SPI clock in hertz
+        chunk_size: Maximum bytes per transfer
+        bytes_per_second: Bytes sent per second
+        frames_per_second: Frames sent per second
+        errors: Frames the panel didn't show correctly
+    """
+
+    def __init__(self, speed_hz, chunk_size, bytes_per_second, frames_per_second, errors):
+        self.speed_hz = speed_hz
+        self.chunk_size = chunk_size
+        self.bytes_per_second = bytes_per_second
+        self.frames_per_second = frames_per_second
+        self.errors = errors
+
+
+def measure(board, glcd, frames, realtime=False):
+    """Sends frames with the board's current clock and the display's chunk size
+    Args:
+        board (EmulatedBoard): Board the display is wired to
+        glcd (Glcd object): Display on the board
+        frames ([Numpy 2D array]): Pixels of each frame
+        realtime (Optional boolean): Time with the wall clock. Default is
+            False (emulated bus time only).
+    Returns:
+        Result object
+    """
+    spi = board.spi
+    spi.reset_stats()
+    errors = 0
+    start = time.time()
+    for pixels in frames:
+        glcd.canvas.buffer[:] = pixels
+        glcd.flip()
+        if not np.array_equal(board.controller.frame(), pixels):
+            errors += 1
+    elapsed = time.time() - start if realtime else spi.busy_time
+    return Result(spi.max_speed_hz, glcd.chunk_size, spi.bytes / elapsed,
+                  len(frames) / elapsed, errors)
+
+
+def calibrate(speeds=SPEEDS, chunk_sizes=CHUNK_SIZES, count=20, realtime=False,
+              max_reliable_hz=None):
+    """Measures every combination of clock and chunk size
+    Args:
+        speeds (Optional [int]): SPI clocks in hertz
+        chunk_sizes (Optional [int]): Maximum bytes per transfer
+        count (Optional int): Frames per combination. Default is 20.
+        realtime (Optional boolean): Time with the wall clock. Default is False.
+        max_reliable_hz (Optional int): Emulated clock limit of the wiring.
+            Default is None (always reliable).
+    Returns:
+        [Result]: Result per combination
+    """
+    board = emulator.EmulatedBoard(realtime=realtime, max_reliable_hz=max_reliable_hz)
+    glcd = board.glcd()
+    glcd.init()
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 2, (glcd.LCD_HEIGHT, glcd.LCD_WIDTH), dtype='uint8')
+              for _ in range(count)]
+    results = []
+    for speed in speeds:
+        board.spi.max_speed_hz = speed
+        for chunk_size in chunk_sizes:
+            glcd.chunk_size = min(chunk_size, board.spi.bufsiz)
+            results.append(measure(board, glcd, frames, realtime))
+    return results
+
+
+def best_setting(results):
+    """Gets the fastest setting without errors
+    Args:
+        results ([Result]): Calibration results
+    Returns:
+        Result object or None if every setting failed
+    """
+    safe = [r for r in results if not r.errors]
+    if not safe:
+        return None
+    return max(safe, key=lambda r: r.bytes_per_second)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--speeds', type=int, nargs='+', default=SPEEDS, help='SPI clocks in Hz')
+    parser.add_argument('--chunks', type=int, nargs='+', default=CHUNK_SIZES,
+                        help='bytes per transfer')
+    parser.add_argument('--frames', type=int, default=20, help='frames per setting')
+    parser.add_argument('--realtime', action='store_true',
+                        help='time with the wall clock (includes Python overhead)')
+    parser.add_argument('--max-reliable', type=int, default=None,
+                        help='emulated clock in Hz above which data is corrupted')
+    args = parser.parse_args()
+
+    results = calibrate(args.speeds, args.chunks, args.frames, args.realtime, args.max_reliable)
+    print('{0:>10} {1:>6} {2:>10} {3:>8} {4:>7}'.format('clock Hz', 'chunk', 'KB/s', 'fps', 'errors'))
+    for r in results:
+        print('{0:>10} {1:>6} {2:>10.1f} {3:>8.1f} {4:>7}'.format(
+            r.speed_hz, r.chunk_size, r.bytes_per_second / 1024, r.frames_per_second, r.errors))
+    best = best_setting(results)
+    if best is None:
+        print('No setting delivered every frame intact.')
+    else:
+        print('Fastest safe setting: Glcd(speed_hz={0}, chunk_size={1})'.format(
+            best.speed_hz, best.chunk_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,670 @@
+from __future__ import print_function
+from functools import lru_cache
+import math
+import numpy as np
+from dither import bayer_thresholds
+from image_import import load_pbm
+import kernels
+from text_layout import layout_text
+
+# Drawing primitives shared by Canvas and objects composing a Canvas
+PRIMITIVES = ('is_off_grid', 'is_point', 'draw_point', 'draw_line', 'draw_lines',
+              'draw_rectangle', 'fill_rectangle', 'draw_circle', 'fill_circle',
+              'draw_ellipse', 'fill_ellipse', 'draw_polygon', 'fill_polygon',
+              'draw_letter', 'draw_string', 'draw_text_box', 'draw_bitmap',
+              'draw_bitmap_transformed', 'blit', 'load_bitmap', 'save_bitmap')
+
+
+def canvas_primitives(cls):
+    """Class decorator forwarding the drawing primitives to self.canvas
+    Args:
+        cls (class): Class with a canvas attribute
+    Returns:
+        class: Decorated class
+    Note:
+        Methods already defined by the class are not replaced.
+    """
+    def forward(name):
+        def method(self, *args, **kwargs):
+            return getattr(self.canvas, name)(*args, **kwargs)
+        method.__name__ = name
+        method.__doc__ = getattr(Canvas, name).__doc__
+        return method
+    for name in PRIMITIVES:
+        if name not in cls.__dict__:
+            setattr(cls, name, forward(name))
+    return cls
+
+
+def load_bitmap(path, width, height, invert=False):
+    """Loads a monochrome bitmap (raw or packed PBM format)
+    Args:
+        path (string): full source path of raw or .pbm bitmap file.
+        width (int): Pixel width of bitmap (raw only).
+        height (int): Pixel height of bitmap (raw only).
+        invert (Optional boolan): True inverts monochrome color. Default is false.
+    Returns:
+        Numpy 2D array
+    Note:
+        You can use the open-source IrfanView graphics program to convert images
+        to 1 bpp raw bitmaps, or image_import.py to dither grayscale images
+        to packed PBM files.
+    """
+    if path.lower().endswith('.pbm'):
+        return load_pbm(path) ^ invert
+    bmp = np.fromfile(path, dtype='uint8', sep='')
+    # Convert non black colors to 1.
+    bmp[bmp > 0] = 1
+    if invert:
+        return bmp.reshape(height, width)
+    else:
+        return bmp.reshape(height, width) ^ 1
+
+
+@lru_cache(maxsize=256)
+def get_transform_map(height, width, angle, scale):
+    """Maps destination pixels of a rotated and scaled bitmap to source pixels
+    Args:
+        height, width (int): Bitmap size
+        angle (float): Clockwise rotation in degrees
+        scale (float): Scale factor
+    Returns:
+        (Numpy array, Numpy array, Numpy array): Destination row and column offsets
+            relative to the placement point and flat source pixel indices
+    Note:
+        Maps are cached (least recently used are evicted) so reuse a small set
+        of angles, e.g. whole degrees, for animations.  Unscaled quarter turns
+        use the exact np.rot90 permutation so no pixel is lost or doubled.
+    """
+    if scale == 1 and angle % 90 == 0:
+        # Clockwise quarter turns of the source pixel indices
+        turned = np.rot90(np.arange(height * width).reshape(height, width), -int(angle // 90))
+        h, w = turned.shape
+        dy, dx = np.mgrid[-(h // 2):h - h // 2, -(w // 2):w - w // 2]
+        maps = dy.ravel(), dx.ravel(), turned.ravel()
+        for m in maps:
+            m.flags.writeable = False
+        return maps
+    radius = int(math.ceil(math.hypot(width, height) * scale / 2)) + 1
+    offsets = np.arange(-radius, radius + 1)
+    dy, dx = np.meshgrid(offsets, offsets, indexing='ij')
+    # Destination pixel centers relative to the bitmap center
+    u = dx + 0.5 + width // 2 - width / 2.0
+    v = dy + 0.5 + height // 2 - height / 2.0
+    # Inverse rotation and scale into the source bitmap (nearest neighbor)
+    rad = math.radians(angle)
+    cos, sin = math.cos(rad) / scale, math.sin(rad) / scale
+    sx = np.floor(cos * u + sin * v + width / 2.0).astype('intp')
+    sy = np.floor(-sin * u + cos * v + height / 2.0).astype('intp')
+    inside = (sx >= 0) & (sx < width) & (sy >= 0) & (sy < height)
+    maps = dy[inside], dx[inside], sy[inside] * width + sx[inside]
+    for m in maps:
+        m.flags.writeable = False
+    return maps
+
+
+def get_pattern(pattern):
+    """Converts a fill pattern or gray level to a pattern of pixels
+    Args:
+        pattern (Numpy 2D array or float): Stipple pattern (non zero = on) or
+            gray level 0.0 (off) to 1.0 (on) mapped to an 8x8 Bayer pattern
+    Returns:
+        Numpy 2D array (bool): Pattern pixels
+    """
+    if np.isscalar(pattern):
+        return bayer_thresholds(8) < pattern
+    return np.asarray(pattern) != 0
+
+
+def pack_pages(pixels):
+    """Packs pixels to display pages
+    Args:
+        pixels (Numpy 2D array): Pixels (height must be a multiple of 8)
+    Returns:
+        Numpy 2D array (uint8): rows = pages, cols = columns (MSB is the top row of the page)
+    """
+    height, width = pixels.shape
+    return np.packbits(pixels.reshape(height >> 3, 8, width), axis=1)[:, 0, :]
+
+
+class Canvas(object):
+    """Offscreen monochrome drawing surface
+    Attributes:
+        buffer: A 2D Numpy array of pixels (rows, columns) 0 = off, 1 = on
+        width: Pixel width of canvas
+        height: Pixel height of canvas
+    Note:
+        All coordinates are zero based.
+        Does not require RPi.GPIO or spidev so it can be used in worker processes.
+    """
+
+    def __init__(self, width, height, buffer=None):
+        """Constructor for Canvas.
+        Args:
+            width (int): Pixel width of canvas
+            height (int): Pixel height of canvas
+            buffer (Optional Numpy array): Existing 2D uint8 array to draw on.
+                Default is None (allocates a cleared buffer).
+        """
+        self.width = width
+        self.height = height
+        if buffer is None:
+            buffer = np.zeros((height, width), dtype='uint8')
+        self.buffer = buffer
+
+    def clear(self):
+        """Clear canvas"""
+        self.buffer[:] = 0
+
+    def pack(self):
+        """Packs canvas pixels to display pages
+        Returns:
+            Numpy 2D array (uint8): rows = pages, cols = columns (MSB is the top row of the page)
+        Note:
+            Canvas height must be a multiple of 8.
+        """
+        return pack_pages(self.buffer)
+
+    def blit(self, canvas, x=0, y=0):
+        """Draws another canvas onto this canvas
+        Args:
+            canvas (Canvas object): Source canvas
+            x, y (int): Top left coordinates to place source canvas
+        Note:
+            The source canvas is clipped to this canvas.
+        """
+        # Clip source to target boundaries
+        x1, y1 = max(x, 0), max(y, 0)
+        x2, y2 = min(x + canvas.width, self.width), min(y + canvas.height, self.height)
+        if x1 >= x2 or y1 >= y2:
+            return
+        self.buffer[y1:y2, x1:x2] = canvas.buffer[y1 - y:y2 - y, x1 - x:x2 - x]
+
+    def fill_pattern(self, rows, cols, pattern, color=1, invert=False):
+        """Fills pixels with a pattern tiled from the canvas origin
+        Args:
+            rows, cols (Numpy array): Pixel coordinates to fill
+            pattern (Numpy 2D array or float): Stipple pattern or gray level (see get_pattern)
+            color (Optional int): Color of pattern on pixels (off pixels get the opposite)
+            invert (Optional boolean): Inverts pixels where the pattern is on (overrides color)
+        """
+        pattern = get_pattern(pattern)
+        ph, pw = pattern.shape
+        on = pattern[rows % ph, cols % pw]
+        # One masked write for the whole shape
+        if invert:
+            self.buffer[rows, cols] ^= on
+        else:
+            self.buffer[rows, cols] = np.where(on, color, int(not color))
+
+    def fill_shape(self, name, args, color, invert, pattern):
+        """Fills a shape primitive with a pattern
+        Args:
+            name (string): Fill primitive drawing the shape
+            args (tuple): Shape arguments (without color)
+            color, invert, pattern: See fill_pattern
+        """
+        # Rasterize the shape as a mask
+        mask = Canvas(self.width, self.height)
+        getattr(mask, name)(*args)
+        rows, cols = np.nonzero(mask.buffer)
+        self.fill_pattern(rows, cols, pattern, color, invert)
+
+    def is_off_grid(self, xmin, ymin, xmax, ymax):
+        """Checks if drawing coordinates extends past canvas boundaries
+        Args:
+            xmin (int): Minimum horizontal pixel.
+            ymin (int): Minimum vertical pixel.
+            xmax (int): Maximum horizontal pixel.
+            ymax (int): Maximum vertical pixel.
+        Returns:
+            boolean: False = Coordinates OK, True = Error.
+        """
+        if xmin < 0:
+            print('x-coordinate: {0} below minimum of 0.'.format(xmin))
+            return True
+        if ymin < 0:
+            print('y-coordinate: {0} below minimum of 0.'.format(ymin))
+            return True
+        if xmax >= self.width:
+            print('x-coordinate: {0} above maximum of {1}.'.format(xmax, self.width - 1))
+            return True
+        if ymax >= self.height:
+            print('y-coordinate: {0} above maximum of {1}.'.format(ymax, self.height - 1))
+            return True
+        return False
+
+    def is_point(self, x, y):
+        """Determines if coordinates on canvas has a drawn point
+        Args:
+            x, y (int): Coordinates of point
+        Returns boolean: True if pixel is drawn.  False is blank.
+        """
+        # Confirm coordinates in boundary
+        if self.is_off_grid(x, y, x, y):
+            return False
+        return self.buffer[y, x] == 1
+
+    def draw_point(self, x, y, color=1, invert=False):
+        """Draws a single point on the canvas
+        Args:
+            x, y (int): Coordinates of point
+            color (Optional int): 0 = pixel off, 1 = pixel on (default)
+            invert (Optional boolean): Inverts target pixel (overrides color)
+        """
+        if not 0 <= x < self.width:
+            print('x-coordinate: {0} outside display range of 0 to {1} .').format(x, self.width - 1)
+            return
+        if not 0 <= y < self.height:
+            print('y-coordinate: {0} outside display range of 0 to {1} .').format(x, self.height - 1)
+            return
+        if invert:
+            self.buffer[y, x] ^= 1
+        else:
+            self.buffer[y, x] = color
+
+    def draw_line(self, x1, y1, x2, y2, color=1, invert=False):
+        """Draws a line on the canvas using Bresenham's algorithm
+        Args:
+            x1, y1 (int): Starting coordinates of the line
+            x2, y2 (int): Ending coordinates of the line
+            color (Optional int): 0 = pixel off, 1 = pixel on (default)
+            invert (Optional boolean): Inverts target pixel (overrides color)
+        """
+        # Confirm coordinates in boundary
+        if self.is_off_grid(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)):
+            return
+        # Check for horizontal line
+        if y1 == y2:
+            if x1 > x2:
+                x1, x2 = x2, x1
+            if invert:
+                self.buffer[y1, x1:x2 + 1] ^= 1
+            else:
+                self.buffer[y1, x1:x2 + 1] = color
+            return
+        # Check for vertical line
+        if x1 == x2:
+            if y1 > y2:
+                y1, y2 = y2, y1
+            if invert:
+                self.buffer[y1:y2 + 1, x1] ^= 1
+            else:
+                self.buffer[y1:y2 + 1, x1] = color
+            return
+        # Bresenham walk in the raster kernel then one write
+        xs, ys = kernels.line_points(x1, y1, x2, y2)
+        if invert:
+            self.buffer[ys, xs] ^= 1
+        else:
+            self.buffer[ys, xs] = color
+
+    def draw_lines(self, coords, color=1, invert=False):
+        """Draws multiple lines on the canvas
+        Args:
+            coords (Numpy 2D array dtype=Uint8): Line coordinate x,y pairs per row
+            color (Optional int): 0 = pixel off, 1 = pixel on (default)
+            invert (Optional boolean): Inverts target pixel (overrides color)
+        """
+        # Expects numpy array with (n, 2) shape
+        if coords.shape[1] != 2:
+            return
+        # Starting point
+        x1, y1 = coords[0]
+        # Iterate through coordinates
+        for row in coords[1:]:
+            x2, y2 = row
+            self.draw_line(x1, y1, x2, y2, color, invert)
+            x1, y1 = x2, y2
+
+    def draw_rectangle(self, x1, y1, w, h, color=1, invert=False):
+        """Draws a rectangle on the canvas
+        Args:
+            x1, y1 (int): Top left coordinates of rectangle
+            w, h (int): Width & height in pixels of rectangle
+            color (Optional int): 0 = pixel off, 1 = pixel on (default)
+            invert (Optional boolean): Inverts target pixel (overrides color)
+        """
+        # Determine x2, y2
+        x2 = x1 + w - 1
+        y2 = y1 + h - 1
+
+        if self.is_off_grid(x1, y1, x2, y2):
+            return
+        if invert:
+            # Top
+            self.buffer[y1, x1 + 1:x2] ^= 1
+            # Bottom
+            self.buffer[y2, x1:x2 + 1] ^= 1
+            # Left
+            self.buffer[y1:y2, x1] ^= 1
+            # Right
+            self.buffer[y1:y2, x2] ^= 1
+        else:
+            # Top
+            self.buffer[y1, x1:x2] = color
+            # Bottom
+            self.buffer[y2, x1:x2 + 1] = color
+            # Left
+            self.buffer[y1:y2, x1] = color
+            # Right
+            self.buffer[y1:y2, x2] = color
+
+    def fill_rectangle(self, x1, y1, w, h, color=1, invert=False, pattern=None):
+        """Draws a filled rectangle on the canvas
+        Args:
+            x1, y1 (int): Top left coordinates of rectangle
+            w, h (int): Width & height in pixels of rectangle
+            color (Optional int): 0 = pixel off, 1 = pixel on (default)
+            invert (Optional boolean): Inverts target pixel (overrides color)
+            pattern (Optional Numpy 2D array or float): Stipple pattern or gray
+                level (see get_pattern). Default is None (solid).
+        """
+        if self.is_off_grid(x1, y1, x1 + w - 1, y1 + h - 1):
+            return
+        if pattern is not None:
+            rows, cols = np.mgrid[y1:min(y1 + h, self.height), x1:min(x1 + w, self.width)]
+            self.fill_pattern(rows.ravel(), cols.ravel(), pattern, color, invert)
+            return
+        # Draw filled rectangle
+        if invert:
+            self.buffer[y1:y1 + h, x1:x1 + w] ^= 1
+        else:
+            self.buffer[y1:y1 + h, x1:x1 + w] = color
+
+    def draw_circle(self, x0, y0, r, color=1):
+        """Draws a circle on the canvas
+        Args:
+            x0, y0 (int): Pixel coordinates of center point
+            r (int): Radius
+            color (Optional int): 0 = pixel off, 1 = pixel on (default)
+        Note:
+            The center point is the center of the x0,y0 pixel.
+            Since pixels are not divisible, the radius is integer rounded
+            up to complete on a full pixel.  Therefore diameter = 2 x r + 1.
+        """
+        if self.is_off_grid(x0 - r, y0 - r, x0 + r, y0 + r):
+            return
+        xs, ys = kernels.circle_octant(r)
+        # Mirror the octant around the center
+        cols = np.concatenate((xs, -xs, xs, -xs, ys, -ys, ys, -ys)) + x0
+        rows = np.concatenate((ys, ys, -ys, -ys, xs, xs, -xs, -xs)) + y0
+        self.buffer[rows, cols] = color
+
+    def fill_circle(self, x0, y0, r, color=1, pattern=None):
+        """Draws a filled circle on the canvas
+        Args:
+            x0, y0 (int): Center point coordinates
+            r (int): Radius
+            color (Optional int): 0 = pixel off, 1 = pixel on (default)
+            pattern (Optional Numpy 2D array or float): Stipple pattern or gray
+                level (see get_pattern). Default is None (solid).
+        Note:
+            The center point is the center of the x0,y0 pixel.
+            Since pixels are not divisible, the radius is integer rounded
+            up to complete on a full pixel.  Therefore diameter = 2 x r + 1.
+        """
+        if self.is_off_grid(x0 - r, y0 - r, x0 + r, y0 + r):
+            return
+        if pattern is not None:
+            self.fill_shape('fill_circle', (x0, y0, r), color, False, pattern)
+            return
+        xs, ys = kernels.circle_octant(r)
+        # Vertical spans of the mirrored octant
+        cols = np.concatenate((xs, -xs, -ys, ys)) + x0
+        tops = np.concatenate((-ys, -ys, -xs, -xs)) + y0
+        bottoms = np.concatenate((ys, ys, xs, xs)) + y0
+        kernels.fill_spans(self.buffer.T, cols, tops, bottoms, color, False)
+
+    def draw_ellipse(self, x0, y0, a, b, color=1):
+        """Draws an ellipse on the canvas
+        Args:
+            x0, y0 (int): Pixel coordinates of center point
+            a (int): Semi axis horizontal
+            b (int): Semi axis vertical
+            color (Optional int): 0 = pixel off, 1 = pixel on (default)
+        Note:
+            The center point is the center of the x0,y0 pixel.
+            Since pixels are not divisible, the axes are integer rounded
+            up to complete on a full pixel.  Therefore the major and
+            minor axes are increased by 1.
+        """
+        if self.is_off_grid(x0 - a, y0 - b, x0 + a, y0 + b):
+            return
+        xs, ys = kernels.ellipse_quadrant(a, b)
+        # Mirror the quadrant around the center
+        cols = np.concatenate((xs, -xs, xs, -xs)) + x0
+        rows = np.concatenate((ys, ys, -ys, -ys)) + y0
+        self.buffer[rows, cols] = color
+
+    def fill_ellipse(self, x0, y0, a, b, color=1, pattern=None):
+        """Draws a filled ellipse on the canvas
+        Args:
+            x0, y0 (int): Pixel coordinates of center point
+            a (int): Semi axis horizontal
+            b (int): Semi axis vertical
+            color (Optional int): 0 = pixel off, 1 = pixel on (default)
+            pattern (Optional Numpy 2D array or float): Stipple pattern or gray
+                level (see get_pattern). Default is None (solid).
+        Note:
+            The center point is the center of the x0,y0 pixel.
+            Since pixels are not divisible, the axes are integer rounded
+            up to complete on a full pixel.  Therefore the major and
+            minor axes are increased by 1.
+        """
+        if self.is_off_grid(x0 - a, y0 - b, x0 + a, y0 + b):
+            return
+        if pattern is not None:
+            self.fill_shape('fill_ellipse', (x0, y0, a, b), color, False, pattern)
+            return
+        xs, ys = kernels.ellipse_quadrant(a, b)
+        # Vertical spans of the mirrored quadrant
+        cols = np.concatenate((xs, -xs)) + x0
+        tops = np.concatenate((-ys, -ys)) + y0
+        bottoms = np.concatenate((ys, ys)) + y0
+        kernels.fill_spans(self.buffer.T, cols, tops, bottoms, color, False)
+
+    def draw_polygon(self, sides, x0, y0, r, rotate=0, color=1):
+        """Draws an n-sided regular polygon on the canvas
+        Args:
+            sides (int): Number of polygon sides
+            x0, y0 (int): Center point coordinates
+            r (int): Radius
+            rotate (Optional float): Rotation in degrees relative to origin. Default is 0.
+            color (Optional int): 0 = pixel off, 1 = pixel on (default)
+        Note:
+            The center point is the center of the x0,y0 pixel.
+            Since pixels are not divisible, the radius is integer rounded
+            up to complete on a full pixel.  Therefore diameter = 2 x r + 1.
+        """
+        coords = np.empty(shape=[sides + 1, 2], dtype="float64")
+        n = np.arange(sides, dtype="float64")
+        theta = math.radians(rotate)
+        for s in n:
+            t = 2.0 * math.pi * s / sides + theta
+            coords[int(s), 0] = r * math.cos(t) + x0
+            coords[int(s), 1] = r * math.sin(t) + y0
+        coords[sides] = coords[0]
+        # Cast to python float first to fix rounding errors
+        self.draw_lines(coords.astype("float32").astype("int32"), color=color)
+
+    def fill_polygon(self, sides, x0, y0, r, rotate=0, color=1, invert=False, pattern=None):
+        """Draws a filled n-sided regular polygon on the canvas
+        Args:
+            sides (int): Number of polygon sides
+            x0, y0 (int): Center point coordinates
+            r (int): Radius
+            rotate (Optional float): Rotation in degrees relative to origin. Default is 0.
+            color (Optional int): 0 = pixel off, 1 = pixel on (default)
+            invert (Optional boolean): Inverts target pixel (overrides color)
+            pattern (Optional Numpy 2D array or float): Stipple pattern or gray
+                level (see get_pattern). Default is None (solid).
+        Note:
+            The center point is the center of the x0,y0 pixel.
+            Since pixels are not divisible, the radius is integer rounded
+            up to complete on a full pixel.  Therefore diameter = 2 x r + 1.
+        """
+        if self.is_off_grid(x0 - r, y0 - r, x0 + r, y0 + r):
+            return
+        if pattern is not None:
+            self.fill_shape('fill_polygon', (sides, x0, y0, r, rotate), color, invert, pattern)
+            return
+        coords = np.empty(shape=[sides + 1, 2], dtype="float64")
+        n = np.arange(sides, dtype="float64")
+        theta = math.radians(rotate)
+        # Determine polygon coordinates
+        for s in n:
+            t = 2.0 * math.pi * s / sides + theta
+            coords[int(s), 0] = r * math.cos(t) + x0
+            coords[int(s), 1] = r * math.sin(t) + y0
+        coords[sides] = coords[0]
+        # Cast to python float first to fix rounding errors
+        coords = coords.astype("float32").astype("int32")
+        # Edge walk and span fill in the raster kernels
+        rows, x1s, x2s = kernels.polygon_spans(coords.astype('int64'))
+        kernels.fill_spans(self.buffer, rows, x1s, x2s, color, invert)
+
+    def draw_letter(self, letter, font, x, y, invert=False, landscape=True):
+        """Draws a single letter on the canvas
+        Args:
+            letter (string): Letter
+            font (XglcdFont object): Font
+            x, y (int): Top left coordinates to place font
+            invert (Optional boolean): If True inverts font monochrome color. Default is False
+            landscape (Optional boolean): Rotates letter 90 degrees.  Default is true.
+        Returns:
+            int, int: Width and height of the letter in pixels (0,0 if error)
+        """
+        # Get 2D Numpy array of specified letter
+        letter_array = font.get_letter(letter, landscape)
+        # Get height and width  of letter
+        h, w = letter_array.shape
+        if self.is_off_grid(x, y, x + w - 1, y + h - 1):
+            return 0, 0
+        # Draw letter on self.buffer (check if inverted)
+        if invert:
+            self.buffer[y:y + h, x:x + w] = letter_array ^ 1
+        else:
+            self.buffer[y:y + h, x:x + w] = letter_array
+        # return letter width and height
+        return w, h
+
+    def draw_string(self, text, font, x, y, spacing=1, invert=False, landscape=True):
+        """Draws a string of text on the canvas
+        Args:
+            text (string): Text
+            font (XglcdFont object): Font
+            x, y (int): Top left coordinates to place font
+            spacing (optonal int): Pixel spacing between letters. Default is 1.
+            invert (optional boolean): If True inverts font monochrome color. Default is False
+            landscape (optional boolean): Rotates text 90 degrees.  Default is true.
+        """
+        for letter in text:
+            # Get letter array and letter dimensions
+            w, h = self.draw_letter(letter, font, x, y, invert, landscape)
+            # Stop on error
+            if w == 0 & h == 0:
+                return
+            # Position cursor for next character depending on orientation
+            if landscape:
+                # Draw vertical spacing if inverted
+                if invert and spacing:
+                    self.buffer[y: y + h, x + w: x + w + spacing] = 1
+                # Position x for next letter
+                x += w + spacing
+            else:
+                # Draw horizontal spacing if inverted
+                if invert and spacing:
+                    self.buffer[y + h: y + h + spacing, x: x + w] = 1
+                # Position y for next letter
+                y += h + spacing
+
+    def draw_text_box(self, text, font, x, y, w, h, align='left', spacing=1,
+                      line_spacing=1, wrap=True, ellipsis='...', invert=False):
+        """Draws word wrapped and aligned text in a box on the canvas
+        Args:
+            text (string): Text (newlines start new paragraphs)
+            font (XglcdFont object): Font
+            x, y (int): Top left coordinates of box
+            w, h (int): Width & height in pixels of box
+            align (optional string): left, center or right. Default is left.
+            spacing (optional int): Pixel spacing between letters. Default is 1.
+            line_spacing (optional int): Pixel spacing between lines. Default is 1.
+            wrap (optional boolean): Word wrap long lines. Default is True (else truncate).
+            ellipsis (optional string): Marks truncated text. Default is '...'.
+            invert (optional boolean): If True inverts font monochrome color. Default is False
+        Returns:
+            TextLayout object: Cached layout of the text
+        """
+        layout = layout_text(font, text, w, h, align, spacing, line_spacing, wrap, ellipsis)
+        layout.draw(self, x, y, invert)
+        return layout
+
+    def draw_bitmap(self, bitmap, x=0, y=0):
+        """Draws a raw bitmap to the canvas
+        Args:
+            bitmap (Numpy array): 2D array of monochrome pixels
+            x, y (int): Top left coordinates to place bitmap
+        """
+        height, width = bitmap.shape
+        self.buffer[y:y + height, x:x + width] = bitmap
+
+    def draw_bitmap_transformed(self, bitmap, x0, y0, angle=0, scale=1, transparent=False):
+        """Draws a rotated and scaled bitmap to the canvas
+        Args:
+            bitmap (Numpy array): 2D array of monochrome pixels
+            x0, y0 (int): Placement point of the bitmap center
+            angle (Optional float): Clockwise rotation in degrees. Default is 0.
+            scale (Optional float): Scale factor. Default is 1.
+            transparent (Optional boolean): Only draw on pixels. Default is False.
+        Note:
+            Without rotation or scaling this matches
+            draw_bitmap(bitmap, x0 - width // 2, y0 - height // 2).
+            The pixel index map is cached for each size, angle and scale.
+        """
+        height, width = bitmap.shape
+        dy, dx, src = get_transform_map(height, width, angle, scale)
+        rows, cols = dy + y0, dx + x0
+        # Clip to canvas
+        inside = (rows >= 0) & (rows < self.height) & (cols >= 0) & (cols < self.width)
+        rows, cols = rows[inside], cols[inside]
+        pixels = bitmap.ravel()[src[inside]]
+        if transparent:
+            on = pixels != 0
+            self.buffer[rows[on], cols[on]] = 1
+        else:
+            self.buffer[rows, cols] = pixels
+
+    def load_bitmap(self, path, width=None, height=None, invert=False):
+        """Loads a monochrome bitmap (raw or packed PBM format)
+        Args:
+            path (string): full source path of raw or .pbm bitmap file.
+            width (Optional int): Pixel width of bitmap. Default is canvas width.
+            height (Optional int): Pixel height of bitmap. Default is canvas height.
+            invert (Optional boolan): True inverts monochrome color. Default is false.
+        Returns:
+            Numpy 2D array
+        """
+        return load_bitmap(path, width or self.width, height or self.height, invert)
+
+    def save_bitmap(self, path, x1=0, y1=0, width=None, height=None):
+        """Saves buffer or a portion of the buffer to a raw bitmap
+        Args:
+            path (string): full target path for raw bitmap file.
+            x1, y1 (Optional int): Top left corner of bitmap.  Default is 0, 0.
+            width (Optional int): Pixel width of bitmap. Default is canvas width.
+            height (Optional int): Pixel height of bitmap. Default is canvas height.
+        Note:
+            You can use the open-source IrfanView graphics program to open raw bitmaps.
+            You must know the width & height and the bpp which is 8
+        """
+        # Determine x2, y2
+        x2 = x1 + (width or self.width)
+        y2 = y1 + (height or self.height)
+
+        if self.is_off_grid(x1, y1, x2 - 1, y2 - 1):
+            return
+
+        bmp = self.buffer[y1:y2, x1:x2]
+        bmp[bmp > 0] = 255
+        bmp.tofile(path)
@@ -0,0 +1,176 @@
+from __future__ import print_function
+import numpy as np
+
+
+class TextConsole(object):
+    """Character cell text console aligned to the display pages
+    Attributes:
+        columns: Characters per row
+        rows: Text rows (one per display page)
+        grid: A 2D Numpy array of character codes (rows x columns)
+        cursor_x, cursor_y: Cursor column and row
+    Note:
+        Each text row is one 8 pixel display page so every cell maps to whole
+        page bytes.  Glyphs are packed to page bytes once and only cells that
+        changed since the last update are sent.  Requires a font 8 pixels or
+        less in height and a landscape orientation (0 or 180 degrees).
+    """
+    # Unchanged column bytes resent rather than moving the cursor (a move is
+    # 3 command bytes plus the overhead of 4 transfers instead of 1)
+    MAX_GAP_BYTES = 6
+
+    def __init__(self, glcd, font, spacing=1, auto_update=True):
+        """Constructor for text console.
+        Args:
+            glcd (Glcd object): Display
+            font (XglcdFont object): Font (8 pixels or less in height)
+            spacing (Optional int): Pixel spacing between characters. Default is 1.
+            auto_update (Optional boolean): Send changes after each write. Default is True.
+        Note:
+            Raises ValueError for fonts over 8 pixels high or a portrait orientation.
+        """
+        if font.height > 8:
+            raise ValueError('Font height {0} exceeds page height of 8.'.format(font.height))
+        if glcd.rotation not in (0, 180):
+            raise ValueError('Text console requires a landscape orientation.')
+        self.glcd = glcd
+        self.font = font
+        self.auto_update = auto_update
+        self.cell_width = font.width + spacing
+        self.columns = glcd.LCD_WIDTH // self.cell_width
+        self.rows = glcd.LCD_PAGE_COUNT
+        self.glyphs = self.pack_glyphs()
+        self.blank = ord(' ')
+        self.grid = np.full((self.rows, self.columns), self.blank, dtype='int32')
+        # Character codes last sent to the display (-1 forces a send)
+        self.sent = np.full((self.rows, self.columns), -1, dtype='int32')
+        self.cursor_x = 0
+        self.cursor_y = 0
+
+    def pack_glyphs(self):
+        """Packs every font letter into a cell of page bytes
+        Returns:
+            Numpy 2D array (uint8): One row of cell_width bytes per character code
+        """
+        font = self.font
+        count = font.start_letter + len(font.letters)
+        glyphs = np.zeros((max(count, 128), self.cell_width), dtype='uint8')
+        cell = np.zeros((8, self.cell_width), dtype='uint8')
+        for code in range(font.start_letter, count):
+            letter = font.get_letter(chr(code))
+            h, w = letter.shape
+            w = min(w, self.cell_width)
+            cell[:] = 0
+            cell[:h, :w] = letter[:, :w]
+            # MSB is the top row of the page
+            glyphs[code] = np.packbits(cell, axis=0)[0]
+        return glyphs
+
+    def clear(self):
+        """Clears the console and homes the cursor"""
+        self.grid[:] = self.blank
+        self.cursor_x = 0
+        self.cursor_y = 0
+        if self.auto_update:
+            self.update()
+
+    def set_cursor(self, x, y):
+        """Moves the cursor
+        Args:
+            x (int): Column
+            y (int): Row
+        """
+        self.cursor_x = min(max(x, 0), self.columns - 1)
+        self.cursor_y = min(max(y, 0), self.rows - 1)
+
+    def scroll(self, lines=1):
+        """Scrolls text up
+        Args:
+            lines (Optional int): Number of rows. Default is 1.
+        """
+        lines = min(lines, self.rows)
+        self.grid[:self.rows - lines] = self.grid[lines:]
+        self.grid[self.rows - lines:] = self.blank
+
+    def newline(self):
+        """Moves the cursor to the start of the next row (scrolls on the last row)"""
+        self.cursor_x = 0
+        if self.cursor_y == self.rows - 1:
+            self.scroll()
+        else:
+            self.cursor_y += 1
+
+    def write(self, text):
+        """Writes text at the cursor
+        Args:
+            text (string): Text (newline, carriage return and tab are supported)
+        Note:
+            Text wraps at the end of a row and scrolls at the bottom.
+        """
+        for letter in text:
+            if letter == '\n':
+                self.newline()
+                continue
+            if letter == '\r':
+                self.cursor_x = 0
+                continue
+            if letter == '\t':
+                self.write(' ' * (4 - self.cursor_x % 4))
+                continue
+            if self.cursor_x >= self.columns:
+                self.newline()
+            code = ord(letter)
+            if not self.font.start_letter <= code < len(self.glyphs):
+                code = self.blank
+            self.grid[self.cursor_y, self.cursor_x] = code
+            self.cursor_x += 1
+        if self.auto_update:
+            self.update()
+
+    def print(self, *args, **kwargs):
+        """Writes values like the print function
+        Args:
+            args: Values to print
+            sep (Optional string): Separator. Default is ' '.
+            end (Optional string): Ending. Default is newline.
+        """
+        sep = kwargs.get('sep', ' ')
+        end = kwargs.get('end', '\n')
+        self.write(sep.join(str(a) for a in args) + end)
+
+    def get_runs(self, row):
+        """Finds the changed cells of a row
+        Args:
+            row (int): Row
+        Returns:
+            [(int, int)]: First and last+1 column of each run of changed cells
+        """
+        changed = np.flatnonzero(self.grid[row] != self.sent[row])
+        runs = []
+        for col in changed:
+            # Bridge gaps of unchanged cells no wider than MAX_GAP_BYTES
+            if runs and (col - runs[-1][1]) * self.cell_width <= self.MAX_GAP_BYTES:
+                runs[-1][1] = col + 1
+            else:
+                runs.append([col, col + 1])
+        return runs
+
+    def update(self):
+        """Sends changed cells to the display
+        Returns:
+            int: Number of data bytes sent
+        """
+        sent = 0
+        buffer = self.glcd.get_panel_pixels()
+        for row in range(self.rows):
+            for c1, c2 in self.get_runs(row):
+                data = self.glyphs[self.grid[row, c1:c2]].ravel()
+                x = c1 * self.cell_width
+                self.glcd.write_page(row, data.tolist(), x)
+                # Keep back buffer in step for later flips
+                buffer[row << 3:(row + 1) << 3, x:x + data.size] = np.unpackbits(data[np.newaxis], axis=0)
+                self.sent[row, c1:c2] = self.grid[row, c1:c2]
+                sent += data.size
+        if sent:
+            self.glcd.end_frame()
+        return sent
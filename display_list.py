@@ -0,0 +1,232 @@
+from __future__ import print_function
+from inspect import signature
+import numpy as np
+from canvas import Canvas
+
+# Drawing primitives that can be recorded
+RECORDABLE = ('draw_point', 'draw_line', 'draw_lines', 'draw_rectangle',
+              'fill_rectangle', 'draw_circle', 'fill_circle', 'draw_ellipse',
+              'fill_ellipse', 'draw_polygon', 'fill_polygon', 'draw_letter',
+              'draw_string', 'draw_text_box', 'draw_bitmap',
+              'draw_bitmap_transformed', 'blit')
+
+
+def recorder(name):
+    """Creates a DisplayList method recording the Canvas primitive name"""
+    sig = signature(getattr(Canvas, name))
+
+    def method(self, *args, **kwargs):
+        # Bind arguments by name with defaults so ops can be inspected
+        bound = sig.bind(None, *args, **kwargs)
+        bound.apply_defaults()
+        params = dict(bound.arguments)
+        del params['self']
+        self.record(name, params)
+    method.__name__ = name
+    method.__doc__ = getattr(Canvas, name).__doc__
+    return method
+
+
+class DisplayList(object):
+    """Records drawing primitives for optimized replay onto canvases
+    Attributes:
+        ops: List of recorded operations
+        width: Pixel width of target canvases
+        height: Pixel height of target canvases
+    Note:
+        Ops are tuples starting with their type:
+            ('span', y, x1, x2, color): Horizontal run of pixels (x2 inclusive)
+            ('rect', x, y, w, h, color): Filled rectangle
+            ('batch', color, [(x, y, w, h)]): Same color rectangles in one masked write
+            ('call', name, params): Any other Canvas primitive
+        Solid (non inverted) lines, points, rectangles and filled rectangles are
+        bounds checked once when recorded.  A recorded list can be executed
+        any number of times, e.g. for static backgrounds.
+    """
+
+    def __init__(self, width=128, height=64):
+        """Constructor for display list.
+        Args:
+            width (Optional int): Pixel width of target canvases. Default is 128.
+            height (Optional int): Pixel height of target canvases. Default is 64.
+        """
+        self.width = width
+        self.height = height
+        self.ops = []
+        # Cached batch pixel indices {op index: (rows, cols)}
+        self.__indices = {}
+
+    def __len__(self):
+        return len(self.ops)
+
+    def clear(self):
+        """Removes all recorded ops"""
+        self.ops = []
+        self.__indices = {}
+
+    def is_inside(self, x1, y1, x2, y2):
+        """Checks if a box is inside the target canvas
+        Args:
+            x1, y1 (int): Top left coordinates of box
+            x2, y2 (int): Bottom right coordinates of box (inclusive)
+        Returns:
+            boolean: True if the box is inside.
+        """
+        return 0 <= x1 <= x2 < self.width and 0 <= y1 <= y2 < self.height
+
+    def record(self, name, params):
+        """Records a Canvas primitive
+        Args:
+            name (string): Canvas method name
+            params (dict): Method arguments by name
+        """
+        p = params
+        if not p.get('invert', False) and p.get('pattern') is None:
+            if name == 'draw_point' and self.is_inside(p['x'], p['y'], p['x'], p['y']):
+                self.ops.append(('span', p['y'], p['x'], p['x'], p['color']))
+                return
+            if name == 'draw_line':
+                x1, x2 = sorted((p['x1'], p['x2']))
+                y1, y2 = sorted((p['y1'], p['y2']))
+                if y1 == y2 and self.is_inside(x1, y1, x2, y2):
+                    self.ops.append(('span', y1, x1, x2, p['color']))
+                    return
+                if x1 == x2 and self.is_inside(x1, y1, x2, y2):
+                    self.ops.append(('rect', x1, y1, 1, y2 - y1 + 1, p['color']))
+                    return
+            if name in ('draw_rectangle', 'fill_rectangle'):
+                x1, y1, w, h, color = p['x1'], p['y1'], p['w'], p['h'], p['color']
+                x2, y2 = x1 + w - 1, y1 + h - 1
+                if w > 0 and h > 0 and self.is_inside(x1, y1, x2, y2):
+                    if name == 'fill_rectangle':
+                        self.ops.append(('rect', x1, y1, w, h, color))
+                    else:
+                        # Top, bottom, left and right sides
+                        self.ops.append(('span', y1, x1, x2, color))
+                        self.ops.append(('span', y2, x1, x2, color))
+                        self.ops.append(('rect', x1, y1, 1, h, color))
+                        self.ops.append(('rect', x2, y1, 1, h, color))
+                    return
+        if name == 'draw_lines':
+            p = dict(p, coords=np.array(p['coords']))
+        self.ops.append(('call', name, p))
+
+    @staticmethod
+    def get_bounds(op):
+        """Gets the bounding box of an op
+        Args:
+            op (tuple): Recorded op
+        Returns:
+            (int, int, int, int): x1, y1, x2, y2 (inclusive) or None if unknown
+        """
+        if op[0] == 'span':
+            return op[2], op[1], op[3], op[1]
+        if op[0] == 'rect':
+            return op[1], op[2], op[1] + op[3] - 1, op[2] + op[4] - 1
+        if op[0] == 'batch':
+            return None
+        name, p = op[1], op[2]
+        if name == 'draw_line':
+            return (min(p['x1'], p['x2']), min(p['y1'], p['y2']),
+                    max(p['x1'], p['x2']), max(p['y1'], p['y2']))
+        if name in ('draw_circle', 'fill_circle', 'draw_polygon', 'fill_polygon'):
+            return p['x0'] - p['r'], p['y0'] - p['r'], p['x0'] + p['r'], p['y0'] + p['r']
+        if name in ('draw_ellipse', 'fill_ellipse'):
+            return p['x0'] - p['a'], p['y0'] - p['b'], p['x0'] + p['a'], p['y0'] + p['b']
+        if name == 'draw_bitmap':
+            h, w = p['bitmap'].shape
+            return p['x'], p['y'], p['x'] + w - 1, p['y'] + h - 1
+        return None
+
+    def optimize(self):
+        """Optimizes recorded ops
+        Returns:
+            DisplayList object: self
+        Note:
+            1. Culls ops that are completely covered by a later filled rectangle.
+            2. Merges adjacent or overlapping spans on the same row and color.
+            3. Batches consecutive same color spans and rectangles into one write.
+        """
+        # Cull overdrawn ops (scan backwards collecting covering rectangles)
+        covers = []
+        kept = []
+        for op in reversed(self.ops):
+            bounds = self.get_bounds(op)
+            if bounds is not None and any(
+                    cx1 <= bounds[0] and cy1 <= bounds[1] and bounds[2] <= cx2 and bounds[3] <= cy2
+                    for cx1, cy1, cx2, cy2 in covers):
+                continue
+            kept.append(op)
+            if op[0] == 'rect':
+                covers.append(bounds)
+        kept.reverse()
+        # Merge spans
+        merged = []
+        for op in kept:
+            prev = merged[-1] if merged else None
+            if (op[0] == 'span' and prev is not None and prev[0] == 'span' and
+                    prev[1] == op[1] and prev[4] == op[4] and
+                    op[2] <= prev[3] + 1 and prev[2] <= op[3] + 1):
+                merged[-1] = ('span', op[1], min(prev[2], op[2]), max(prev[3], op[3]), op[4])
+            else:
+                merged.append(op)
+        # Batch same color spans and rectangles
+        self.ops = []
+        for op in merged:
+            if op[0] == 'span':
+                rect = (op[2], op[1], op[3] - op[2] + 1, 1)
+                color = op[4]
+            elif op[0] == 'rect':
+                rect = op[1:5]
+                color = op[5]
+            else:
+                self.ops.append(op)
+                continue
+            prev = self.ops[-1] if self.ops else None
+            if prev is not None and prev[0] == 'batch' and prev[1] == color:
+                prev[2].append(rect)
+            elif prev is not None and prev[0] in ('span', 'rect') and prev[-1] == color:
+                prev_rect = self.get_bounds(prev)
+                self.ops[-1] = ('batch', color, [(prev_rect[0], prev_rect[1],
+                                                  prev_rect[2] - prev_rect[0] + 1,
+                                                  prev_rect[3] - prev_rect[1] + 1), rect])
+            else:
+                self.ops.append(op)
+        self.__indices = {}
+        return self
+
+    def get_indices(self, idx):
+        """Gets cached pixel indices of a batch op
+        Args:
+            idx (int): Op index
+        Returns:
+            (Numpy array, Numpy array): Row and column indices
+        """
+        if idx not in self.__indices:
+            mask = np.zeros((self.height, self.width), dtype=bool)
+            for x, y, w, h in self.ops[idx][2]:
+                mask[y:y + h, x:x + w] = True
+            self.__indices[idx] = np.nonzero(mask)
+        return self.__indices[idx]
+
+    def execute(self, canvas):
+        """Draws recorded ops onto a canvas
+        Args:
+            canvas (Canvas object): Target canvas (same size as display list)
+        """
+        buffer = canvas.buffer
+        for idx, op in enumerate(self.ops):
+            kind = op[0]
+            if kind == 'span':
+                buffer[op[1], op[2]:op[3] + 1] = op[4]
+            elif kind == 'rect':
+                buffer[op[2]:op[2] + op[4], op[1]:op[1] + op[3]] = op[5]
+            elif kind == 'batch':
+                buffer[self.get_indices(idx)] = op[1]
+            else:
+                getattr(canvas, op[1])(**op[2])
+
+
+# Recording methods mirror the Canvas primitives
+for _name in RECORDABLE:
+    setattr(DisplayList, _name, recorder(_name))
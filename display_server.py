@@ -0,0 +1,282 @@
+""" Display server allowing several processes to share one ST7565 display.
+
+The server owns the Glcd (GPIO and SPI) and exposes its back buffer through
+multiprocessing.shared_memory.  Clients draw directly into the shared buffer
+and send requests over a Unix socket control channel.  Flip requests from all
+clients are coalesced and sent to the display at a paced rate.
+
+Control channel (one request per line, one reply per line):
+    info                   Reply: ok <shared memory name> <width> <height>
+    flip                   Send the whole back buffer
+    invalidate x y w h     Send a region of the back buffer
+    backlight r g b        Set backlight color (0 - 100)
+A flip or invalidate after a failed transfer is queued but replies with the
+error.
+
+Usage:
+    server:  DisplayServer(st7565.Glcd(rgb=[21, 20, 16])).serve_forever()
+    client:  display = DisplayClient(); display.draw_line(0, 0, 127, 63); display.flip()
+"""
+from __future__ import print_function
+from multiprocessing import resource_tracker, shared_memory
+import os
+import socket
+import socketserver
+import threading
+import time
+import numpy as np
+from canvas import Canvas, canvas_primitives
+
+SOCKET_PATH = '/tmp/st7565.sock'
+
+
+class DisplayRequestHandler(socketserver.StreamRequestHandler):
+    """Handles control channel requests from a single client"""
+
+    def handle(self):
+        server = self.server.display
+        for line in self.rfile:
+            args = line.decode().split()
+            if not args:
+                continue
+            try:
+                reply = server.handle_request(args[0], [int(a) for a in args[1:]])
+            except (ValueError, TypeError) as e:
+                reply = 'error {0}'.format(e)
+            self.wfile.write((reply + '\n').encode())
+
+
+class DisplayServer(object):
+    """Owns a display and shares its back buffer with client processes
+    Attributes:
+        glcd: Glcd object driving the display
+        flips: Number of transfers sent to the display
+        requests: Number of flip and invalidate requests received
+        error: Last failed transfer not yet reported to a client (None if none)
+    """
+
+    def __init__(self, glcd, socket_path=SOCKET_PATH, max_fps=30, init=True):
+        """Constructor for display server.
+        Args:
+            glcd (Glcd object): Display to share
+            socket_path (Optional string): Control channel Unix socket path.
+            max_fps (Optional int): Maximum transfers per second. Default is 30.
+            init (Optional boolean): Initialize display. Default is True.
+        """
+        self.glcd = glcd
+        self.socket_path = socket_path
+        self.interval = 1.0 / max_fps
+        self.flips = 0
+        self.requests = 0
+        self.error = None
+        if init:
+            glcd.init()
+
+        # Move the back buffer into shared memory
+        width, height = glcd.canvas.width, glcd.canvas.height
+        self.shm = shared_memory.SharedMemory(create=True, size=width * height)
+        buffer = np.ndarray((height, width), dtype='uint8', buffer=self.shm.buf)
+        buffer[:] = glcd.back_buffer
+        glcd.canvas = Canvas(width, height, buffer)
+
+        # Pending region (x1, y1, x2, y2) waiting to be sent
+        self.__pending = None
+        self.__condition = threading.Condition()
+        self.__running = True
+        self.__flip_thread = threading.Thread(target=self.__flip_loop)
+        self.__flip_thread.daemon = True
+        self.__flip_thread.start()
+
+        # Control channel
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        self.server = socketserver.ThreadingUnixStreamServer(socket_path, DisplayRequestHandler)
+        self.server.daemon_threads = True
+        self.server.display = self
+        self.__server_thread = None
+
+    def handle_request(self, cmd, args):
+        """Processes a control channel request
+        Args:
+            cmd (string): Request name
+            args ([int]): Request arguments
+        Returns:
+            string: Reply
+        """
+        if cmd == 'info':
+            canvas = self.glcd.canvas
+            return 'ok {0} {1} {2}'.format(self.shm.name, canvas.width, canvas.height)
+        if cmd == 'flip' or (cmd == 'invalidate' and len(args) == 4):
+            self.request_flip(*args)
+            # Report a failed transfer to the next client requesting one
+            with self.__condition:
+                error, self.error = self.error, None
+            if error is not None:
+                return 'error transfer failed: {0}'.format(error)
+        elif cmd == 'backlight' and len(args) == 3:
+            self.glcd.set_backlight_color(*args)
+        else:
+            return 'error invalid request'
+        return 'ok'
+
+    def request_flip(self, x=0, y=0, w=None, h=None):
+        """Queues a region of the back buffer for the next transfer
+        Args:
+            x, y (Optional int): Top left coordinates of region. Default is 0, 0.
+            w, h (Optional int): Width & height of region. Default is whole display.
+        Note:
+            Requests received before the next transfer are merged into one region.
+        """
+        canvas = self.glcd.canvas
+        w = canvas.width if w is None else w
+        h = canvas.height if h is None else h
+        with self.__condition:
+            self.requests += 1
+            if self.__pending is None:
+                self.__pending = (x, y, x + w, y + h)
+            else:
+                x1, y1, x2, y2 = self.__pending
+                self.__pending = (min(x, x1), min(y, y1), max(x + w, x2), max(y + h, y2))
+            self.__condition.notify()
+
+    def __flip_loop(self):
+        """Sends pending regions to the display no faster than max_fps"""
+        while True:
+            with self.__condition:
+                while self.__pending is None and self.__running:
+                    self.__condition.wait()
+                if not self.__running:
+                    return
+                x1, y1, x2, y2 = self.__pending
+                self.__pending = None
+            start = time.time()
+            try:
+                self.glcd.flip_region(x1, y1, x2 - x1, y2 - y1)
+                self.flips += 1
+            except Exception as e:
+                # Keep serving, the next flip request reports the error
+                print('Display server transfer failed: {0}'.format(e))
+                with self.__condition:
+                    self.error = e
+            # Pace transfers
+            delay = self.interval - (time.time() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+    def start(self):
+        """Handles client requests on a background thread"""
+        self.__server_thread = threading.Thread(target=self.server.serve_forever)
+        self.__server_thread.daemon = True
+        self.__server_thread.start()
+
+    def serve_forever(self):
+        """Handles client requests until interrupted, then cleans up"""
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            print('\nCtrl-C pressed.  Cleaning up and exiting...')
+        finally:
+            self.close()
+
+    def close(self):
+        """Stops the server and releases shared memory and the display"""
+        if self.__server_thread is not None:
+            self.server.shutdown()
+            self.__server_thread.join()
+        self.server.server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        with self.__condition:
+            self.__running = False
+            self.__condition.notify()
+        self.__flip_thread.join()
+        # Return the back buffer to private memory before releasing shared memory
+        canvas = self.glcd.canvas
+        self.glcd.canvas = Canvas(canvas.width, canvas.height, canvas.buffer.copy())
+        del canvas
+        self.shm.close()
+        self.shm.unlink()
+        self.glcd.cleanup()
+
+
+@canvas_primitives
+class DisplayClient(object):
+    """Draws on a display shared by a DisplayServer
+    Attributes:
+        canvas: Canvas object on the shared back buffer
+    Note:
+        Drawing primitives are provided by the shared Canvas (self.canvas).
+    """
+
+    def __init__(self, socket_path=SOCKET_PATH):
+        """Constructor for display client.
+        Args:
+            socket_path (Optional string): Control channel Unix socket path.
+        """
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path)
+        self.__file = self.sock.makefile('rb')
+        name, width, height = self.request('info').split()
+        # Server owns the shared memory so do not let this process unlink it
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before Python 3.13 attaching always registers the segment
+            self.shm = shared_memory.SharedMemory(name=name)
+            if os.name == 'posix':
+                # Registered under the POSIX name (leading slash)
+                resource_tracker.unregister('/' + name, 'shared_memory')
+        width, height = int(width), int(height)
+        buffer = np.ndarray((height, width), dtype='uint8', buffer=self.shm.buf)
+        self.canvas = Canvas(width, height, buffer)
+
+    def request(self, *args):
+        """Sends a control channel request
+        Args:
+            args: Request name and arguments
+        Returns:
+            string: Reply arguments (None on error)
+        """
+        self.sock.sendall((' '.join(str(a) for a in args) + '\n').encode())
+        reply = self.__file.readline().decode().strip()
+        if not reply.startswith('ok'):
+            print('Display server: {0}'.format(reply))
+            return None
+        return reply[3:]
+
+    @property
+    def back_buffer(self):
+        """Numpy 2D array of the shared back buffer"""
+        return self.canvas.buffer
+
+    def clear_back_buffer(self):
+        """Clear back buffer only"""
+        self.canvas.clear()
+
+    def flip(self):
+        """Requests the whole back buffer be sent to the display"""
+        self.request('flip')
+
+    def flip_region(self, x, y, w, h):
+        """Requests a region of the back buffer be sent to the display
+        Args:
+            x, y (int): Top left coordinates of region
+            w, h (int): Width & height in pixels of region
+        """
+        self.request('invalidate', x, y, w, h)
+
+    def set_backlight_color(self, r, g, b):
+        """Set LED backlight color
+        Args:
+            r (int): red duty cycle 0 - 100 (0 = off, 100 = full on)
+            g (int): green duty cycle 0 - 100 (0 = off, 100 = full on)
+            b (int): blue duty cycle 0 - 100 (0 = off, 100 = full on)
+        """
+        self.request('backlight', r, g, b)
+
+    def close(self):
+        """Disconnects from the server"""
+        self.canvas = None
+        self.__file.close()
+        self.sock.close()
+        self.shm.close()
@@ -0,0 +1,112 @@
+from __future__ import division
+import numpy as np
+
+# Error diffusion kernels: (row offset, column offset, weight)
+KERNELS = {
+    'floyd-steinberg': ((0, 1, 7 / 16), (1, -1, 3 / 16), (1, 0, 5 / 16), (1, 1, 1 / 16)),
+    'atkinson': ((0, 1, 1 / 8), (0, 2, 1 / 8), (1, -1, 1 / 8), (1, 0, 1 / 8),
+                 (1, 1, 1 / 8), (2, 0, 1 / 8)),
+    'jarvis': ((0, 1, 7 / 48), (0, 2, 5 / 48),
+               (1, -2, 3 / 48), (1, -1, 5 / 48), (1, 0, 7 / 48), (1, 1, 5 / 48), (1, 2, 3 / 48),
+               (2, -2, 1 / 48), (2, -1, 3 / 48), (2, 0, 5 / 48), (2, 1, 3 / 48), (2, 2, 1 / 48)),
+}
+
+# Ordered dither matrix sizes
+BAYER_SIZES = {'bayer2': 2, 'bayer4': 4, 'bayer8': 8}
+
+METHODS = ('threshold',) + tuple(sorted(BAYER_SIZES)) + tuple(sorted(KERNELS))
+
+
+def bayer_matrix(size):
+    """Builds a Bayer ordered dither index matrix
+    Args:
+        size (int): Matrix size (power of 2)
+    Returns:
+        Numpy 2D array (int): Indices 0 to size * size - 1
+    """
+    matrix = np.zeros((1, 1), dtype='int32')
+    while matrix.shape[0] < size:
+        m = matrix * 4
+        matrix = np.block([[m, m + 2], [m + 3, m + 1]])
+    return matrix
+
+
+def bayer_thresholds(size):
+    """Builds Bayer thresholds between 0 and 1
+    Args:
+        size (int): Matrix size (power of 2)
+    Returns:
+        Numpy 2D array (float): Thresholds
+    """
+    return (bayer_matrix(size) + 0.5) / (size * size)
+
+
+def ordered_dither(levels, size=4):
+    """Converts levels to pixels with a tiled Bayer threshold matrix
+    Args:
+        levels (Numpy 2D array): Pixel levels 0.0 (off) to 1.0 (on)
+        size (Optional int): Bayer matrix size. Default is 4.
+    Returns:
+        Numpy 2D array (uint8): 0 = pixel off, 1 = pixel on
+    """
+    height, width = levels.shape
+    thresholds = np.tile(bayer_thresholds(size), ((height + size - 1) // size,
+                                                   (width + size - 1) // size))
+    return (levels > thresholds[:height, :width]).astype('uint8')
+
+
+def error_diffusion(levels, kernel='floyd-steinberg'):
+    """Converts levels to pixels by diffusing quantization error
+    Args:
+        levels (Numpy 2D array): Pixel levels 0.0 (off) to 1.0 (on)
+        kernel (Optional string): Kernel name in KERNELS. Default is floyd-steinberg.
+    Returns:
+        Numpy 2D array (uint8): 0 = pixel off, 1 = pixel on
+    Note:
+        Pixels are processed in diagonal wavefronts (column + k * row constant)
+        chosen so every pixel a wavefront depends on was finished by an earlier
+        wavefront.  Each wavefront is quantized and diffused as one vector
+        operation, giving the same result as a sequential scan.
+    """
+    taps = KERNELS[kernel]
+    height, width = levels.shape
+    # Wavefront slope: every tap must land on a later wavefront
+    k = max(-(-(1 - dx) // dy) for dy, dx, _ in taps if dy > 0)
+    # Pad so taps never leave the work array
+    left = max(0, -min(dx for _, dx, _ in taps))
+    right = max(dx for _, dx, _ in taps)
+    bottom = max(dy for dy, _, _ in taps)
+    work = np.zeros((height + bottom, width + left + right), dtype='float64')
+    work[:height, left:left + width] = levels
+    pixels = np.zeros((height, width), dtype='uint8')
+    for t in range(width + k * (height - 1)):
+        # Rows crossing this wavefront inside the image
+        y_min = max(0, -(-(t - width + 1) // k))
+        y_max = min(height - 1, t // k)
+        ys = np.arange(y_min, y_max + 1)
+        xs = t - k * ys
+        values = work[ys, xs + left]
+        on = values >= 0.5
+        pixels[ys, xs] = on
+        error = values - on
+        for dy, dx, weight in taps:
+            work[ys + dy, xs + left + dx] += error * weight
+    return pixels
+
+
+def dither(levels, method='floyd-steinberg'):
+    """Converts levels to pixels
+    Args:
+        levels (Numpy 2D array): Pixel levels 0.0 (off) to 1.0 (on)
+        method (Optional string): threshold, bayer2, bayer4, bayer8, atkinson,
+            floyd-steinberg or jarvis. Default is floyd-steinberg.
+    Returns:
+        Numpy 2D array (uint8): 0 = pixel off, 1 = pixel on
+    """
+    if method == 'threshold':
+        return (levels >= 0.5).astype('uint8')
+    if method in BAYER_SIZES:
+        return ordered_dither(levels, BAYER_SIZES[method])
+    if method in KERNELS:
+        return error_diffusion(levels, method)
+    raise ValueError('Unknown dither method {0}.  Must be one of {1}.'.format(method, ', '.join(METHODS)))
@@ -0,0 +1,354 @@
+""" Emulated GPIO, SPI transport and ST7565 controller.
+
+Allows running and benchmarking the driver without a Raspberry Pi.  The
+emulated SPI device decodes the command/data stream into a model of the
+controller's display RAM and accounts for the time each transfer would take
+on the wire at the configured SPI clock.
+
+Usage:
+    board = EmulatedBoard()
+    glcd = board.glcd()
+    glcd.init()
+    board.controller.frame()  # Numpy 2D array of what the panel shows
+"""
+from __future__ import print_function
+import time
+import numpy as np
+import st7565
+
+
+class EmulatedPwm(object):
+    """RPi.GPIO PWM object stand-in"""
+
+    def __init__(self, pin, frequency):
+        self.pin = pin
+        self.frequency = frequency
+        self.duty_cycle = None
+
+    def start(self, duty_cycle):
+        self.duty_cycle = duty_cycle
+
+    def ChangeDutyCycle(self, duty_cycle):
+        self.duty_cycle = duty_cycle
+
+    def stop(self):
+        self.duty_cycle = None
+
+
+class EmulatedGpio(object):
+    """RPi.GPIO module stand-in that records pin levels
+    Attributes:
+        levels: Output level by pin number
+        listeners: Functions called as listener(pin, level) when an output changes
+    """
+    BCM = 11
+    BOARD = 10
+    OUT = 0
+    IN = 1
+    LOW = 0
+    HIGH = 1
+    PWM = EmulatedPwm
+
+    def __init__(self):
+        self.levels = {}
+        self.listeners = []
+
+    def setmode(self, mode):
+        pass
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, pin, direction, initial=None):
+        if initial is not None:
+            self.output(pin, initial)
+
+    def output(self, pin, level):
+        changed = self.levels.get(pin) != level
+        self.levels[pin] = level
+        if changed:
+            for listener in self.listeners:
+                listener(pin, level)
+
+    def input(self, pin):
+        return self.levels.get(pin, self.LOW)
+
+    def cleanup(self):
+        self.levels.clear()
+
+
+class EmulatedController(object):
+    """Model of the ST7565 controller state
+    Attributes:
+        ram: A 2D Numpy array of display RAM (9 pages x 132 columns)
+        page, column: Current RAM address
+        commands: Number of command bytes received
+        data: Number of data bytes received
+    """
+    RAM_PAGES = 9
+    RAM_COLUMNS = 132
+    # Commands followed by a parameter byte
+    DOUBLE_BYTE = (0x81, 0xAC, 0xAD, 0xF8)
+
+    def __init__(self, gpio=None, rst=None):
+        """Constructor for emulated controller.
+        Args:
+            gpio (Optional EmulatedGpio): Watched for the reset pin going low.
+            rst (Optional int): Reset GPIO pin.
+        """
+        self.ram = np.zeros((self.RAM_PAGES, self.RAM_COLUMNS), dtype='uint8')
+        self.commands = 0
+        self.data = 0
+        self.resets = 0
+        self.reset()
+        # Watch reset pin
+        self.rst = rst
+        if gpio is not None and rst is not None:
+            gpio.listeners.append(self.on_gpio)
+
+    def on_gpio(self, pin, level):
+        """Resets the controller when the reset pin goes low"""
+        if pin == self.rst and level == EmulatedGpio.LOW:
+            self.reset()
+
+    def reset(self):
+        """Resets controller registers (display RAM is kept)"""
+        self.resets += 1
+        self.page = 0
+        self.column = 0
+        self.start_line = 0
+        self.display_on = False
+        self.adc_reverse = False
+        self.com_reverse = False
+        self.reverse = False
+        self.all_points = False
+        self.bias_7 = False
+        self.power = 0
+        self.resistor_ratio = 0
+        self.volume = 0x20
+        self.static = False
+        self.__pending = None
+
+    def command(self, byte):
+        """Executes a command byte
+        Args:
+            byte (int): Command byte
+        """
+        self.commands += 1
+        # Parameter byte of a two byte command
+        if self.__pending is not None:
+            cmd, self.__pending = self.__pending, None
+            if cmd == 0x81:
+                self.volume = byte & 0x3f
+            return
+        if byte in self.DOUBLE_BYTE:
+            self.__pending = byte
+            if byte in (0xAC, 0xAD):
+                self.static = byte == 0xAD
+        elif byte in (0xAE, 0xAF):
+            self.display_on = byte == 0xAF
+        elif 0x40 <= byte <= 0x7F:
+            self.start_line = byte & 0x3f
+        elif 0xB0 <= byte <= 0xBF:
+            self.page = byte & 0x0f
+        elif 0x10 <= byte <= 0x1F:
+            self.column = ((byte & 0x0f) << 4) | (self.column & 0x0f)
+        elif byte <= 0x0F:
+            self.column = (self.column & 0xf0) | byte
+        elif byte in (0xA0, 0xA1):
+            self.adc_reverse = byte == 0xA1
+        elif byte in (0xA2, 0xA3):
+            self.bias_7 = byte == 0xA3
+        elif byte in (0xA4, 0xA5):
+            self.all_points = byte == 0xA5
+        elif byte in (0xA6, 0xA7):
+            self.reverse = byte == 0xA7
+        elif 0xC0 <= byte <= 0xCF:
+            self.com_reverse = bool(byte & 0x08)
+        elif 0x28 <= byte <= 0x2F:
+            self.power = byte & 0x07
+        elif 0x20 <= byte <= 0x27:
+            self.resistor_ratio = byte & 0x07
+        elif byte == 0xE2:
+            self.reset()
+
+    def write(self, data):
+        """Writes data bytes at the current RAM address
+        Args:
+            data ([int]): Display data bytes
+        """
+        self.data += len(data)
+        if self.page >= self.RAM_PAGES:
+            return
+        count = min(len(data), self.RAM_COLUMNS - self.column)
+        self.ram[self.page, self.column:self.column + count] = data[:count]
+        self.column += count
+
+    def frame(self):
+        """Gets the pixels shown on the panel
+        Returns:
+            Numpy 2D array: 64 x 128 pixels
+        Note:
+            Models the Adafruit module wiring where panel row y shows RAM row
+            31 - y (mod 64) and panel column x shows RAM column x + 1.  Reversed
+            common and segment directions flip these mappings.
+        """
+        rows = np.arange(64)
+        cols = np.arange(128)
+        if self.com_reverse:
+            rows = 32 + rows
+        else:
+            rows = 31 - rows
+        rows = (rows + self.start_line) % 64
+        if self.adc_reverse:
+            cols = self.RAM_COLUMNS - 2 - cols
+        else:
+            cols = cols + 1
+        pixels = (self.ram[rows >> 3][:, cols] >> (rows & 7)[:, np.newaxis]) & 1
+        if self.all_points:
+            pixels[:] = 1
+        if self.reverse:
+            pixels ^= 1
+        if not self.display_on:
+            pixels[:] = 0
+        return pixels
+
+
+class EmulatedSpi(object):
+    """spidev.SpiDev stand-in feeding emulated controllers
+    Attributes:
+        transfers: Number of xfer calls
+        bytes: Number of bytes transferred
+        busy_time: Seconds the transfers would occupy the bus
+        max_reliable_hz: Clock above which display data is corrupted (None is always reliable)
+    Note:
+        Transfer time is per transfer overhead plus 8 clocks per byte.
+        With realtime True each transfer also sleeps for that long.
+        Above max_reliable_hz every CORRUPT_INTERVAL'th data byte has its
+        low bit flipped to model marginal wiring.
+    """
+    # Seconds of driver and chip select overhead per transfer
+    TRANSFER_OVERHEAD = 20e-6
+    # Data bytes per corrupted byte above max_reliable_hz
+    CORRUPT_INTERVAL = 97
+
+    def __init__(self, gpio, realtime=False):
+        """Constructor for emulated SPI device.
+        Args:
+            gpio (EmulatedGpio): GPIO providing the A0 and chip select levels
+            realtime (Optional boolean): Sleep for the emulated transfer time. Default is False.
+        """
+        self.gpio = gpio
+        self.realtime = realtime
+        self.devices = []
+        self.max_speed_hz = 250000
+        self.bufsiz = 4096
+        self.max_reliable_hz = None
+        self.mode = 0
+        self.no_cs = False
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Clears transfer counters"""
+        self.transfers = 0
+        self.bytes = 0
+        self.busy_time = 0.0
+
+    def attach(self, controller, a0, cs=None):
+        """Connects a controller to the bus
+        Args:
+            controller (EmulatedController): Controller
+            a0 (int): Register select GPIO pin
+            cs (Optional int): Chip select GPIO pin (None is always selected)
+        """
+        self.devices.append((controller, a0, cs))
+
+    def open(self, bus, device):
+        pass
+
+    def close(self):
+        pass
+
+    def xfer(self, data):
+        """Sends bytes to the selected controllers
+        Args:
+            data ([int]): Bytes to send
+        Returns:
+            [int]: Bytes received (always zero)
+        """
+        if len(data) > self.bufsiz:
+            raise OverflowError('Transfer of {0} bytes exceeds bufsiz {1}'.format(len(data), self.bufsiz))
+        for controller, a0, cs in self.devices:
+            if cs is not None and self.gpio.input(cs) != self.gpio.LOW:
+                continue
+            if self.gpio.input(a0) == self.gpio.HIGH:
+                controller.write(self.corrupt(data))
+            else:
+                for byte in data:
+                    controller.command(byte)
+        duration = self.TRANSFER_OVERHEAD + len(data) * 8.0 / self.max_speed_hz
+        self.transfers += 1
+        self.bytes += len(data)
+        self.busy_time += duration
+        if self.realtime:
+            time.sleep(duration)
+        return [0] * len(data)
+
+    def corrupt(self, data):
+        """Applies the marginal clock error model to display data
+        Args:
+            data ([int]): Bytes sent
+        Returns:
+            [int]: Bytes received by the controller
+        """
+        data = list(data)
+        if self.max_reliable_hz is None or self.max_speed_hz <= self.max_reliable_hz:
+            return data
+        for idx in range(-self.bytes % self.CORRUPT_INTERVAL, len(data), self.CORRUPT_INTERVAL):
+            data[idx] ^= 1
+        return data
+
+    xfer2 = xfer
+    writebytes = xfer
+    writebytes2 = xfer
+
+
+class EmulatedBoard(object):
+    """Raspberry Pi GPIO and SPI with an attached emulated ST7565
+    Attributes:
+        gpio: EmulatedGpio
+        spi: EmulatedSpi
+        controller: EmulatedController
+    Note:
+        The board outlives Glcd objects so a process restart can be emulated
+        by creating a new Glcd on the same board.
+    """
+
+    def __init__(self, a0=24, cs=8, rst=25, speed_hz=250000, realtime=False,
+                 max_reliable_hz=None):
+        """Constructor for emulated board.
+        Args:
+            a0 (Optional int): Register select GPIO pin. Default is 24.
+            cs (Optional int): Chip select GPIO pin. Default is 8.
+            rst (Optional int): Reset GPIO pin. Default is 25.
+            speed_hz (Optional int): SPI clock in hertz. Default is 250000.
+            realtime (Optional boolean): Sleep for the emulated transfer time. Default is False.
+            max_reliable_hz (Optional int): Clock above which display data is
+                corrupted. Default is None (always reliable).
+        """
+        self.a0, self.cs, self.rst = a0, cs, rst
+        self.gpio = EmulatedGpio()
+        self.spi = EmulatedSpi(self.gpio, realtime)
+        self.spi.max_speed_hz = speed_hz
+        self.spi.max_reliable_hz = max_reliable_hz
+        self.controller = EmulatedController(self.gpio, rst)
+        self.spi.attach(self.controller, a0)
+
+    def glcd(self, **kwargs):
+        """Creates a Glcd wired to the board
+        Args:
+            kwargs: Additional Glcd arguments (e.g. rgb)
+        Returns:
+            Glcd object
+        """
+        return st7565.Glcd(self.a0, self.cs, self.rst, gpio=self.gpio, spi=self.spi, **kwargs)
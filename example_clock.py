@@ -1,5 +1,6 @@
 import st7565
 import xglcd_font as font
+from display_list import DisplayList
 import math
 import time
 
@@ -17,19 +18,29 @@ def get_face_xy(angle, radius):
     y = int(y0 + radius * math.sin(theta))
     return x, y
 
-def draw_face():
+def record_face():
+    """
+    Record the static clock face once for replay on every update
+    """
+    face = DisplayList()
     # Outline
-    glcd.draw_circle(x0, y0, 31)
+    face.draw_circle(x0, y0, 31)
     # Ticks
     for angle in range(30, 331, 30):
-        glcd.draw_line(x0, y0, *get_face_xy(angle, 29))
+        face.draw_line(x0, y0, *get_face_xy(angle, 29))
     # Clear center of circle
-    glcd.fill_circle(x0, y0, 25, color=0)
+    face.fill_circle(x0, y0, 25, color=0)
     # Numbers
-    glcd.draw_string("12", neato, x0 - 5, y0 - 29, spacing=0)
-    glcd.draw_letter("3", neato, x0 + 25, y0 - 3)
-    glcd.draw_letter("6", neato, x0 - 2, y0 + 23)
-    glcd.draw_letter("9", neato, x0 - 29, y0 - 3)
+    face.draw_string("12", neato, x0 - 5, y0 - 29, spacing=0)
+    face.draw_letter("3", neato, x0 + 25, y0 - 3)
+    face.draw_letter("6", neato, x0 - 2, y0 + 23)
+    face.draw_letter("9", neato, x0 - 29, y0 - 3)
+    return face.optimize()
+
+face = record_face()
+
+def draw_face():
+    face.execute(glcd.canvas)
     # Date
     glcd.draw_string(time.strftime("%b").upper(), neato, 0,0)
     glcd.draw_string(time.strftime(" %d"), neato, 0, 8)
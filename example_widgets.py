@@ -0,0 +1,30 @@
+import st7565
+import xglcd_font as font
+from widgets import Screen, Label, Gauge, ProgressBar
+import time
+
+neato = font.XglcdFont('/home/pi/Pi-ST7565/fonts/Neato5x7.c', 5, 7)
+glcd = st7565.Glcd(rgb=[21, 20, 16])
+glcd.init()
+
+screen = Screen(glcd)
+title = screen.add(Label(0, 0, 70, 8, 'Load test', neato, invert=True))
+status = screen.add(Label(0, 12, 70, 16, '', neato))
+bar = screen.add(ProgressBar(0, 40, 70, 8, pattern=0.5))
+gauge = screen.add(Gauge(100, 31, 26, ticks=10))
+
+try:
+    step = 0
+    while True:
+        # Only the widgets that change are redrawn and sent
+        gauge.value = (step * 7) % 101
+        bar.value = (step % 50) / 49.0
+        if step % 10 == 0:
+            status.text = time.strftime('%H:%M:%S')
+        screen.update()
+        step += 1
+        time.sleep(.1)
+except KeyboardInterrupt:
+    print('\nCtrl-C pressed.  Cleaning up and exiting...')
+finally:
+    glcd.cleanup()
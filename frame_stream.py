@@ -0,0 +1,301 @@
+""" Packed frame stream files for long animations.
+
+A stream file holds packed display frames (pages x columns bytes, 1 KB for
+the 128 x 64 display) in panel orientation, as returned by Glcd.pack_frame
+or Canvas.pack.  Files are memory mapped so only the frames being played are
+read from storage.
+
+File layout (little endian):
+    header    magic 'ST7565FS', version (H), flags (H), pages (H), columns (H),
+              frame count (I), keyframe interval (I), index offset (Q)
+    frames    plain:  packed frames back to back
+              delta:  per frame a page mask of (pages + 7) // 8 bytes (bit n of
+                      byte m = page 8m + n) followed by the packed bytes of
+                      each changed page
+    index     delta only: file offset of each frame (Q)
+
+Delta streams store every keyframe_interval'th frame in full so frames can be
+found without decoding from the start.
+
+Usage:
+    with FrameStreamWriter('intro.fs', delta=True) as writer:
+        for frame in frames:
+            writer.write(frame)
+    StreamPlayer(glcd, FrameStream('intro.fs'), fps=30).play()
+"""
+from __future__ import print_function
+import mmap
+import struct
+import threading
+import time
+import queue
+import numpy as np
+
+MAGIC = b'ST7565FS'
+VERSION = 1
+# Header flags
+FLAG_DELTA = 1
+HEADER = struct.Struct('<8sHHHHIIQ')
+
+
+class FrameStreamWriter(object):
+    """Writes packed frames to a stream file
+    Attributes:
+        count: Number of frames written
+    """
+
+    def __init__(self, path, delta=False, keyframe_interval=0, pages=8, columns=128):
+        """Constructor for frame stream writer.
+        Args:
+            path (string): Full target path
+            delta (Optional boolean): Only store changed pages. Default is False.
+            keyframe_interval (Optional int): Frames between full frames in delta
+                streams. Default is 0 (only the first frame).
+            pages (Optional int): Pages per frame. Default is 8.
+            columns (Optional int): Columns per page. Default is 128.
+        """
+        self.delta = delta
+        self.keyframe_interval = keyframe_interval
+        self.pages = pages
+        self.columns = columns
+        self.count = 0
+        self.offsets = []
+        self.previous = None
+        self.file = open(path, 'wb')
+        # Header is rewritten with the frame count when closed
+        self.file.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0, 0, 0, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, frame):
+        """Appends a frame
+        Args:
+            frame (Numpy 2D array): Packed frame (pages, columns)
+        Note:
+            A frame of any other shape raises ValueError.
+        """
+        frame = np.asarray(frame, dtype='uint8')
+        if frame.shape != (self.pages, self.columns):
+            raise ValueError('Frame shape {0} does not match stream shape {1}.'.format(
+                frame.shape, (self.pages, self.columns)))
+        if self.delta:
+            self.offsets.append(self.file.tell())
+            if self.previous is None or (self.keyframe_interval and
+                                         self.count % self.keyframe_interval == 0):
+                changed = np.arange(self.pages)
+            else:
+                changed = np.flatnonzero((frame != self.previous).any(axis=1))
+            mask = np.zeros(self.pages, dtype='uint8')
+            mask[changed] = 1
+            self.file.write(np.packbits(mask, bitorder='little').tobytes())
+            self.file.write(frame[changed].tobytes())
+            self.previous = frame.copy()
+        else:
+            self.file.write(frame.tobytes())
+        self.count += 1
+
+    def close(self):
+        """Writes the index and header then closes the file"""
+        if self.file.closed:
+            return
+        index_offset = 0
+        if self.delta:
+            index_offset = self.file.tell()
+            self.file.write(np.array(self.offsets, dtype='<u8').tobytes())
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, FLAG_DELTA if self.delta else 0,
+                                    self.pages, self.columns, self.count,
+                                    self.keyframe_interval, index_offset))
+        self.file.close()
+
+
+class FrameStream(object):
+    """Memory mapped stream file
+    Attributes:
+        delta: True if frames only store changed pages
+        pages: Pages per frame
+        columns: Columns per page
+        keyframe_interval: Frames between full frames (delta only, 0 = first only)
+    """
+
+    def __init__(self, path):
+        """Constructor for frame stream.
+        Args:
+            path (string): Full source path
+        """
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, flags, self.pages, self.columns, self.count,
+         self.keyframe_interval, index_offset) = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('{0} is not a version {1} frame stream.'.format(path, VERSION))
+        self.delta = bool(flags & FLAG_DELTA)
+        if self.delta:
+            self.index = np.frombuffer(self.map, dtype='<u8', count=self.count,
+                                       offset=index_offset)
+        else:
+            self.frames = np.frombuffer(self.map, dtype='uint8', offset=HEADER.size,
+                                        count=self.count * self.pages * self.columns)
+            self.frames = self.frames.reshape(self.count, self.pages, self.columns)
+
+    def __len__(self):
+        return self.count
+
+    def read_changes(self, idx):
+        """Reads the pages stored for a frame
+        Args:
+            idx (int): Frame index
+        Returns:
+            Numpy 1D array, Numpy 2D array: Page numbers and their packed bytes
+                (views of the memory map)
+        """
+        if not self.delta:
+            return np.arange(self.pages), self.frames[idx]
+        offset = int(self.index[idx])
+        mask_size = (self.pages + 7) // 8
+        mask = np.frombuffer(self.map, dtype='uint8', count=mask_size, offset=offset)
+        changed = np.flatnonzero(np.unpackbits(mask, bitorder='little')[:self.pages])
+        data = np.frombuffer(self.map, dtype='uint8', count=len(changed) * self.columns,
+                             offset=offset + mask_size)
+        return changed, data.reshape(len(changed), self.columns)
+
+    def get_frame(self, idx):
+        """Decodes a complete frame
+        Args:
+            idx (int): Frame index
+        Returns:
+            Numpy 2D array (uint8): Packed frame (pages, columns)
+        """
+        if not self.delta:
+            return self.frames[idx].copy()
+        # Decode forward from the nearest keyframe
+        start = idx - idx % self.keyframe_interval if self.keyframe_interval else 0
+        frame = np.zeros((self.pages, self.columns), dtype='uint8')
+        for i in range(start, idx + 1):
+            changed, data = self.read_changes(i)
+            frame[changed] = data
+        return frame
+
+    def close(self):
+        """Closes the memory map and file"""
+        if not self.delta:
+            self.frames = None
+        else:
+            self.index = None
+        self.map.close()
+        self.file.close()
+
+
+class StreamPlayer(object):
+    """Plays a frame stream straight to the display
+    Attributes:
+        frames: Number of frames played
+        bytes_sent: Number of data bytes sent
+        late: Number of frames sent behind schedule
+    Note:
+        A background thread reads ahead from the stream and works out which
+        pages differ from the frame before, so the playing thread only writes
+        pages.  The Glcd back buffer is not used or updated.
+    """
+
+    def __init__(self, glcd, stream, fps=None, loops=1, prefetch=16):
+        """Constructor for stream player.
+        Args:
+            glcd (Glcd object): Target display
+            stream (FrameStream object): Frames to play
+            fps (Optional float): Frames per second. Default is None (as fast as SPI allows).
+            loops (Optional int): Times to play the stream (0 = forever). Default is 1.
+            prefetch (Optional int): Frames to read ahead. Default is 16.
+        """
+        self.glcd = glcd
+        self.stream = stream
+        self.fps = fps
+        self.loops = loops
+        self.prefetch_size = prefetch
+        self.queue = None
+        self.frames = 0
+        self.bytes_sent = 0
+        self.late = 0
+        self.__running = False
+
+    def prefetch(self):
+        """Queues the pages to send for each frame (runs on a background thread)"""
+        stream = self.stream
+        frame = np.zeros((stream.pages, stream.columns), dtype='uint8')
+        # Pages currently on the display (None forces a full send)
+        shown = None
+        loop = 0
+        # An empty stream ends at once (looping it forever would spin)
+        while self.__running and len(stream) and (not self.loops or loop < self.loops):
+            for idx in range(len(stream)):
+                changed, data = stream.read_changes(idx)
+                frame[changed] = data
+                if shown is None:
+                    pages = changed
+                    shown = frame.copy()
+                else:
+                    pages = changed[(frame[changed] != shown[changed]).any(axis=1)]
+                    shown[pages] = frame[pages]
+                if not self.put([(page, frame[page].tolist()) for page in pages]):
+                    return
+            loop += 1
+        # End of stream
+        self.put(None)
+
+    def put(self, item):
+        """Queues an item, giving up if playback stops
+        Args:
+            item: Pages of a frame or None to end playback
+        Returns:
+            boolean: True if queued
+        """
+        while self.__running:
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def play(self):
+        """Plays the stream until it ends or stop is called"""
+        self.__running = True
+        self.queue = queue.Queue(maxsize=self.prefetch_size)
+        reader = threading.Thread(target=self.prefetch)
+        reader.daemon = True
+        reader.start()
+        interval = 1.0 / self.fps if self.fps else 0
+        next_frame = time.time()
+        try:
+            while self.__running:
+                try:
+                    item = self.queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    break
+                for page, data in item:
+                    self.glcd.write_page(page, data)
+                    self.bytes_sent += len(data)
+                self.glcd.end_frame()
+                self.frames += 1
+                if interval:
+                    # Pace frames against a fixed schedule to avoid drift
+                    next_frame += interval
+                    delay = next_frame - time.time()
+                    if delay > 0:
+                        time.sleep(delay)
+                    else:
+                        self.late += 1
+                        next_frame = time.time()
+        finally:
+            self.__running = False
+            reader.join()
+
+    def stop(self):
+        """Stops playback (call from another thread)"""
+        self.__running = False
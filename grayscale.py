@@ -0,0 +1,191 @@
+""" Temporal grayscale (frame rate control) for the ST7565 display.
+
+A GrayCanvas holds a gray level per pixel.  The levels are split into
+thermometer bit planes (plane k is on where the level is above k) that are
+shown one after another by a paced background loop, so a pixel at level L is
+on for L of every levels - 1 subframes.  Only pages whose packed bytes differ
+from what the display already shows are sent, so areas of solid black or
+white cost nothing after the first subframe.
+
+Usage:
+    driver = GrayscaleDriver(glcd, levels=4, rate=120)
+    driver.canvas.fill_rectangle(0, 0, 64, 64, color=2)
+    driver.update()
+    driver.start()
+"""
+from __future__ import print_function
+import threading
+import time
+import numpy as np
+from canvas import Canvas, pack_pages
+
+
+class GrayCanvas(Canvas):
+    """Offscreen drawing surface holding gray levels
+    Attributes:
+        buffer: A 2D Numpy array of levels (rows, columns) 0 = off to levels - 1 = on
+        levels: Number of gray levels
+    Note:
+        Draw with color set to the gray level.  Invert options of the Canvas
+        primitives only apply to levels 0 and 1.
+    """
+
+    def __init__(self, width, height, levels=4, buffer=None):
+        """Constructor for GrayCanvas.
+        Args:
+            width (int): Pixel width of canvas
+            height (int): Pixel height of canvas
+            levels (Optional int): Number of gray levels (2 or more). Default is 4.
+            buffer (Optional Numpy array): Existing 2D uint8 array to draw on.
+        """
+        super(GrayCanvas, self).__init__(width, height, buffer)
+        self.levels = levels
+
+    def quantize(self, image):
+        """Converts intensities to gray levels
+        Args:
+            image (Numpy 2D array): Intensities 0.0 (off) to 1.0 (on)
+        Returns:
+            Numpy 2D array (uint8): Gray levels
+        """
+        return np.rint(np.clip(image, 0, 1) * (self.levels - 1)).astype('uint8')
+
+    def draw_image(self, image, x=0, y=0):
+        """Draws an intensity image
+        Args:
+            image (Numpy 2D array): Intensities 0.0 (off) to 1.0 (on)
+            x, y (int): Top left coordinates of image
+        Note:
+            Use 1 - image_import.read_image(path) so dark areas are on.
+        """
+        levels = self.quantize(image)
+        self.blit(Canvas(levels.shape[1], levels.shape[0], levels), x, y)
+
+    def get_planes(self):
+        """Splits gray levels into thermometer bit planes
+        Returns:
+            Numpy 3D array (uint8): levels - 1 planes of 0/1 pixels
+        """
+        steps = np.arange(self.levels - 1, dtype='uint8').reshape(-1, 1, 1)
+        return (self.buffer > steps).astype('uint8')
+
+
+class GrayscaleDriver(object):
+    """Shows a GrayCanvas by cycling bit planes on a background thread
+    Attributes:
+        canvas: GrayCanvas to draw on
+        frames: Packed bit planes (planes, pages, columns) being shown
+        rate: Target subframes per second (None = as fast as possible)
+        subframes: Number of subframes shown
+        bytes_sent: Number of data bytes sent
+    """
+
+    def __init__(self, glcd, levels=4, rate=None, canvas=None):
+        """Constructor for grayscale driver.
+        Args:
+            glcd (Glcd object): Display
+            levels (Optional int): Number of gray levels. Default is 4.
+            rate (Optional float): Subframes per second. Default is None (unpaced).
+            canvas (Optional GrayCanvas): Canvas to show. Default is None
+                (a new canvas the size of the Glcd back buffer).
+        """
+        self.glcd = glcd
+        if canvas is None:
+            canvas = GrayCanvas(glcd.canvas.width, glcd.canvas.height, levels)
+        self.canvas = canvas
+        self.rate = rate
+        self.subframes = 0
+        self.bytes_sent = 0
+        self.frames = None
+        # Packed pages currently on the display (None forces a send)
+        self.shown = None
+        self.index = 0
+        self.lock = threading.Lock()
+        self.__running = False
+        self.__thread = None
+        self.update()
+
+    def get_panel_pixels(self, pixels):
+        """Rotates canvas pixels to panel (landscape) orientation
+        Args:
+            pixels (Numpy 2D array): Canvas sized pixels
+        Returns:
+            Numpy 2D array: 64 x 128 pixels
+        """
+        if self.glcd.rotation in (90, 270):
+            return np.rot90(pixels, -1)
+        return pixels
+
+    def update(self):
+        """Packs the canvas bit planes for display (call after drawing)"""
+        frames = np.array([pack_pages(self.get_panel_pixels(plane))
+                           for plane in self.canvas.get_planes()])
+        with self.lock:
+            self.frames = frames
+            self.index %= len(frames)
+
+    def show_subframe(self):
+        """Sends the next bit plane
+        Returns:
+            int: Number of data bytes sent
+        """
+        with self.lock:
+            frame = self.frames[self.index]
+            self.index = (self.index + 1) % len(self.frames)
+        if self.shown is None:
+            changed = range(len(frame))
+            self.shown = frame.copy()
+        else:
+            changed = np.flatnonzero((frame != self.shown).any(axis=1))
+        sent = 0
+        for page in changed:
+            self.glcd.write_page(page, frame[page].tolist())
+            self.shown[page] = frame[page]
+            sent += frame.shape[1]
+        if sent:
+            self.glcd.end_frame()
+        self.subframes += 1
+        self.bytes_sent += sent
+        return sent
+
+    def run(self):
+        """Shows subframes at the target rate until stopped"""
+        next_time = time.time()
+        while self.__running:
+            self.show_subframe()
+            if self.rate:
+                next_time += 1.0 / self.rate
+                delay = next_time - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Running late, do not try to catch up
+                    next_time = time.time()
+
+    def start(self):
+        """Starts showing subframes on a background thread"""
+        if self.__thread is not None:
+            return
+        self.__running = True
+        self.__thread = threading.Thread(target=self.run)
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def stop(self):
+        """Stops the background thread"""
+        if self.__thread is None:
+            return
+        self.__running = False
+        self.__thread.join()
+        self.__thread = None
+
+    def measure_rate(self, count=100):
+        """Measures the unpaced subframe rate
+        Args:
+            count (Optional int): Number of subframes. Default is 100.
+        Returns:
+            float, float: Subframes per second and data bytes per subframe
+        """
+        start = time.time()
+        sent = sum(self.show_subframe() for _ in range(count))
+        return count / (time.time() - start), sent / float(count)
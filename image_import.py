@@ -0,0 +1,264 @@
+""" Converts grayscale and color images to monochrome display bitmaps.
+
+Reads PGM/PPM/PBM (binary or ASCII) and raw 8-bit grayscale files, scales
+them to the target size and dithers them to 1 bpp.  Converted bitmaps are
+saved as packed binary PBM (P4) files, 8 pixels per byte, which
+load_pbm and Canvas.load_bitmap read directly.
+
+Batch convert a directory:
+    python image_import.py source_dir dest_dir --width 128 --height 64
+"""
+from __future__ import print_function
+import argparse
+import os
+import numpy as np
+from dither import dither, METHODS
+
+# File extensions converted by convert_directory
+IMAGE_EXTENSIONS = ('.pbm', '.pgm', '.ppm', '.pnm', '.raw')
+
+
+def read_pnm_header(data):
+    """Parses a PNM header
+    Args:
+        data (bytes): File contents
+    Returns:
+        (string, [int], int): Magic number, header values and offset of pixel data
+    """
+    magic = data[:2].decode('ascii', 'replace')
+    if magic not in ('P1', 'P2', 'P3', 'P4', 'P5', 'P6'):
+        raise ValueError('Not a PNM image (magic number {0!r}).'.format(magic))
+    count = 2 if magic in ('P1', 'P4') else 3
+    values = []
+    pos = 2
+    while len(values) < count:
+        # Skip whitespace and comments
+        while data[pos:pos + 1].isspace():
+            pos += 1
+        if data[pos:pos + 1] == b'#':
+            pos = data.find(b'\n', pos) + 1
+            if not pos:
+                raise ValueError('Truncated PNM header.')
+            continue
+        end = pos
+        while not data[end:end + 1].isspace():
+            if end >= len(data):
+                raise ValueError('Truncated PNM header.')
+            end += 1
+        values.append(int(data[pos:end]))
+        pos = end
+    # Single whitespace character precedes binary pixel data
+    return magic, values, pos + 1
+
+
+def read_pnm(path):
+    """Reads a PBM, PGM or PPM image
+    Args:
+        path (string): Full path of image file
+    Returns:
+        Numpy 2D array (float): Brightness 0.0 (black) to 1.0 (white)
+    Note:
+        Color images are converted to luma (ITU-R 601 weights).
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, values, offset = read_pnm_header(data)
+    width, height = values[:2]
+    if magic in ('P1', 'P4'):
+        if magic == 'P4':
+            # Rows are padded to whole bytes
+            packed = np.frombuffer(data, dtype='uint8', count=height * ((width + 7) // 8),
+                                   offset=offset).reshape(height, -1)
+            bits = np.unpackbits(packed, axis=1)[:, :width]
+        else:
+            digits = np.frombuffer(data[offset - 1:], dtype='uint8')
+            bits = (digits[(digits == ord('0')) | (digits == ord('1'))] - ord('0'))
+            bits = bits[:width * height].reshape(height, width)
+        # PBM 1 is black
+        return 1.0 - bits
+    max_value = values[2]
+    channels = 3 if magic in ('P3', 'P6') else 1
+    if magic in ('P5', 'P6'):
+        dtype = 'uint8' if max_value < 256 else '>u2'
+        pixels = np.frombuffer(data, dtype=dtype, count=width * height * channels,
+                               offset=offset)
+    elif magic in ('P2', 'P3'):
+        pixels = np.array(data[offset:].split(), dtype='int32')[:width * height * channels]
+    else:
+        raise ValueError('Unsupported PNM format {0}.'.format(magic))
+    pixels = pixels.reshape(height, width, channels) / max_value
+    if channels == 3:
+        return pixels.dot([0.299, 0.587, 0.114])
+    return pixels[:, :, 0]
+
+
+def read_raw(path, width, height):
+    """Reads a raw 8-bit grayscale image
+    Args:
+        path (string): Full path of image file
+        width (int): Pixel width of image
+        height (int): Pixel height of image
+    Returns:
+        Numpy 2D array (float): Brightness 0.0 (black) to 1.0 (white)
+    """
+    pixels = np.fromfile(path, dtype='uint8', count=width * height)
+    return pixels.reshape(height, width) / 255.0
+
+
+def read_image(path, raw_size=None):
+    """Reads an image by file extension
+    Args:
+        path (string): Full path of image file
+        raw_size (Optional (int, int)): Width and height of raw files
+    Returns:
+        Numpy 2D array (float): Brightness 0.0 (black) to 1.0 (white)
+    """
+    if path.lower().endswith('.raw'):
+        if raw_size is None:
+            raise ValueError('Raw image {0} requires a size.'.format(path))
+        return read_raw(path, *raw_size)
+    return read_pnm(path)
+
+
+def scale_image(image, width, height):
+    """Scales an image
+    Args:
+        image (Numpy 2D array): Source image
+        width (int): Target pixel width
+        height (int): Target pixel height
+    Returns:
+        Numpy 2D array (float): Scaled image
+    Note:
+        Shrinking averages the source pixels covered by each target pixel
+        (box filter) and enlarging repeats source pixels (nearest neighbor).
+    """
+    def scale_axis(pixels, size, axis):
+        src = pixels.shape[axis]
+        if src == size:
+            return pixels
+        starts = np.arange(size) * src // size
+        # Each target pixel covers at least one source pixel
+        counts = np.maximum(np.diff(np.append(starts, src)), 1)
+        sums = np.add.reduceat(pixels, starts, axis=axis)
+        shape = [1, 1]
+        shape[axis] = size
+        return sums / counts.reshape(shape)
+
+    image = np.asarray(image, dtype='float64')
+    return scale_axis(scale_axis(image, height, 0), width, 1)
+
+
+def fit_size(image_width, image_height, width, height):
+    """Fits an image size inside a box keeping its aspect ratio
+    Args:
+        image_width, image_height (int): Source size
+        width, height (int): Box size
+    Returns:
+        (int, int): Fitted width and height
+    """
+    scale = min(width / float(image_width), height / float(image_height))
+    return (max(int(round(image_width * scale)), 1),
+            max(int(round(image_height * scale)), 1))
+
+
+def import_image(path, width=None, height=None, method='floyd-steinberg',
+                 keep_aspect=False, invert=False, raw_size=None):
+    """Loads an image as a monochrome bitmap
+    Args:
+        path (string): Full path of PNM or raw image file
+        width (Optional int): Target pixel width. Default is None (image width).
+        height (Optional int): Target pixel height. Default is None (image height).
+        method (Optional string): Dither method (see dither.METHODS).
+            Default is floyd-steinberg.
+        keep_aspect (Optional boolean): Fit inside width and height keeping the
+            aspect ratio. Default is False (stretch).
+        invert (Optional boolean): True inverts monochrome color. Default is False.
+        raw_size (Optional (int, int)): Width and height of raw files
+    Returns:
+        Numpy 2D array (uint8): 1 = pixel on (dark areas of the image)
+    """
+    image = read_image(path, raw_size)
+    image_height, image_width = image.shape
+    width = width or image_width
+    height = height or image_height
+    if keep_aspect:
+        width, height = fit_size(image_width, image_height, width, height)
+    # Dark areas turn pixels on
+    levels = scale_image(image, width, height)
+    if not invert:
+        levels = 1.0 - levels
+    return dither(levels, method)
+
+
+def save_pbm(path, bitmap):
+    """Saves a monochrome bitmap as a packed binary PBM (P4) file
+    Args:
+        path (string): Full path of PBM file
+        bitmap (Numpy 2D array): 1 = pixel on
+    """
+    height, width = bitmap.shape
+    with open(path, 'wb') as f:
+        f.write('P4\n{0} {1}\n'.format(width, height).encode('ascii'))
+        f.write(np.packbits(bitmap.astype(bool), axis=1).tobytes())
+
+
+def load_pbm(path):
+    """Loads a PBM file saved by save_pbm
+    Args:
+        path (string): Full path of PBM file
+    Returns:
+        Numpy 2D array (uint8): 1 = pixel on
+    """
+    return (read_pnm(path) < 0.5).astype('uint8')
+
+
+def convert_directory(source, dest, width=None, height=None, method='floyd-steinberg',
+                      keep_aspect=False, invert=False, raw_size=None):
+    """Converts every image in a directory to packed PBM files
+    Args:
+        source (string): Source directory
+        dest (string): Destination directory (created if missing)
+        width, height, method, keep_aspect, invert, raw_size: See import_image
+    Returns:
+        [string]: Paths of converted files
+    """
+    if not os.path.isdir(dest):
+        os.makedirs(dest)
+    converted = []
+    for name in sorted(os.listdir(source)):
+        base, ext = os.path.splitext(name)
+        if ext.lower() not in IMAGE_EXTENSIONS:
+            continue
+        try:
+            bitmap = import_image(os.path.join(source, name), width, height, method,
+                                  keep_aspect, invert, raw_size)
+        except ValueError as e:
+            print('Skipping {0}: {1}'.format(name, e))
+            continue
+        path = os.path.join(dest, base + '.pbm')
+        save_pbm(path, bitmap)
+        converted.append(path)
+    return converted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('source', help='source directory')
+    parser.add_argument('dest', help='destination directory')
+    parser.add_argument('--width', type=int, default=128, help='target width')
+    parser.add_argument('--height', type=int, default=64, help='target height')
+    parser.add_argument('--method', choices=METHODS, default='floyd-steinberg',
+                        help='dither method')
+    parser.add_argument('--keep-aspect', action='store_true', help='keep aspect ratio')
+    parser.add_argument('--invert', action='store_true', help='invert colors')
+    parser.add_argument('--raw-size', type=int, nargs=2, metavar=('WIDTH', 'HEIGHT'),
+                        help='size of raw source files')
+    args = parser.parse_args()
+    for path in convert_directory(args.source, args.dest, args.width, args.height,
+                                  args.method, args.keep_aspect, args.invert,
+                                  args.raw_size):
+        print(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,365 @@
+""" Raster kernels used by the Canvas primitives.
+
+The kernels hold the inherently sequential parts of the primitives
+(Bresenham lines, midpoint circles and ellipses, polygon edge walks and span
+filling).  Each has a loop version and, where the loop is slow in plain
+Python, an equivalent NumPy version.  When Numba is installed the loop
+versions are compiled and used, otherwise the NumPy versions are used.  Both
+backends produce identical pixels.
+
+Numba is imported and the kernels compiled on the first draw that needs
+them, so importing this module stays fast.  Set the environment variable
+ST7565_KERNELS=python to never load Numba, or call use_backend at run time
+(see benchmark_kernels.py).
+"""
+from __future__ import print_function
+import importlib.util
+import os
+import numpy as np
+
+KERNELS = ('line_points', 'circle_octant', 'ellipse_quadrant', 'polygon_spans', 'fill_spans')
+
+
+def line_points_loop(x1, y1, x2, y2):
+    """Bresenham line (loop)
+    Args:
+        x1, y1 (int): Starting coordinates of the line
+        x2, y2 (int): Ending coordinates of the line
+    Returns:
+        (Numpy array, Numpy array): x and y coordinates of the line pixels
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    # Determine how steep the line is
+    is_steep = abs(dy) > abs(dx)
+    # Rotate line
+    if is_steep:
+        x1, y1 = y1, x1
+        x2, y2 = y2, x2
+    # Swap start and end points if necessary
+    if x1 > x2:
+        x1, x2 = x2, x1
+        y1, y2 = y2, y1
+    # Recalculate differentials
+    dx = x2 - x1
+    dy = abs(y2 - y1)
+    xs = np.empty(dx + 1, dtype=np.int64)
+    ys = np.empty(dx + 1, dtype=np.int64)
+    # Calculate error
+    error = dx >> 1
+    ystep = 1 if y1 < y2 else -1
+    y = y1
+    for i in range(dx + 1):
+        if is_steep:
+            xs[i] = y
+            ys[i] = x1 + i
+        else:
+            xs[i] = x1 + i
+            ys[i] = y
+        error -= dy
+        if error < 0:
+            y += ystep
+            error += dx
+    return xs, ys
+
+
+def circle_octant(r):
+    """Midpoint circle
+    Args:
+        r (int): Radius
+    Returns:
+        (Numpy array, Numpy array): x and y offsets of one octant starting at (0, r)
+    """
+    xs = np.empty(r + 1, dtype=np.int64)
+    ys = np.empty(r + 1, dtype=np.int64)
+    f = 1 - r
+    dx = 1
+    dy = -r - r
+    x = 0
+    y = r
+    xs[0] = 0
+    ys[0] = r
+    n = 1
+    while x < y:
+        if f >= 0:
+            y -= 1
+            dy += 2
+            f += dy
+        x += 1
+        dx += 2
+        f += dx
+        xs[n] = x
+        ys[n] = y
+        n += 1
+    return xs[:n], ys[:n]
+
+
+def ellipse_quadrant(a, b):
+    """Midpoint ellipse
+    Args:
+        a (int): Semi axis horizontal
+        b (int): Semi axis vertical
+    Returns:
+        (Numpy array, Numpy array): x and y offsets of one quadrant starting at (0, b)
+    """
+    xs = np.empty(a + b + 1, dtype=np.int64)
+    ys = np.empty(a + b + 1, dtype=np.int64)
+    a2 = a * a
+    b2 = b * b
+    twoa2 = a2 + a2
+    twob2 = b2 + b2
+    x = 0
+    y = b
+    px = 0
+    py = twoa2 * y
+    xs[0] = 0
+    ys[0] = b
+    n = 1
+    # Region 1
+    p = round(b2 - (a2 * b) + (0.25 * a2))
+    while px < py:
+        x += 1
+        px += twob2
+        if p < 0:
+            p += b2 + px
+        else:
+            y -= 1
+            py -= twoa2
+            p += b2 + px - py
+        xs[n] = x
+        ys[n] = y
+        n += 1
+    # Region 2
+    p = round(b2 * (x + 0.5) * (x + 0.5) + a2 * (y - 1) * (y - 1) - a2 * b2)
+    while y > 0:
+        y -= 1
+        py -= twoa2
+        if p > 0:
+            p += a2 - py
+        else:
+            x += 1
+            px += twob2
+            p += a2 - py + px
+        xs[n] = x
+        ys[n] = y
+        n += 1
+    return xs[:n], ys[:n]
+
+
+def polygon_spans_loop(coords):
+    """Finds the horizontal spans filling a closed polygon outline (loop)
+    Args:
+        coords (Numpy 2D array): Vertex x,y pairs per row (last equals first)
+    Returns:
+        (Numpy array, Numpy array, Numpy array): Row, first and last x of each span
+    """
+    ymin = coords[:, 1].min()
+    rows = coords[:, 1].max() - ymin + 1
+    # Minimum and maximum x per row (max < min marks rows not reached)
+    xmin = np.full(rows, 1 << 30, dtype=np.int64)
+    xmax = np.full(rows, -(1 << 30), dtype=np.int64)
+    x1 = coords[0, 0]
+    y1 = coords[0, 1]
+    xmin[y1 - ymin] = x1
+    xmax[y1 - ymin] = x1
+    for i in range(1, coords.shape[0]):
+        x2 = coords[i, 0]
+        y2 = coords[i, 1]
+        xprev = x2
+        yprev = y2
+        # Check for horizontal side
+        if y1 == y2:
+            if x1 > x2:
+                x1, x2 = x2, x1
+            xmin[y1 - ymin] = min(x1, xmin[y1 - ymin])
+            xmax[y1 - ymin] = max(x2, xmax[y1 - ymin])
+            x1 = xprev
+            y1 = yprev
+            continue
+        # Walk non horizontal side
+        xs, ys = line_points_loop(x1, y1, x2, y2)
+        for j in range(xs.shape[0]):
+            row = ys[j] - ymin
+            xmin[row] = min(xs[j], xmin[row])
+            xmax[row] = max(xs[j], xmax[row])
+        x1 = xprev
+        y1 = yprev
+    rows_hit = np.flatnonzero(xmax >= xmin)
+    return rows_hit + ymin, xmin[rows_hit], xmax[rows_hit]
+
+
+def fill_spans_loop(buffer, rows, x1s, x2s, color, invert):
+    """Fills horizontal spans (loop)
+    Args:
+        buffer (Numpy 2D array): Pixels (pass buffer.T for vertical spans)
+        rows, x1s, x2s (Numpy array): Row, first and last x (inclusive) of each span
+        color (int): Pixel value
+        invert (boolean): Invert pixels instead (overrides color)
+    """
+    for i in range(rows.shape[0]):
+        if invert:
+            buffer[rows[i], x1s[i]:x2s[i] + 1] = buffer[rows[i], x1s[i]:x2s[i] + 1] ^ 1
+        else:
+            buffer[rows[i], x1s[i]:x2s[i] + 1] = color
+
+
+def line_points_vector(x1, y1, x2, y2):
+    """Bresenham line (NumPy)
+    Args:
+        x1, y1 (int): Starting coordinates of the line
+        x2, y2 (int): Ending coordinates of the line
+    Returns:
+        (Numpy array, Numpy array): x and y coordinates of the line pixels
+    Note:
+        Closed form of line_points_loop: after i steps the minor axis has moved
+        ceil((i * dy - dx // 2) / dx) pixels.
+    """
+    is_steep = abs(y2 - y1) > abs(x2 - x1)
+    if is_steep:
+        x1, y1 = y1, x1
+        x2, y2 = y2, x2
+    if x1 > x2:
+        x1, x2 = x2, x1
+        y1, y2 = y2, y1
+    dx = x2 - x1
+    dy = abs(y2 - y1)
+    steps = np.arange(dx + 1, dtype=np.int64)
+    if dx:
+        moved = -(((dx >> 1) - steps * dy) // dx)
+    else:
+        moved = steps
+    major = x1 + steps
+    minor = y1 + (1 if y1 < y2 else -1) * moved
+    if is_steep:
+        return minor, major
+    return major, minor
+
+
+def polygon_spans_vector(coords):
+    """Finds the horizontal spans filling a closed polygon outline (NumPy)
+    Args:
+        coords (Numpy 2D array): Vertex x,y pairs per row (last equals first)
+    Returns:
+        (Numpy array, Numpy array, Numpy array): Row, first and last x of each span
+    """
+    # Every outline pixel (horizontal sides only need their end points)
+    xs = [coords[:, 0]]
+    ys = [coords[:, 1]]
+    for (x1, y1), (x2, y2) in zip(coords[:-1].tolist(), coords[1:].tolist()):
+        if y1 != y2:
+            points = line_points_vector(x1, y1, x2, y2)
+            xs.append(points[0])
+            ys.append(points[1])
+    xs = np.concatenate(xs)
+    ys = np.concatenate(ys)
+    ymin = ys.min()
+    rows = ys.max() - ymin + 1
+    xmin = np.full(rows, 1 << 30, dtype=np.int64)
+    xmax = np.full(rows, -(1 << 30), dtype=np.int64)
+    np.minimum.at(xmin, ys - ymin, xs)
+    np.maximum.at(xmax, ys - ymin, xs)
+    rows_hit = np.flatnonzero(xmax >= xmin)
+    return rows_hit + ymin, xmin[rows_hit], xmax[rows_hit]
+
+
+def fill_spans_vector(buffer, rows, x1s, x2s, color, invert):
+    """Fills horizontal spans (NumPy)
+    Args:
+        buffer (Numpy 2D array): Pixels (pass buffer.T for vertical spans)
+        rows, x1s, x2s (Numpy array): Row, first and last x (inclusive) of each span
+        color (int): Pixel value
+        invert (boolean): Invert pixels instead (overrides color)
+    Note:
+        Counts how many spans cover each pixel of the bounding box so the
+        whole fill is one masked write.  Pixels covered an even number of
+        times are left unchanged when inverting, like sequential span writes.
+    """
+    if not len(rows):
+        return
+    r1, c1 = rows.min(), x1s.min()
+    height, width = rows.max() - r1 + 1, x2s.max() - c1 + 2
+    # Span starts add one and ends subtract one, then a running sum per row
+    starts = (rows - r1) * width + x1s - c1
+    ends = (rows - r1) * width + x2s - c1 + 1
+    counts = (np.bincount(starts, minlength=height * width) -
+              np.bincount(ends, minlength=height * width))
+    counts = counts.reshape(height, width).cumsum(axis=1)[:, :-1]
+    region = buffer[r1:r1 + counts.shape[0], c1:c1 + counts.shape[1]]
+    if invert:
+        region ^= (counts & 1).astype(region.dtype)
+    else:
+        region[counts > 0] = color
+
+
+# Loop kernels (compiled by Numba) and NumPy kernels by name
+LOOPS = {'line_points': line_points_loop, 'circle_octant': circle_octant,
+         'ellipse_quadrant': ellipse_quadrant, 'polygon_spans': polygon_spans_loop,
+         'fill_spans': fill_spans_loop}
+BACKENDS = {'python': {'line_points': line_points_vector, 'circle_octant': circle_octant,
+                       'ellipse_quadrant': ellipse_quadrant,
+                       'polygon_spans': polygon_spans_vector,
+                       'fill_spans': fill_spans_vector}}
+
+
+def compile_kernels():
+    """Compiles the loop kernels with Numba
+    Returns:
+        dict: Compiled kernels by name
+    """
+    from numba import njit
+    compiled = dict((name, njit(cache=True)(func)) for name, func in LOOPS.items())
+    # polygon_spans_loop calls the compiled line walk through the module global
+    globals()['line_points_loop'] = compiled['line_points']
+    # Compile common argument types now rather than on first draw
+    buffer = np.zeros((8, 8), dtype='uint8')
+    spans = compiled['polygon_spans'](np.array([[0, 0], [4, 2], [0, 4], [0, 0]], dtype=np.int64))
+    for pixels in (buffer, buffer.T):
+        compiled['fill_spans'](pixels, *spans, color=1, invert=False)
+    compiled['circle_octant'](2)
+    compiled['ellipse_quadrant'](2, 1)
+    return compiled
+
+
+def compile_on_first_use(name):
+    """Creates a stand-in kernel that compiles the Numba kernels when called
+    Args:
+        name (string): Kernel name
+    Returns:
+        function: Stand-in kernel
+    """
+    def kernel(*args, **kwargs):
+        try:
+            BACKENDS['numba'] = compile_kernels()
+        except Exception as e:
+            # Numba failed to load or compile (e.g. unsupported platform)
+            print('Numba kernels unavailable ({0}), using the Python kernel backend.'.format(e))
+            globals()['line_points_loop'] = LOOPS['line_points']
+            del BACKENDS['numba']
+            use_backend('python')
+            return BACKENDS['python'][name](*args, **kwargs)
+        if backend == 'numba':
+            use_backend('numba')
+        return BACKENDS['numba'][name](*args, **kwargs)
+    return kernel
+
+
+def use_backend(name):
+    """Selects the kernel implementation
+    Args:
+        name (string): python or numba
+    """
+    if name not in BACKENDS:
+        print('Kernel backend {0} is not available.'.format(name))
+        return
+    global backend
+    backend = name
+    globals().update(BACKENDS[name])
+
+
+backend = None
+use_backend('python')
+# Finding Numba doesn't import it (see compile_on_first_use)
+if (os.environ.get('ST7565_KERNELS', 'numba') != 'python' and
+        importlib.util.find_spec('numba') is not None):
+    BACKENDS['numba'] = dict((name, compile_on_first_use(name)) for name in KERNELS)
+    use_backend('numba')
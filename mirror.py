@@ -0,0 +1,490 @@
+""" Mirrors what a display shows to remote viewers.
+
+FrameMirror wraps write_page of a Glcd to keep a copy of the display RAM
+(packed pages).  After each batch of page writes (Glcd.end_frame) the copy is
+XORed with the previously published frame and the delta is run length
+encoded and sent to every viewer connected to a TCP or Unix socket.  Frames
+ending faster than max_fps are coalesced.  Viewers get a keyframe when they
+connect and whenever they fall behind.
+
+Stream layout (little endian):
+    header    magic 'ST7565MR', version (H), pages (H), columns (H)
+    messages  kind (B), frame number (I), payload length (I), payload
+              KEYFRAME payload is the encoded frame, DELTA payload the encoded
+              XOR of the frame with the previous one
+
+Run length encoding (PackBits): control byte n < 128 is followed by n + 1
+literal bytes, n >= 128 by one byte repeated n - 125 times.
+
+Usage:
+    mirror = FrameMirror(glcd, ('', 7565))    # or a Unix socket path
+    python mirror.py raspberrypi:7565         # viewer (uses soft_display)
+"""
+from __future__ import print_function
+import argparse
+import os
+import queue
+import select
+import socket
+import struct
+import threading
+import time
+import numpy as np
+
+MAGIC = b'ST7565MR'
+VERSION = 1
+HEADER = struct.Struct('<8sHHH')
+MESSAGE = struct.Struct('<BII')
+# Message kinds
+KEYFRAME = 0
+DELTA = 1
+PORT = 7565
+
+
+def rle_encode(data):
+    """Run length encodes bytes (PackBits)
+    Args:
+        data (bytes): Bytes to encode
+    Returns:
+        bytes: Encoded bytes
+    """
+    values = np.frombuffer(data, dtype=np.uint8)
+    out = bytearray()
+    if not len(values):
+        return bytes(out)
+    # Start and length of every run of equal bytes
+    starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+    lengths = np.diff(np.append(starts, len(values)))
+
+    def add_literal(start, end):
+        for idx in range(start, end, 128):
+            chunk = data[idx:min(idx + 128, end)]
+            out.append(len(chunk) - 1)
+            out.extend(chunk)
+
+    literal = None
+    for start, length in zip(starts.tolist(), lengths.tolist()):
+        if length < 3:
+            # Short runs are cheaper as literal bytes
+            if literal is None:
+                literal = start
+            continue
+        if literal is not None:
+            add_literal(literal, start)
+            literal = None
+        value = data[start]
+        while length >= 3:
+            count = min(length, 129)
+            out.append(count + 125)
+            out.append(value)
+            start += count
+            length -= count
+        if length:
+            literal = start
+    if literal is not None:
+        add_literal(literal, len(data))
+    return bytes(out)
+
+
+def rle_decode(data):
+    """Decodes run length encoded bytes (see rle_encode)
+    Args:
+        data (bytes): Encoded bytes
+    Returns:
+        bytes: Decoded bytes
+    """
+    out = bytearray()
+    pos = 0
+    while pos < len(data):
+        control = data[pos]
+        if control < 128:
+            out.extend(data[pos + 1:pos + control + 2])
+            pos += control + 2
+        else:
+            out.extend(data[pos + 1:pos + 2] * (control - 125))
+            pos += 2
+    return bytes(out)
+
+
+def parse_address(text):
+    """Parses a viewer address
+    Args:
+        text (string): host:port or a Unix socket path
+    Returns:
+        (string, int) or string: TCP address or Unix socket path
+    """
+    host, sep, port = text.rpartition(':')
+    if sep and port.isdigit():
+        return host, int(port)
+    return text
+
+
+def create_socket(address):
+    """Creates a stream socket for a TCP address tuple or a Unix socket path"""
+    if isinstance(address, tuple):
+        return socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+
+class MirrorConnection(object):
+    """Sends mirror messages to one viewer on a background thread
+    Attributes:
+        closed: The viewer disconnected or the connection was closed
+    """
+
+    def __init__(self, sock, header, backlog):
+        """Constructor for mirror connection.
+        Args:
+            sock (socket): Connected viewer socket
+            header (bytes): Stream header
+            backlog (int): Messages queued before the viewer is resynchronized
+        """
+        self.sock = sock
+        self.closed = False
+        self.queue = queue.Queue(backlog)
+        self.queue.put(header)
+        self.thread = threading.Thread(target=self.__send_loop)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def __send_loop(self):
+        while True:
+            message = self.queue.get()
+            if message is None:
+                break
+            try:
+                self.sock.sendall(message)
+            except (IOError, OSError):
+                break
+        self.closed = True
+
+    def drain(self):
+        """Discards queued messages"""
+        try:
+            while True:
+                self.queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def send(self, message, keyframe):
+        """Queues a delta message
+        Args:
+            message (bytes): Delta message
+            keyframe (function): Returns a keyframe message, sent instead when
+                the viewer has fallen behind
+        """
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            # Queued deltas are replaced by one keyframe of the current frame
+            self.drain()
+            self.queue.put_nowait(keyframe())
+
+    def close(self):
+        """Stops sending and closes the socket"""
+        self.drain()
+        self.queue.put_nowait(None)
+        try:
+            # Unblocks a send to a viewer that stopped reading
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except (IOError, OSError):
+            pass
+        self.thread.join()
+        self.sock.close()
+
+
+class FrameMirror(object):
+    """Publishes the frames shown by a Glcd to remote viewers
+    Attributes:
+        frames: Number of frames published
+        keyframes: Number of keyframes sent
+        raw_bytes: Bytes of the published frames before encoding
+        encoded_bytes: Bytes of the encoded deltas
+    Note:
+        Create the mirror before init so every write to the display is seen.
+        Frames are in the panel's orientation (see Glcd.get_panel_pixels).
+    """
+
+    def __init__(self, glcd, address=('', PORT), backlog=8, max_fps=30):
+        """Constructor for frame mirror.
+        Args:
+            glcd (Glcd object): Display to mirror (its methods are wrapped until close)
+            address (Optional (string, int) or string): TCP address or Unix
+                socket path to listen on. Default is port 7565 on all interfaces.
+            backlog (Optional int): Messages queued per viewer before it gets a
+                keyframe instead. Default is 8.
+            max_fps (Optional int): Maximum frames published per second. Default
+                is 30. None publishes every frame on the caller's thread.
+        """
+        self.glcd = glcd
+        self.address = address
+        self.frames = 0
+        self.keyframes = 0
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+        self.backlog = backlog
+        pages, columns = glcd.LCD_PAGE_COUNT, glcd.LCD_WIDTH
+        self.header = HEADER.pack(MAGIC, VERSION, pages, columns)
+        # Display RAM written so far and the last frame sent to viewers
+        self.frame = np.zeros((pages, columns), dtype=np.uint8)
+        self.published = self.frame.copy()
+        self.viewers = []
+        self.lock = threading.Lock()
+        self.interval = 1.0 / max_fps if max_fps else None
+        # Frame ended but not yet published (see __publish_loop)
+        self.__pending = False
+        self.__condition = threading.Condition()
+
+        self.server = create_socket(address)
+        if isinstance(address, tuple):
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        elif os.path.exists(address):
+            os.remove(address)
+        self.server.bind(address)
+        self.server.listen(5)
+        # Timeout lets the accept loop notice close
+        self.server.settimeout(.5)
+        self.__running = True
+        self.__accept_thread = threading.Thread(target=self.__accept_loop)
+        self.__accept_thread.daemon = True
+        self.__accept_thread.start()
+        self.__publish_thread = None
+        if self.interval is not None:
+            self.__publish_thread = threading.Thread(target=self.__publish_loop)
+            self.__publish_thread.daemon = True
+            self.__publish_thread.start()
+
+        # Wrap instance methods (later calls inside the Glcd go through them)
+        self.wrapped = {}
+        write_page = self.wrap('write_page')
+
+        def recorded(page, data, x=0):
+            write_page(page, data, x)
+            with self.lock:
+                self.frame[page, x:x + len(data)] = data
+        glcd.write_page = recorded
+        end_frame = self.wrap('end_frame')
+
+        def ended(*args, **kwargs):
+            end_frame(*args, **kwargs)
+            self.end_frame()
+        glcd.end_frame = ended
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def wrap(self, name):
+        """Remembers a Glcd method about to be replaced
+        Args:
+            name (string): Method name
+        Returns:
+            function: The original method
+        """
+        method = getattr(self.glcd, name)
+        self.wrapped[name] = method
+        return method
+
+    def end_frame(self):
+        """Publishes the frame now or, with max_fps, on the publish thread"""
+        if self.interval is None:
+            self.publish()
+            return
+        with self.__condition:
+            self.__pending = True
+            self.__condition.notify()
+
+    def __publish_loop(self):
+        """Publishes ended frames no faster than max_fps"""
+        while True:
+            with self.__condition:
+                while not self.__pending and self.__running:
+                    self.__condition.wait()
+                if not self.__running:
+                    return
+                self.__pending = False
+            start = time.time()
+            self.publish()
+            delay = self.interval - (time.time() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+    def get_keyframe(self):
+        """Encodes the last published frame as a keyframe message"""
+        self.keyframes += 1
+        payload = rle_encode(self.published.tobytes())
+        return MESSAGE.pack(KEYFRAME, self.frames, len(payload)) + payload
+
+    def publish(self):
+        """Sends the changes since the last published frame to the viewers"""
+        with self.lock:
+            delta = self.frame ^ self.published
+            if not delta.any():
+                return
+            self.published = self.frame.copy()
+            self.frames += 1
+            payload = rle_encode(delta.tobytes())
+            self.raw_bytes += delta.size
+            self.encoded_bytes += len(payload)
+            message = MESSAGE.pack(DELTA, self.frames, len(payload)) + payload
+            keyframe = []
+
+            def get_keyframe():
+                # Encoded once however many viewers fell behind
+                if not keyframe:
+                    keyframe.append(self.get_keyframe())
+                return keyframe[0]
+            for viewer in self.viewers:
+                viewer.send(message, get_keyframe)
+
+    def __accept_loop(self):
+        while self.__running:
+            try:
+                sock, _ = self.server.accept()
+            except socket.timeout:
+                continue
+            except (IOError, OSError):
+                break
+            sock.settimeout(None)
+            with self.lock:
+                viewer = MirrorConnection(sock, self.header, self.backlog)
+                viewer.send(self.get_keyframe(), self.get_keyframe)
+                # Forget viewers that disconnected
+                self.viewers = [v for v in self.viewers if not v.closed] + [viewer]
+
+    def close(self):
+        """Restores the Glcd methods, disconnects viewers and stops listening"""
+        for name in self.wrapped:
+            # Remove the instance attribute so the class method is used again
+            delattr(self.glcd, name)
+        self.wrapped = {}
+        with self.__condition:
+            self.__running = False
+            self.__condition.notify()
+        if self.__publish_thread is not None:
+            self.__publish_thread.join()
+        # Send whatever was written since the last published frame
+        self.publish()
+        self.__accept_thread.join()
+        self.server.close()
+        if not isinstance(self.address, tuple) and os.path.exists(self.address):
+            os.remove(self.address)
+        with self.lock:
+            viewers, self.viewers = self.viewers, []
+        for viewer in viewers:
+            viewer.close()
+
+
+class MirrorViewer(object):
+    """Receives the frames published by a FrameMirror
+    Attributes:
+        frame: Packed pages of the current frame
+        frame_number: Number of the current frame
+        closed: The stream ended
+    """
+
+    def __init__(self, address):
+        """Constructor for mirror viewer.
+        Args:
+            address ((string, int) or string): TCP address or Unix socket path
+        """
+        self.sock = create_socket(address)
+        self.sock.connect(address)
+        self.closed = False
+        magic, version, pages, columns = HEADER.unpack(self.__receive(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('{0} is not a version {1} mirror stream.'.format(address, VERSION))
+        self.frame = np.zeros((pages, columns), dtype=np.uint8)
+        self.frame_number = 0
+
+    def __receive(self, size):
+        """Reads exactly size bytes (fewer when the stream ends)"""
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                self.closed = True
+                break
+            data.extend(chunk)
+        return bytes(data)
+
+    def read_message(self):
+        """Reads one message and applies it to the frame
+        Returns:
+            boolean: True if a message was applied, False if the stream ended
+        """
+        header = self.__receive(MESSAGE.size)
+        if len(header) < MESSAGE.size:
+            return False
+        kind, number, length = MESSAGE.unpack(header)
+        payload = self.__receive(length)
+        if len(payload) < length:
+            return False
+        pixels = np.frombuffer(rle_decode(payload), dtype=np.uint8)
+        if pixels.size != self.frame.size:
+            raise ValueError('Mirror message {0} has {1} bytes, expected {2}.'.format(
+                number, pixels.size, self.frame.size))
+        pixels = pixels.reshape(self.frame.shape)
+        if kind == KEYFRAME:
+            self.frame = pixels.copy()
+        else:
+            self.frame ^= pixels
+        self.frame_number = number
+        return True
+
+    def update(self, timeout=None):
+        """Applies all received messages
+        Args:
+            timeout (Optional float): Seconds to wait for the first message.
+                Default is None (wait until one arrives).
+        Returns:
+            boolean: True if the frame changed
+        """
+        changed = False
+        wait = timeout
+        while not self.closed:
+            readable, _, _ = select.select([self.sock], [], [], wait)
+            if not readable:
+                break
+            changed = self.read_message() or changed
+            # Only drain messages that already arrived
+            wait = 0
+        return changed
+
+    def get_pixels(self):
+        """Gets the pixels of the current frame
+        Returns:
+            Numpy 2D array: Pixels (rows, columns) 0 = off, 1 = on
+        """
+        return np.unpackbits(self.frame, axis=0)
+
+    def close(self):
+        """Disconnects from the mirror"""
+        self.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('address', help='host:port or Unix socket path of the mirror')
+    args = parser.parse_args()
+
+    import soft_display
+    viewer = MirrorViewer(parse_address(args.address))
+    display = soft_display.Glcd()
+    try:
+        while not viewer.closed:
+            # Redraw at least twice a second so the window stays responsive
+            if viewer.update(.5):
+                display.canvas.buffer[:] = viewer.get_pixels()
+            display.flip()
+        print('Mirror stream ended.')
+    except KeyboardInterrupt:
+        print('\nCtrl-C pressed.  Cleaning up and exiting...')
+    finally:
+        viewer.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+from __future__ import print_function
+from functools import partial
+from multiprocessing import Pool
+import time
+import numpy as np
+from canvas import Canvas
+from frame_stream import FrameStreamWriter
+
+
+def render_frame(frame_func, width, height, param):
+    """Renders a single frame onto an offscreen canvas
+    Args:
+        frame_func (function): Draws a frame. Called as frame_func(canvas, param)
+        width (int): Pixel width of frame
+        height (int): Pixel height of frame
+        param: Frame parameter passed to frame_func
+    Returns:
+        Numpy 2D array (uint8): Packed frame pages
+    """
+    canvas = Canvas(width, height)
+    frame_func(canvas, param)
+    return canvas.pack()
+
+
+def prerender(frame_func, params, width=128, height=64, processes=None, path=None):
+    """Renders frames in a process pool
+    Args:
+        frame_func (function): Draws a frame. Called as frame_func(canvas, param)
+        params (iterable): Frame parameters (one frame per parameter)
+        width (Optional int): Pixel width of frames. Default is 128.
+        height (Optional int): Pixel height of frames. Default is 64.
+        processes (Optional int): Worker processes. Default is None (one per CPU core).
+        path (Optional string): Saves the frame cache to this path. Default is None.
+    Returns:
+        FrameCache object
+    Note:
+        frame_func must be a module level function so it can be sent to the
+        worker processes.  Frames are returned in parameter order.
+    """
+    pool = Pool(processes)
+    try:
+        frames = pool.map(partial(render_frame, frame_func, width, height), params)
+    finally:
+        pool.close()
+        pool.join()
+    cache = FrameCache(np.array(frames, dtype='uint8').reshape(-1, height >> 3, width))
+    if path is not None:
+        cache.save(path)
+    return cache
+
+
+class FrameCache(object):
+    """Packed frames ready to send to the display
+    Attributes:
+        frames: A 3D Numpy array (frames, pages, columns) of packed bytes
+    """
+
+    def __init__(self, frames):
+        """Constructor for frame cache.
+        Args:
+            frames (Numpy 3D array): Packed frames (frames, pages, columns)
+        """
+        self.frames = frames
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, idx):
+        return self.frames[idx]
+
+    def save(self, path):
+        """Saves frames to a Numpy .npy file
+        Args:
+            path (string): Full target path
+        """
+        np.save(path, self.frames)
+
+    def save_stream(self, path, delta=True, keyframe_interval=0):
+        """Saves frames to a memory mapped stream file (see frame_stream.py)
+        Args:
+            path (string): Full target path
+            delta (Optional boolean): Only store changed pages. Default is True.
+            keyframe_interval (Optional int): Frames between full frames. Default is 0.
+        """
+        with FrameStreamWriter(path, delta, keyframe_interval,
+                               *self.frames.shape[1:]) as writer:
+            for frame in self.frames:
+                writer.write(frame)
+
+    @staticmethod
+    def load(path):
+        """Loads frames saved with FrameCache.save
+        Args:
+            path (string): Full source path
+        Returns:
+            FrameCache object (frames are memory mapped)
+        """
+        return FrameCache(np.load(path, mmap_mode='r'))
+
+    def play(self, glcd, fps=None, loops=1):
+        """Sends frames to the display
+        Args:
+            glcd (Glcd object): Target display
+            fps (Optional float): Frames per second. Default is None (as fast as SPI allows).
+            loops (Optional int): Times to play the frames. Default is 1.
+        """
+        interval = 1.0 / fps if fps else 0
+        next_frame = time.time()
+        for _ in range(loops):
+            for frame in self.frames:
+                glcd.send_frame(frame)
+                if interval:
+                    # Pace frames against a fixed schedule to avoid drift
+                    next_frame += interval
+                    delay = next_frame - time.time()
+                    if delay > 0:
+                        time.sleep(delay)
+                    else:
+                        next_frame = time.time()
@@ -70,9 +70,11 @@ class Glcd(st7565.Glcd):
 
         self.screen.fill(Glcd.WHITE)
 
-        for y in range(0, 64):
-            for x in range(0, 128):
-                pixel = self.back_buffer[y, x]
+        # Panel orientation (portrait canvases are rotated like on the display)
+        pixels = self.get_panel_pixels()
+        for y in range(0, st7565.Glcd.LCD_HEIGHT):
+            for x in range(0, st7565.Glcd.LCD_WIDTH):
+                pixel = pixels[y, x]
                 if pixel:
                     color = Glcd.BLACK
                 else:
@@ -0,0 +1,245 @@
+from __future__ import print_function
+import threading
+import numpy as np
+from canvas import Canvas, canvas_primitives
+from st7565 import get_spi_bufsiz
+
+
+class SharedSpiBus(object):
+    """Shares one SPI handle between several ST7565 displays
+    Note:
+        Each display needs its own chip select and register select (A0) GPIO
+        pins.  Chip select is driven by GPIO for every transfer so the SPI
+        driver's hardware chip select is disabled.
+    """
+
+    def __init__(self, bus=0, device=0, speed_hz=250000, gpio=None, spi=None, chunk_size=None):
+        """Constructor for shared SPI bus.
+        Args:
+            bus (Optional int): SPI bus. Default is 0.
+            device (Optional int): SPI device. Default is 0.
+            speed_hz (Optional int): SPI clock in hertz. Default is 250000.
+            gpio (Optional module): GPIO module. Default is None (RPi.GPIO).
+            spi (Optional SpiDev): Opened SPI device. Default is None (opens bus.device).
+            chunk_size (Optional int): Maximum bytes per transfer. Default is None (driver bufsiz).
+        """
+        # Cache GPIO module handle for transfers
+        if gpio is None:
+            import RPi.GPIO as gpio
+        self.gpio = gpio
+        if spi is None:
+            import spidev
+            spi = spidev.SpiDev()
+            spi.open(bus, device)
+            spi.max_speed_hz = speed_hz
+        self.spi = spi
+        # Chip select is driven per display by GPIO
+        self.spi.no_cs = True
+        # Longer transfers are split (spidev rejects transfers over bufsiz)
+        bufsiz = get_spi_bufsiz(spi)
+        self.chunk_size = min(chunk_size or bufsiz, bufsiz)
+
+        # Serializes transfers (re-entrant so a page write can hold the bus)
+        self.lock = threading.RLock()
+        # Attached displays in attach order
+        self.panels = []
+        # Dirty column ranges per display {display: {page: [x1, x2]}}
+        self.__dirty = {}
+        # Index of display served first on next flush
+        self.__next_panel = 0
+
+    def attach(self, glcd):
+        """Registers a display on the bus and deselects it
+        Args:
+            glcd (Glcd object): Display using this bus
+        """
+        with self.lock:
+            self.gpio.output(glcd.cs, self.gpio.HIGH)
+            self.panels.append(glcd)
+            self.__dirty[glcd] = {}
+
+    def detach(self, glcd):
+        """Removes a display from the bus.  Closes SPI after the last display.
+        Args:
+            glcd (Glcd object): Display using this bus
+        """
+        with self.lock:
+            if glcd not in self.panels:
+                return
+            self.panels.remove(glcd)
+            del self.__dirty[glcd]
+            if not self.panels:
+                self.close()
+
+    def close(self):
+        """Clean up SPI and GPIO"""
+        self.spi.close()
+        self.gpio.cleanup()
+
+    def transfer(self, glcd, data, data_mode):
+        """Sends bytes to a single display on the bus
+        Args:
+            glcd (Glcd object): Target display
+            data ([int]): Bytes to send
+            data_mode (boolean): True sends display data, False sends commands
+        """
+        gpio = self.gpio
+        with self.lock:
+            # Select display
+            gpio.output(glcd.cs, gpio.LOW)
+            # Set data or command mode
+            gpio.output(glcd.a0, gpio.HIGH if data_mode else gpio.LOW)
+            chunk = self.chunk_size
+            for idx in range(0, len(data), chunk):
+                self.spi.xfer(data[idx:idx + chunk])
+            # Deselect display
+            gpio.output(glcd.cs, gpio.HIGH)
+
+    def invalidate(self, glcd, x, y, w, h):
+        """Marks a region of a display's back buffer for the next flush
+        Args:
+            glcd (Glcd object): Display on this bus
+            x, y (int): Top left coordinates of region
+            w, h (int): Width & height in pixels of region
+        """
+        x, y, w, h = glcd.get_panel_region(x, y, w, h)
+        # Clip region to display
+        x1, y1 = max(x, 0), max(y, 0)
+        x2, y2 = min(x + w, glcd.LCD_WIDTH), min(y + h, glcd.LCD_HEIGHT)
+        if x1 >= x2 or y1 >= y2:
+            return
+        with self.lock:
+            pages = self.__dirty[glcd]
+            for page in range(y1 >> 3, ((y2 - 1) >> 3) + 1):
+                # Merge with existing dirty column range on the page
+                if page in pages:
+                    pages[page] = [min(x1, pages[page][0]), max(x2, pages[page][1])]
+                else:
+                    pages[page] = [x1, x2]
+
+    def invalidate_all(self, glcd):
+        """Marks a display's entire back buffer for the next flush
+        Args:
+            glcd (Glcd object): Display on this bus
+        """
+        self.invalidate(glcd, 0, 0, glcd.LCD_WIDTH, glcd.LCD_HEIGHT)
+
+    def is_dirty(self):
+        """Checks if any display has regions waiting to be flushed
+        Returns:
+            boolean: True if a flush would send data.
+        """
+        with self.lock:
+            return any(self.__dirty[glcd] for glcd in self.panels)
+
+    def flush(self, max_segments=None):
+        """Sends dirty regions of all displays
+        Args:
+            max_segments (Optional int): Maximum page segments to send.
+                Default is None (send everything).
+        Returns:
+            int: Number of page segments sent
+        Note:
+            Displays are served round robin one page segment at a time so a
+            large update on one display cannot starve the others.  The first
+            display served rotates between calls.
+        """
+        sent = 0
+        written = []
+        with self.lock:
+            count = len(self.panels)
+            if count == 0:
+                return 0
+            start = self.__next_panel % count
+            order = self.panels[start:] + self.panels[:start]
+            while max_segments is None or sent < max_segments:
+                progress = False
+                for glcd in order:
+                    if max_segments is not None and sent >= max_segments:
+                        break
+                    pages = self.__dirty[glcd]
+                    if not pages:
+                        continue
+                    # Send the display's lowest dirty page
+                    page = min(pages)
+                    x1, x2 = pages.pop(page)
+                    glcd.write_page(page, glcd.pack_page(page, x1, x2), x1)
+                    if glcd not in written:
+                        written.append(glcd)
+                    sent += 1
+                    progress = True
+                if not progress:
+                    break
+            self.__next_panel = (start + 1) % count
+        for glcd in written:
+            glcd.end_frame()
+        return sent
+
+
+@canvas_primitives
+class TiledDisplay(object):
+    """Several displays on a shared bus treated as one large canvas
+    Attributes:
+        canvas: Canvas object spanning all displays
+        width: Pixel width of the tiled canvas
+        height: Pixel height of the tiled canvas
+    Note:
+        Drawing primitives are provided by the tiled Canvas (self.canvas).
+    """
+
+    def __init__(self, bus, panels, columns):
+        """Constructor for tiled display.
+        Args:
+            bus (SharedSpiBus object): Bus the displays are attached to
+            panels ([Glcd object]): Displays in row major order (left to right, top to bottom)
+            columns (int): Number of displays per row
+        """
+        self.bus = bus
+        self.panels = panels
+        self.columns = columns
+        self.rows = (len(panels) + columns - 1) // columns
+        self.width = columns * panels[0].LCD_WIDTH
+        self.height = self.rows * panels[0].LCD_HEIGHT
+        self.canvas = Canvas(self.width, self.height)
+
+    @property
+    def back_buffer(self):
+        """Numpy 2D array spanning all displays"""
+        return self.canvas.buffer
+
+    def clear_back_buffer(self):
+        """Clear back buffer only"""
+        self.canvas.clear()
+
+    def get_tile(self, idx):
+        """Gets the region of the canvas shown by a display
+        Args:
+            idx (int): Display index
+        Returns:
+            Numpy 2D array view into the back buffer
+        """
+        glcd = self.panels[idx]
+        y = (idx // self.columns) * glcd.LCD_HEIGHT
+        x = (idx % self.columns) * glcd.LCD_WIDTH
+        return self.back_buffer[y:y + glcd.LCD_HEIGHT, x:x + glcd.LCD_WIDTH]
+
+    def flip(self, max_segments=None):
+        """Send changed regions of the canvas to the displays
+        Args:
+            max_segments (Optional int): Maximum page segments to send.
+                Default is None (send everything).
+        Returns:
+            int: Number of page segments sent
+        """
+        for idx, glcd in enumerate(self.panels):
+            tile = self.get_tile(idx)
+            # Find changed rows and columns of the display
+            changed = tile != glcd.back_buffer
+            rows = np.flatnonzero(changed.any(axis=1))
+            if rows.size == 0:
+                continue
+            cols = np.flatnonzero(changed.any(axis=0))
+            glcd.back_buffer[:] = tile
+            self.bus.invalidate(glcd, cols[0], rows[0],
+                                cols[-1] - cols[0] + 1, rows[-1] - rows[0] + 1)
+        return self.bus.flush(max_segments)
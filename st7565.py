@@ -1,12 +1,37 @@
 from __future__ import print_function
 from time import sleep
-import math
 import numpy as np
+from canvas import Canvas, canvas_primitives, pack_pages
 
+# spidev kernel module parameter holding the largest transfer in bytes
+SPIDEV_BUFSIZ_PATH = '/sys/module/spidev/parameters/bufsiz'
+# spidev default when the parameter can't be read
+SPIDEV_BUFSIZ = 4096
 
+
+def get_spi_bufsiz(spi):
+    """Gets the largest transfer the SPI driver accepts
+    Args:
+        spi (SpiDev): Opened SPI device
+    Returns:
+        int: Maximum bytes per xfer call
+    """
+    # Emulated SPI devices report their own limit (mocked ones don't)
+    bufsiz = getattr(spi, 'bufsiz', None)
+    if isinstance(bufsiz, int):
+        return bufsiz
+    try:
+        with open(SPIDEV_BUFSIZ_PATH) as f:
+            return int(f.read())
+    except (IOError, OSError, ValueError):
+        return SPIDEV_BUFSIZ
+
+
+@canvas_primitives
 class Glcd(object):
     """ST7565 graphics lcd module object
     Note:  All coordinates are zero based.
+        Drawing primitives are provided by the display's Canvas (self.canvas).
     """
     # LCD commands from datasheet
     CMD_DISPLAY_OFF = 0xAE
@@ -39,21 +64,37 @@ class Glcd(object):
     LCD_HEIGHT = 64
     LCD_PAGE_COUNT = 8
     LCD_CONTRAST = 0x19
+    # Display RAM columns (panel shows 128 of them)
+    LCD_RAM_WIDTH = 132
 
     BACKLIGHT_PWM_FREQUENCY = 100
 
     # LCD Page Order
     __pagemap = (3, 2, 1, 0, 7, 6, 5, 4)
 
-    def __init__(self, a0=24, cs=8, rst=25, rgb=None):
+    def __init__(self, a0=24, cs=8, rst=25, rgb=None, shared_bus=None, gpio=None, spi=None,
+                 bus=0, device=0, speed_hz=250000, chunk_size=None):
         """Constructor for ST7565.
         Args:
             a0 (int):  Register select address GPIO pin
             cs (int):  Chip select GPIO pin
             rst (int): Reset GPIO pin
             rgb (Optional [int]): RGB backlight GPIO pin list. Default is None.
+            shared_bus (Optional SharedSpiBus): Shared SPI bus used to drive several
+                displays from one SPI handle.  Default is None (display owns SPI 0.0).
+            gpio (Optional module): GPIO module. Default is None (RPi.GPIO).
+            spi (Optional SpiDev): Opened SPI device. Default is None (opens bus.device).
+            bus (Optional int): SPI bus. Default is 0.
+            device (Optional int): SPI device. Default is 0.
+            speed_hz (Optional int): SPI clock in hertz when opening SPI. Default is 250000.
+            chunk_size (Optional int): Maximum bytes per transfer. Default is None (driver bufsiz).
+        Note:
+            The ST7565 accepts SPI clocks well above 250 kHz (see calibrate_spi.py).
         """
-        import RPi.GPIO as GPIO
+        # Cache GPIO module handle for transfers
+        if gpio is None:
+            import RPi.GPIO as gpio
+        self.gpio = GPIO = gpio
 
         # Set BCM GPIO numbering
         GPIO.setmode(GPIO.BCM)
@@ -61,14 +102,29 @@ class Glcd(object):
         # Disable GPIO warnings
         GPIO.setwarnings(False)
 
-        # Initialize SPI
-        import spidev
-        self.__spi = spidev.SpiDev()
-        self.__spi.open(0, 0)
-        self.__spi.max_speed_hz = 250000
-
-        # Initialize back_buffer
-        self.back_buffer = np.zeros((Glcd.LCD_HEIGHT, Glcd.LCD_WIDTH), dtype='uint8')
+        # Initialize SPI (a shared bus owns the SPI handle itself)
+        self.shared_bus = shared_bus
+        if shared_bus is None:
+            if spi is None:
+                import spidev
+                spi = spidev.SpiDev()
+                spi.open(bus, device)
+                spi.max_speed_hz = speed_hz
+            self.__spi = spi
+            # Longer transfers are split (spidev rejects transfers over bufsiz)
+            bufsiz = get_spi_bufsiz(spi)
+            self.chunk_size = min(chunk_size or bufsiz, bufsiz)
+
+        # Initialize canvas (holds the back buffer)
+        self.canvas = Canvas(Glcd.LCD_WIDTH, Glcd.LCD_HEIGHT)
+
+        # Orientation (see set_orientation)
+        self.rotation = 0
+        self.adc_reverse = False
+        self.com_reverse = False
+        self.inverted = False
+        # Display RAM column shown in the panel's first column
+        self.column_offset = 1
 
         # LCD Pins
         self.a0 = a0
@@ -77,7 +133,8 @@ class Glcd(object):
         # Set pin directions (output)
         GPIO.setup(a0, GPIO.OUT)
         GPIO.setup(cs, GPIO.OUT)
-        GPIO.setup(rst, GPIO.OUT)
+        # Hold reset high so a running display keeps its state (see init warm)
+        GPIO.setup(rst, GPIO.OUT, initial=GPIO.HIGH)
         # RGB backlight pins
         # Enable PWM for RGB GPIO pins if specified
         if rgb is not None:
@@ -93,26 +150,45 @@ class Glcd(object):
             self.blue.start(0)
         else:
             self.red, self.green, self.blue = None, None, None
+        # Register with shared bus (deselects display until a transfer)
+        if shared_bus is not None:
+            shared_bus.attach(self)
 
     def send_command(self, cmd):
         """Send commands to ST7565
         Args:
             cmd ([int]):  commands to send
         """
-        import RPi.GPIO as GPIO
+        if self.shared_bus is not None:
+            self.shared_bus.transfer(self, cmd, data_mode=False)
+            return
         # Set command mode
-        GPIO.output(self.a0, GPIO.LOW)
-        self.__spi.xfer(cmd)
+        self.gpio.output(self.a0, self.gpio.LOW)
+        self.write_spi(cmd)
 
     def send_data(self, data):
         """Send data to ST7565
         Args:
             data ([int]):  data to send
         """
-        import RPi.GPIO as GPIO
-        # Set data mode 
-        GPIO.output(self.a0, GPIO.HIGH)
-        self.__spi.xfer(data)
+        if self.shared_bus is not None:
+            self.shared_bus.transfer(self, data, data_mode=True)
+            return
+        # Set data mode
+        self.gpio.output(self.a0, self.gpio.HIGH)
+        self.write_spi(data)
+
+    def write_spi(self, data):
+        """Send bytes to SPI in transfers of at most chunk_size bytes
+        Args:
+            data ([int]):  bytes to send
+        """
+        chunk = self.chunk_size
+        if len(data) <= chunk:
+            self.__spi.xfer(data)
+            return
+        for idx in range(0, len(data), chunk):
+            self.__spi.xfer(data[idx:idx + chunk])
 
     def move_cursor(self, x, page):
         """Move cursor to specified display position
@@ -137,19 +213,22 @@ class Glcd(object):
 
     def clear_display(self):
         """Clear ST7565 display"""
-        for page in self.__pagemap:
-            # Move to zero position on specified page
-            self.move_cursor(1, page)
+        for idx in range(0, self.LCD_PAGE_COUNT):
             # Send list of zeros to clear page
-            self.send_data([0] * self.LCD_WIDTH)
+            self.write_page(idx, [0] * self.LCD_WIDTH)
+        self.end_frame()
 
     def reset(self):
         """Reset ST7565 display"""
-        import RPi.GPIO as GPIO
+        for delay in self.reset_steps():
+            sleep(delay)
+
+    def reset_steps(self):
+        """Reset steps (generator yielding the seconds to wait between steps)"""
         # Toggle reset pin
-        GPIO.output(self.rst, GPIO.LOW)
-        sleep(.5)
-        GPIO.output(self.rst, GPIO.HIGH)
+        self.gpio.output(self.rst, self.gpio.LOW)
+        yield .5
+        self.gpio.output(self.rst, self.gpio.HIGH)
 
     def set_backlight_color(self, r, g, b):
         """Set LED backlight color
@@ -177,33 +256,77 @@ class Glcd(object):
         self.send_command([self.CMD_SET_VOLUME_FIRST])
         self.send_command([self.CMD_SET_VOLUME_SECOND | (level & 0x3f)])
 
+    @property
+    def back_buffer(self):
+        """Numpy 2D array of the canvas pixels sent to the display on flip"""
+        return self.canvas.buffer
+
+    @back_buffer.setter
+    def back_buffer(self, buffer):
+        self.canvas.buffer = buffer
+
     def clear_back_buffer(self):
         """Clear back buffer only"""
-        self.back_buffer = np.zeros((self.LCD_HEIGHT, self.LCD_WIDTH), dtype='uint8')
+        self.canvas.clear()
 
-    def init(self):
-        import RPi.GPIO as GPIO
-        # CS Chip Select low
-        GPIO.output(self.cs, GPIO.LOW)
+    def init(self, warm=False):
+        """Initialize ST7565 display
+        Args:
+            warm (Optional boolean): Reuse the state of an already running display.
+                Default is False (reset, power up and clear the display).
+        Note:
+            A warm init skips the reset, power up delays and display clear so the
+            last image stays on screen.  It resends the configuration commands
+            which are harmless on a running display.
+        """
+        for delay in self.init_steps(warm):
+            sleep(delay)
+
+    def init_steps(self, warm=False):
+        """Initialization steps (generator yielding the seconds to wait between steps)
+        Args:
+            warm (Optional boolean): Reuse the state of an already running display.
+        Note:
+            Lets init run without blocking, e.g. with asyncio.sleep (see async_glcd.py).
+        """
+        # CS Chip Select low (shared bus selects the display per transfer)
+        if self.shared_bus is None:
+            self.gpio.output(self.cs, self.gpio.LOW)
+        if warm:
+            self.send_command([self.CMD_SET_BIAS_7,
+                               self.get_adc_command(),
+                               self.get_com_command(),
+                               self.get_disp_command(),
+                               self.CMD_SET_DISP_START_LINE,
+                               self.CMD_SET_POWER_CONTROL | 0x7,
+                               self.CMD_SET_RESISTOR_RATIO | 0x7,
+                               self.CMD_DISPLAY_ON,
+                               self.CMD_SET_ALLPTS_NORMAL,
+                               self.CMD_SET_VOLUME_FIRST,
+                               self.CMD_SET_VOLUME_SECOND | (self.LCD_CONTRAST & 0x3f)])
+            return
         # Reset
-        self.reset()
+        for delay in self.reset_steps():
+            yield delay
         # LCD bias select
         self.send_command([self.CMD_SET_BIAS_7])
         # ADC select
-        self.send_command([self.CMD_SET_ADC_NORMAL])
+        self.send_command([self.get_adc_command()])
         # SHL select
-        self.send_command([self.CMD_SET_COM_NORMAL])
+        self.send_command([self.get_com_command()])
+        # Normal or reverse display
+        self.send_command([self.get_disp_command()])
         # Initial display line
         self.send_command([self.CMD_SET_DISP_START_LINE])
         # Turn on voltage converter (VC=1, VR=0, VF=0)
         self.send_command([self.CMD_SET_POWER_CONTROL | 0x4])
-        sleep(.05)
+        yield .05
         # Turn on voltage regulator (VC=1, VR=1, VF=0)
         self.send_command([self.CMD_SET_POWER_CONTROL | 0x6])
-        sleep(.05)
+        yield .05
         # Turn on voltage follower (VC=1, VR=1, VF=1)
         self.send_command([self.CMD_SET_POWER_CONTROL | 0x7])
-        sleep(.01)
+        yield .01
         # Set lcd operating voltage (regulator resistor, ref voltage resistor)
         self.send_command([self.CMD_SET_RESISTOR_RATIO | 0x7])
         # Turn on display
@@ -223,10 +346,91 @@ class Glcd(object):
         Note:
             Causes unwanted artifacts
         """
-        if reverse:
-            self.send_command([self.CMD_SET_DISP_REVERSE])
+        self.inverted = reverse
+        self.send_command([self.get_disp_command()])
+
+    def get_adc_command(self):
+        """Gets the ADC (segment direction) command for the current orientation"""
+        return self.CMD_SET_ADC_REVERSE if self.adc_reverse else self.CMD_SET_ADC_NORMAL
+
+    def get_com_command(self):
+        """Gets the SHL (common direction) command for the current orientation"""
+        return self.CMD_SET_COM_REVERSE if self.com_reverse else self.CMD_SET_COM_NORMAL
+
+    def get_disp_command(self):
+        """Gets the normal/reverse display command for the current invert mode"""
+        return self.CMD_SET_DISP_REVERSE if self.inverted else self.CMD_SET_DISP_NORMAL
+
+    def set_orientation(self, rotation=0, mirror_x=False, mirror_y=False, invert=False):
+        """Sets display orientation
+        Args:
+            rotation (Optional int): Clockwise rotation 0, 90, 180 or 270 degrees. Default is 0.
+            mirror_x (Optional boolean): Mirror horizontally. Default is False.
+            mirror_y (Optional boolean): Mirror vertically. Default is False.
+            invert (Optional boolean): Invert all pixels. Default is False.
+        Note:
+            180 degrees and mirroring reverse the controller's segment and common
+            scan directions and inversion uses the controller's reverse display
+            mode so none of them cost anything per frame.  90 and 270 degrees
+            replace the canvas with a 64 x 128 portrait canvas that is rotated
+            while packing.  The back buffer is resent once.
+            Changing between landscape and portrait carries the back buffer over
+            as shown on the panel.  It is refused while the back buffer is
+            shared memory the canvas doesn't own (e.g. a DisplayServer).
+        """
+        if rotation not in (0, 90, 180, 270):
+            print("Invalid rotation.  Must be 0, 90, 180 or 270.")
+            return
+        portrait = rotation in (90, 270)
+        swap = portrait != (self.rotation in (90, 270))
+        if swap and not self.back_buffer.flags.owndata:
+            print("Can't change between landscape and portrait while the back buffer is shared.")
+            return
+        # Canvas axes run along the panel's other axes in portrait
+        if portrait:
+            mirror_x, mirror_y = mirror_y, mirror_x
+        # 180 and 270 are 0 and 90 rotated by the controller
+        flipped = rotation >= 180
+        self.adc_reverse = flipped != mirror_x
+        self.com_reverse = flipped != mirror_y
+        self.inverted = invert
+        # Reversed segments show the RAM columns from the other end
+        if self.adc_reverse:
+            self.column_offset = self.LCD_RAM_WIDTH - self.LCD_WIDTH - 1
         else:
-            self.send_command([self.CMD_SET_DISP_NORMAL])
+            self.column_offset = 1
+        # Swap canvas for portrait and landscape rotations keeping the panel image
+        if swap:
+            # Turn the contents back by the change in rotation
+            buffer = np.rot90(self.back_buffer, (rotation - self.rotation) // 90).copy()
+            height, width = buffer.shape
+            self.canvas = Canvas(width, height, buffer)
+        self.rotation = rotation
+        self.send_command([self.get_adc_command(), self.get_com_command(), self.get_disp_command()])
+        # Resend back buffer at the new column offset
+        self.flip()
+
+    def get_panel_pixels(self):
+        """Gets the back buffer in panel (landscape) orientation
+        Returns:
+            Numpy 2D array: 64 x 128 pixels (a view of the back buffer)
+        """
+        if self.rotation in (90, 270):
+            # Rotate portrait canvas clockwise
+            return np.rot90(self.back_buffer, -1)
+        return self.back_buffer
+
+    def get_panel_region(self, x, y, w, h):
+        """Converts a back buffer region to panel (landscape) coordinates
+        Args:
+            x, y (int): Top left coordinates of region
+            w, h (int): Width & height in pixels of region
+        Returns:
+            int, int, int, int: x, y, w, h of region on the panel
+        """
+        if self.rotation in (90, 270):
+            return self.LCD_WIDTH - y - h, x, h, w
+        return x, y, w, h
 
     def sleep(self):
         """Put ST7565 display in sleep mode"""
@@ -258,611 +462,94 @@ class Glcd(object):
             self.send_command([self.CMD_DISPLAY_OFF])
             self.send_command([self.CMD_SET_ALLPTS_ON])
 
-    def flip(self):
-        """Send back buffer to ST7565 display"""
-        for idx in range(0, self.LCD_PAGE_COUNT):
-            # Home cursor on the page
-            self.move_cursor(1, idx)
-            # Page start row
-            row_start = idx << 3
-            # Page stop row
-            row_stop = (idx + 1) << 3
-            # slice page from buffer and pack bits to bytes then send to display
-            self.send_data(np.packbits(self.back_buffer[row_start:row_stop], axis=0).flatten().tolist())
-
-    def cleanup(self):
-        """Clean up SPI and GPIO"""
-        self.clear_display()
-        self.sleep()
-        self.__spi.close()
-        import RPi.GPIO as GPIO
-        GPIO.cleanup()
-
-    def is_off_grid(self, xmin, ymin, xmax, ymax):
-        """Checks if drawing coordinates extends past LCD display boundaries
+    def pack_page(self, page, x1=0, x2=LCD_WIDTH):
+        """Packs a page of the back buffer to display bytes
         Args:
-            xmin (int): Minimum horizontal pixel.
-            ymin (int): Minimum vertical pixel.
-            xmax (int): Maximum horizontal pixel.
-            ymax (int): Maximum vertical pixel.
+            page (int): Page 0 - 7
+            x1 (Optional int): First column. Default is 0.
+            x2 (Optional int): Column after the last column. Default is LCD width.
         Returns:
-            boolean: False = Coordinates OK, True = Error.
+            [int]: One byte per column (MSB is the top row of the page)
         """
-        if xmin < 0:
-            print('x-coordinate: {0} below minimum of 0.'.format(xmin))
-            return True
-        if ymin < 0:
-            print('y-coordinate: {0} below minimum of 0.'.format(ymin))
-            return True
-        if xmax >= self.LCD_WIDTH:
-            print('x-coordinate: {0} above maximum of {1}.'.format(xmax, self.LCD_WIDTH - 1))
-            return True
-        if ymax >= self.LCD_HEIGHT:
-            print('y-coordinate: {0} above maximum of {1}.'.format(ymax, self.LCD_HEIGHT - 1))
-            return True
-        return False
-
-    def is_point(self, x, y):
-        """Determines if coordinates on back buffer has a drawn point
+        # Page start row
+        row_start = page << 3
+        # Page stop row
+        row_stop = (page + 1) << 3
+        # slice page from buffer and pack bits to bytes
+        return np.packbits(self.get_panel_pixels()[row_start:row_stop, x1:x2], axis=0).flatten().tolist()
+
+    def write_page(self, page, data, x=0):
+        """Writes packed bytes to a page of the ST7565 display
         Args:
-            x, y (int): Coordinates of point
-        Returns boolean: True if pixel is drawn.  False is blank.
+            page (int): Page 0 - 7
+            data ([int]): Packed column bytes
+            x (Optional int): First column. Default is 0.
         """
-        # Confirm coordinates in boundary
-        if self.is_off_grid(x, y, x, y):
-            return False
-        return self.back_buffer[y, x] == 1
-
-    def draw_point(self, x, y, color=1, invert=False):
-        """Draws a single point on the back buffer
-        Args:
-            x, y (int): Coordinates of point
-            color (Optional int): 0 = pixel off, 1 = pixel on (default)
-            invert (Optional boolean): Inverts target pixel (overrides color)
-        """
-        if not 0 <= x < self.LCD_WIDTH:
-            print('x-coordinate: {0} outside display range of 0 to {1} .').format(x, self.LCD_WIDTH - 1)
-            return
-        if not 0 <= y < self.LCD_HEIGHT:
-            print('y-coordinate: {0} outside display range of 0 to {1} .').format(x, self.LCD_HEIGHT - 1)
+        if self.shared_bus is not None:
+            # Hold the bus so cursor and data are one uninterrupted burst
+            with self.shared_bus.lock:
+                self.move_cursor(x + self.column_offset, page)
+                self.send_data(data)
             return
-        if invert:
-            self.back_buffer[y, x] ^= 1
-        else:
-            self.back_buffer[y, x] = color
+        # Position cursor on the page (display columns are 1 based)
+        self.move_cursor(x + self.column_offset, page)
+        self.send_data(data)
 
-    def draw_line(self, x1, y1, x2, y2, color=1, invert=False):
-        """Draws a line on the back buffer using Bresenham's algorithm
-        Args:
-            x1, y1 (int): Starting coordinates of the line
-            x2, y2 (int): Ending coordinates of the line
-            color (Optional int): 0 = pixel off, 1 = pixel on (default)
-            invert (Optional boolean): Inverts target pixel (overrides color)
-        """
-        # Confirm coordinates in boundary
-        if self.is_off_grid(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)):
-            return
-        # Check for horizontal line
-        if y1 == y2:
-            if x1 > x2:
-                x1, x2 = x2, x1
-            if invert:
-                self.back_buffer[y1, x1:x2 + 1] ^= 1
-            else:
-                self.back_buffer[y1, x1:x2 + 1] = color
-            return
-        # Check for vertical line
-        if x1 == x2:
-            if y1 > y2:
-                y1, y2 = y2, y1
-            if invert:
-                self.back_buffer[y1:y2 + 1, x1] ^= 1
-            else:
-                self.back_buffer[y1:y2 + 1, x1] = color
-            return
-        # Changes in x, y
-        dx = x2 - x1
-        dy = y2 - y1
-        # Determine how steep the line is
-        is_steep = abs(dy) > abs(dx)
-        # Rotate line
-        if is_steep:
-            x1, y1 = y1, x1
-            x2, y2 = y2, x2
-        # Swap start and end points if necessary
-        if x1 > x2:
-            x1, x2 = x2, x1
-            y1, y2 = y2, y1
-        # Recalculate differentials
-        dx = x2 - x1
-        dy = y2 - y1
-        # Calculate error
-        error = dx >> 1
-        ystep = 1 if y1 < y2 else -1
-        y = y1
-        for x in range(x1, x2 + 1):
-            if invert:
-                if is_steep:
-                    self.back_buffer[x, y] ^= 1
-                else:
-                    self.back_buffer[y, x] ^= 1
-            else:
-                if is_steep:
-                    self.back_buffer[x, y] = color
-                else:
-                    self.back_buffer[y, x] = color
-            error -= abs(dy)
-            if error < 0:
-                y += ystep
-                error += dx
-
-    def draw_lines(self, coords, color=1, invert=False):
-        """Draws multiple lines on the back buffer
-        Args:
-            coords (Numpy 2D array dtype=Uint8): Line coordinate x,y pairs per row
-            color (Optional int): 0 = pixel off, 1 = pixel on (default)
-            invert (Optional boolean): Inverts target pixel (overrides color)
-        """
-        # Expects numpy array with (n, 2) shape
-        if coords.shape[1] != 2:
-            return
-        # Starting point
-        x1, y1 = coords[0]
-        # Iterate through coordinates
-        for row in coords[1:]:
-            x2, y2 = row
-            self.draw_line(x1, y1, x2, y2, color, invert)
-            x1, y1 = x2, y2
-
-    def draw_rectangle(self, x1, y1, w, h, color=1, invert=False):
-        """Draws a rectangle on the back buffer
-        Args:
-            x1, y1 (int): Top left coordinates of rectangle
-            w, h (int): Width & height in pixels of rectangle
-            color (Optional int): 0 = pixel off, 1 = pixel on (default)
-            invert (Optional boolean): Inverts target pixel (overrides color)
-        """
-        # Determine x2, y2
-        x2 = x1 + w - 1
-        y2 = y1 + h - 1
-
-        if self.is_off_grid(x1, y1, x2, y2):
-            return
-        if invert:
-            # Top
-            self.back_buffer[y1, x1 + 1:x2] ^= 1
-            # Bottom
-            self.back_buffer[y2, x1:x2 + 1] ^= 1
-            # Left
-            self.back_buffer[y1:y2, x1] ^= 1
-            # Right
-            self.back_buffer[y1:y2, x2] ^= 1
-        else:
-            # Top
-            self.back_buffer[y1, x1:x2] = color
-            # Bottom
-            self.back_buffer[y2, x1:x2 + 1] = color
-            # Left
-            self.back_buffer[y1:y2, x1] = color
-            # Right
-            self.back_buffer[y1:y2, x2] = color
-
-    def fill_rectangle(self, x1, y1, w, h, color=1, invert=False):
-        """Draws a filled rectangle on the back buffer
-        Args:
-            x1, y1 (int): Top left coordinates of rectangle
-            w, h (int): Width & height in pixels of rectangle
-            color (Optional int): 0 = pixel off, 1 = pixel on (default)
-            invert (Optional boolean): Inverts target pixel (overrides color)
-        """
-        if self.is_off_grid(x1, y1, x1 + w - 1, y1 + h - 1):
-            return
-        # Draw filled rectangle
-        if invert:
-            self.back_buffer[y1:y1 + h, x1:x1 + w] ^= 1
-        else:
-            self.back_buffer[y1:y1 + h, x1:x1 + w] = color
+    def flip(self):
+        """Send back buffer to ST7565 display"""
+        # Pack all pages of the buffer to bytes then send to display
+        self.send_frame(self.pack_frame())
 
-    def draw_circle(self, x0, y0, r, color=1):
-        """Draws a circle on the back buffer
-        Args:
-            x0, y0 (int): Pixel coordinates of center point
-            r (int): Radius
-            color (Optional int): 0 = pixel off, 1 = pixel on (default)
-        Note:
-            The center point is the center of the x0,y0 pixel.
-            Since pixels are not divisible, the radius is integer rounded
-            up to complete on a full pixel.  Therefore diameter = 2 x r + 1.
-        """
-        if self.is_off_grid(x0 - r, y0 - r, x0 + r, y0 + r):
-            return
-        f = 1 - r
-        dx = 1
-        dy = -r - r
-        x = 0
-        y = r
-        self.back_buffer[y0 + r, x0] = color
-        self.back_buffer[y0 - r, x0] = color
-        self.back_buffer[y0, x0 + r] = color
-        self.back_buffer[y0, x0 - r] = color
-        while x < y:
-            if f >= 0:
-                y -= 1
-                dy += 2
-                f += dy
-            x += 1
-            dx += 2
-            f += dx
-            self.back_buffer[y0 + y, x0 + x] = color
-            self.back_buffer[y0 + y, x0 - x] = color
-            self.back_buffer[y0 - y, x0 + x] = color
-            self.back_buffer[y0 - y, x0 - x] = color
-            self.back_buffer[y0 + x, x0 + y] = color
-            self.back_buffer[y0 + x, x0 - y] = color
-            self.back_buffer[y0 - x, x0 + y] = color
-            self.back_buffer[y0 - x, x0 - y] = color
-
-    def fill_circle(self, x0, y0, r, color=1):
-        """Draws a filled circle on the back buffer
-        Args:
-            x0, y0 (int): Center point coordinates
-            r (int): Radius
-            color (Optional int): 0 = pixel off, 1 = pixel on (default)
-        Note:
-            The center point is the center of the x0,y0 pixel.
-            Since pixels are not divisible, the radius is integer rounded
-            up to complete on a full pixel.  Therefore diameter = 2 x r + 1.
-        """
-        if self.is_off_grid(x0 - r, y0 - r, x0 + r, y0 + r):
-            return
-        f = 1 - r
-        dx = 1
-        dy = -r - r
-        x = 0
-        y = r
-        self.back_buffer[y0 - r: y0 + r + 1, x0] = color
-        while x < y:
-            if f >= 0:
-                y -= 1
-                dy += 2
-                f += dy
-            x += 1
-            dx += 2
-            f += dx
-            self.back_buffer[y0 - y: y0 + y + 1, x0 + x] = color
-            self.back_buffer[y0 - y: y0 + y + 1, x0 - x] = color
-            self.back_buffer[y0 - x: y0 + x + 1, x0 - y] = color
-            self.back_buffer[y0 - x: y0 + x + 1, x0 + y] = color
-
-    def draw_ellipse(self, x0, y0, a, b, color=1):
-        """Draws an ellipse on the back buffer
-        Args:
-            x0, y0 (int): Pixel coordinates of center point
-            a (int): Semi axis horizontal
-            b (int): Semi axis vertical
-            color (Optional int): 0 = pixel off, 1 = pixel on (default)
-        Note:
-            The center point is the center of the x0,y0 pixel.
-            Since pixels are not divisible, the axes are integer rounded
-            up to complete on a full pixel.  Therefore the major and
-            minor axes are increased by 1.
-        """
-        if self.is_off_grid(x0 - a, y0 - b, x0 + a, y0 + b):
-            return
-        a2 = a * a
-        b2 = b * b
-        twoa2 = a2 + a2
-        twob2 = b2 + b2
-        x = 0
-        y = b
-        px = 0
-        py = twoa2 * y
-        # Plot initial points
-        self.back_buffer[y0 + y, x0 + x] = color
-        self.back_buffer[y0 + y, x0 - x] = color
-        self.back_buffer[y0 - y, x0 + x] = color
-        self.back_buffer[y0 - y, x0 - x] = color
-        # Region 1
-        p = round(b2 - (a2 * b) + (0.25 * a2))
-        while px < py:
-            x += 1
-            px += twob2
-            if p < 0:
-                p += b2 + px
-            else:
-                y -= 1
-                py -= twoa2
-                p += b2 + px - py
-            self.back_buffer[y0 + y, x0 + x] = color
-            self.back_buffer[y0 + y, x0 - x] = color
-            self.back_buffer[y0 - y, x0 + x] = color
-            self.back_buffer[y0 - y, x0 - x] = color
-        # Region 2
-        p = round(b2 * (x + 0.5) * (x + 0.5) + a2 * (y - 1) * (y - 1) - a2 * b2)
-        while y > 0:
-            y -= 1
-            py -= twoa2
-            if p > 0:
-                p += a2 - py
-            else:
-                x += 1
-                px += twob2
-                p += a2 - py + px
-            self.back_buffer[y0 + y, x0 + x] = color
-            self.back_buffer[y0 + y, x0 - x] = color
-            self.back_buffer[y0 - y, x0 + x] = color
-            self.back_buffer[y0 - y, x0 - x] = color
-
-    def fill_ellipse(self, x0, y0, a, b, color=1):
-        """Draws a filled ellipse on the back buffer
-        Args:
-            x0, y0 (int): Pixel coordinates of center point
-            a (int): Semi axis horizontal
-            b (int): Semi axis vertical
-            color (Optional int): 0 = pixel off, 1 = pixel on (default)
-        Note:
-            The center point is the center of the x0,y0 pixel.
-            Since pixels are not divisible, the axes are integer rounded
-            up to complete on a full pixel.  Therefore the major and
-            minor axes are increased by 1.
-        """
-        if self.is_off_grid(x0 - a, y0 - b, x0 + a, y0 + b):
-            return
-        a2 = a * a
-        b2 = b * b
-        twoa2 = a2 + a2
-        twob2 = b2 + b2
-        x = 0
-        y = b
-        px = 0
-        py = twoa2 * y
-        # Plot initial points
-        self.draw_line(x0, y0 - y, x0, y0 + y, color)
-        # Region 1
-        p = round(b2 - (a2 * b) + (0.25 * a2))
-        while px < py:
-            x += 1
-            px += twob2
-            if p < 0:
-                p += b2 + px
-            else:
-                y -= 1
-                py -= twoa2
-                p += b2 + px - py
-            self.draw_line(x0 + x, y0 - y, x0 + x, y0 + y, color)
-            self.draw_line(x0 - x, y0 - y, x0 - x, y0 + y, color)
-        # Region 2
-        p = round(b2 * (x + 0.5) * (x + 0.5) + a2 * (y - 1) * (y - 1) - a2 * b2)
-        while y > 0:
-            y -= 1
-            py -= twoa2
-            if p > 0:
-                p += a2 - py
-            else:
-                x += 1
-                px += twob2
-                p += a2 - py + px
-            self.draw_line(x0 + x, y0 - y, x0 + x, y0 + y, color)
-            self.draw_line(x0 - x, y0 - y, x0 - x, y0 + y, color)
-
-    def draw_polygon(self, sides, x0, y0, r, rotate=0, color=1):
-        """Draws an n-sided regular polygon on the back buffer
-        Args:
-            sides (int): Number of polygon sides
-            x0, y0 (int): Center point coordinates
-            r (int): Radius
-            rotate (Optional float): Rotation in degrees relative to origin. Default is 0.
-            color (Optional int): 0 = pixel off, 1 = pixel on (default)
-        Note:
-            The center point is the center of the x0,y0 pixel.
-            Since pixels are not divisible, the radius is integer rounded
-            up to complete on a full pixel.  Therefore diameter = 2 x r + 1.
-        """
-        coords = np.empty(shape=[sides + 1, 2], dtype="float64")
-        n = np.arange(sides, dtype="float64")
-        theta = math.radians(rotate)
-        for s in n:
-            t = 2.0 * math.pi * s / sides + theta
-            coords[int(s), 0] = r * math.cos(t) + x0
-            coords[int(s), 1] = r * math.sin(t) + y0
-        coords[sides] = coords[0]
-        # Cast to python float first to fix rounding errors
-        self.draw_lines(coords.astype("float32").astype("int32"), color=color)
-
-    def fill_polygon(self, sides, x0, y0, r, rotate=0, color=1, invert=False):
-        """Draws a filled n-sided regular polygon on the back buffer
-        Args:
-            sides (int): Number of polygon sides
-            x0, y0 (int): Center point coordinates
-            r (int): Radius
-            rotate (Optional float): Rotation in degrees relative to origin. Default is 0.
-            color (Optional int): 0 = pixel off, 1 = pixel on (default)
-            invert (Optional boolean): Inverts target pixel (overrides color)
-        Note:
-            The center point is the center of the x0,y0 pixel.
-            Since pixels are not divisible, the radius is integer rounded
-            up to complete on a full pixel.  Therefore diameter = 2 x r + 1.
-        """
-        if self.is_off_grid(x0 - r, y0 - r, x0 + r, y0 + r):
-            return
-        coords = np.empty(shape=[sides + 1, 2], dtype="float64")
-        n = np.arange(sides, dtype="float64")
-        theta = math.radians(rotate)
-        # Determine polygon coordinates
-        for s in n:
-            t = 2.0 * math.pi * s / sides + theta
-            coords[int(s), 0] = r * math.cos(t) + x0
-            coords[int(s), 1] = r * math.sin(t) + y0
-        coords[sides] = coords[0]
-        # Cast to python float first to fix rounding errors
-        coords = coords.astype("float32").astype("int32")
-        # Starting point
-        x1, y1 = coords[0]
-        # Minimum Maximum X dict
-        xdict = {y1: [x1, x1]}
-        # Iterate through coordinates
-        for row in coords[1:]:
-            x2, y2 = row
-            xprev, yprev = x2, y2
-            # Calculate perimeter
-            # Check for horizontal side
-            if y1 == y2:
-                if x1 > x2:
-                    x1, x2 = x2, x1
-                if y1 in xdict:
-                    xdict[y1] = [min(x1, xdict[y1][0]), max(x2, xdict[y1][1])]
-                else:
-                    xdict[y1] = [x1, x2]
-                x1, y1 = xprev, yprev
-                continue
-            # Non horizontal side
-            # Changes in x, y
-            dx = x2 - x1
-            dy = y2 - y1
-            # Determine how steep the line is
-            is_steep = abs(dy) > abs(dx)
-            # Rotate line
-            if is_steep:
-                x1, y1 = y1, x1
-                x2, y2 = y2, x2
-            # Swap start and end points if necessary
-            if x1 > x2:
-                x1, x2 = x2, x1
-                y1, y2 = y2, y1
-            # Recalculate differentials
-            dx = x2 - x1
-            dy = y2 - y1
-            # Calculate error
-            error = dx >> 1
-            ystep = 1 if y1 < y2 else -1
-            y = y1
-            # Calcualte minimum and maximum x values
-            for x in range(x1, x2 + 1):
-                if is_steep:
-                    if x in xdict:
-                        xdict[x] = [min(y, xdict[x][0]), max(y, xdict[x][1])]
-                    else:
-                        xdict[x] = [y, y]
-                else:
-                    if y in xdict:
-                        xdict[y] = [min(x, xdict[y][0]), max(x, xdict[y][1])]
-                    else:
-                        xdict[y] = [x, x]
-                error -= abs(dy)
-                if error < 0:
-                    y += ystep
-                    error += dx
-            x1, y1 = xprev, yprev
-        # Fill polygon
-        for y, x in xdict.items():
-            if invert:
-                self.back_buffer[y, x[0]:x[1] + 1] ^= 1
-            else:
-                self.back_buffer[y, x[0]:x[1] + 1] = color
-
-    def draw_letter(self, letter, font, x, y, invert=False, landscape=True):
-        """Draws a single letter on the back buffer
-        Args:
-            letter (string): Letter
-            font (XglcdFont object): Font
-            x, y (int): Top left coordinates to place font
-            invert (Optional boolean): If True inverts font monochrome color. Default is False
-            landscape (Optional boolean): Rotates letter 90 degrees.  Default is true.
+    def pack_frame(self):
+        """Packs the back buffer to display pages
         Returns:
-            int, int: Width and height of the letter in pixels (0,0 if error)
+            Numpy 2D array (uint8): rows = pages, cols = columns
         """
-        # Get 2D Numpy array of specified letter
-        letter_array = font.get_letter(letter, landscape)
-        # Get height and width  of letter
-        h, w = letter_array.shape
-        if self.is_off_grid(x, y, x + w - 1, y + h - 1):
-            return 0, 0
-        # Draw letter on self.back_buffer (check if inverted)
-        if invert:
-            self.back_buffer[y:y + h, x:x + w] = letter_array ^ 1
-        else:
-            self.back_buffer[y:y + h, x:x + w] = letter_array
-        # return letter width and height
-        return w, h
+        return pack_pages(self.get_panel_pixels())
 
-    def draw_string(self, text, font, x, y, spacing=1, invert=False, landscape=True):
-        """Draws a string of text on the back buffer
+    def send_frame(self, frame):
+        """Send a packed frame to ST7565 display
         Args:
-            text (string): Text
-            font (XglcdFont object): Font
-            x, y (int): Top left coordinates to place font
-            spacing (optonal int): Pixel spacing between letters. Default is 1.
-            invert (optional boolean): If True inverts font monochrome color. Default is False
-            landscape (optional boolean): Rotates text 90 degrees.  Default is true.
+            frame (Numpy 2D array): Packed pages (see Canvas.pack)
         """
-        for letter in text:
-            # Get letter array and letter dimensions
-            w, h = self.draw_letter(letter, font, x, y, invert, landscape)
-            # Stop on error
-            if w == 0 & h == 0:
-                return
-            # Position cursor for next character depending on orientation
-            if landscape:
-                # Draw vertical spacing if inverted
-                if invert and spacing:
-                    self.back_buffer[y: y + h, x + w: x + w + spacing] = 1
-                # Position x for next letter
-                x += w + spacing
-            else:
-                # Draw horizontal spacing if inverted
-                if invert and spacing:
-                    self.back_buffer[y + h: y + h + spacing, x: x + w] = 1
-                # Position y for next letter
-                y += h + spacing
-
-    def draw_bitmap(self, bitmap, x=0, y=0):
-        """Draws a raw bitmap to the back buffer
-        Args:
-            bitmap (Numpy array): 2D array of monochrome pixels
-            x, y (int): Top left coordinates to place bitmap
-        """
-        height, width = bitmap.shape
-        self.back_buffer[y:y + height, x:x + width] = bitmap
+        for idx in range(0, self.LCD_PAGE_COUNT):
+            self.write_page(idx, frame[idx].tolist())
+        self.end_frame()
 
-    def load_bitmap(self, path, width=LCD_WIDTH, height=LCD_HEIGHT, invert=False):
-        """Loads a monochrome bitmap (raw format only)
+    def flip_region(self, x, y, w, h):
+        """Send a rectangular region of the back buffer to ST7565 display
         Args:
-            path (string): full source path of raw bitmap file.
-            width (Optional int): Pixel width of bitmap. Default is LCD width.
-            height (Optional int): Pixel height of bitmap. Default is LCD height.
-            invert (Optional boolan): True inverts monochrome color. Default is false.
-        Returns:
-            Numpy 2D array
+            x, y (int): Top left coordinates of region
+            w, h (int): Width & height in pixels of region
         Note:
-            You can use the open-source IrfanView graphics program to convert images
-            to 1 bpp raw bitmaps.
+            The region is widened vertically to whole pages.
         """
-        bmp = np.fromfile(path, dtype='uint8', sep='')
-        # Convert non black colors to 1.
-        bmp[bmp > 0] = 1
-        if invert:
-            return bmp.reshape(height, width)
-        else:
-            return bmp.reshape(height, width) ^ 1
+        x, y, w, h = self.get_panel_region(x, y, w, h)
+        # Clip region to display
+        x1, y1 = max(x, 0), max(y, 0)
+        x2, y2 = min(x + w, self.LCD_WIDTH), min(y + h, self.LCD_HEIGHT)
+        if x1 >= x2 or y1 >= y2:
+            return
+        for idx in range(y1 >> 3, ((y2 - 1) >> 3) + 1):
+            self.write_page(idx, self.pack_page(idx, x1, x2), x1)
+        self.end_frame()
 
-    def save_bitmap(self, path, x1=0, y1=0, width=LCD_WIDTH, height=LCD_HEIGHT):
-        """Saves buffer or a portion of the buffer to a raw bitmap
-        Args:
-            path (string): full target path for raw bitmap file.
-            x1, y1 (Optional int): Top left corner of bitmap.  Default is 0, 0.
-            width (Optional int): Pixel width of bitmap. Default is LCD width.
-            height (Optional int): Pixel height of bitmap. Default is LCD height.
+    def end_frame(self):
+        """Marks the end of a batch of page writes
         Note:
-            You can use the open-source IrfanView graphics program to open raw bitmaps.
-            You must know the width & height and the bpp which is 8
+            Does nothing itself.  Called after every frame, region or other
+            batch of write_page calls so frame mirrors and trace recorders can
+            wrap it.  Code writing pages directly should call it too.
         """
-        # Determine x2, y2
-        x2 = x1 + width
-        y2 = y1 + height
+        pass
 
-        if self.is_off_grid(x1, y1, x2 - 1, y2 - 1):
+    def cleanup(self):
+        """Clean up SPI and GPIO"""
+        self.clear_display()
+        self.sleep()
+        if self.shared_bus is not None:
+            # Shared bus closes SPI and GPIO once all displays are detached
+            self.shared_bus.detach(self)
             return
-
-        bmp = self.back_buffer[y1:y2, x1:x2]
-        bmp[bmp > 0] = 255
-        bmp.tofile(path)
+        self.__spi.close()
+        self.gpio.cleanup()
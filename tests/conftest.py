@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep the suite fast and independent of Numba (see kernels.py)
+os.environ.setdefault('ST7565_KERNELS', 'python')
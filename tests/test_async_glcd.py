@@ -0,0 +1,36 @@
+import asyncio
+import emulator
+from async_glcd import AsyncGlcd
+
+
+def test_flips_in_flight_coalesced():
+    # Realtime transfers keep the first frame on the bus while flips queue up
+    board = emulator.EmulatedBoard(realtime=True)
+    display = AsyncGlcd(board.glcd())
+
+    async def run():
+        await display.init()
+        display.fill_rectangle(0, 0, 10, 10)
+        board.spi.reset_stats()
+        await display.flip()
+        frame_transfers = board.spi.transfers
+        board.spi.reset_stats()
+        tasks = [asyncio.ensure_future(display.flip())]
+        await asyncio.sleep(0.005)
+        for idx in range(5):
+            display.clear_back_buffer()
+            display.fill_rectangle(idx * 20, 20, 15, 15)
+            tasks.append(asyncio.ensure_future(display.flip()))
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return frame_transfers
+
+    try:
+        frame_transfers = asyncio.run(run())
+        # First frame plus one merged frame instead of six
+        assert display.flips == 3
+        assert display.coalesced == 4
+        assert board.spi.transfers == 2 * frame_transfers
+        assert (board.controller.frame() == display.back_buffer).all()
+    finally:
+        display.executor.shutdown()
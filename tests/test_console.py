@@ -0,0 +1,48 @@
+import os
+import pytest
+import emulator
+from console import TextConsole
+import xglcd_font
+
+FONTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fonts')
+
+
+@pytest.fixture
+def glcd():
+    board = emulator.EmulatedBoard()
+    glcd = board.glcd()
+    glcd.init()
+    glcd.board = board
+    return glcd
+
+
+def neato():
+    return xglcd_font.XglcdFont(os.path.join(FONTS, 'Neato5x7.c'), 5, 7)
+
+
+def test_tall_font_rejected(glcd):
+    with pytest.raises(ValueError):
+        TextConsole(glcd, xglcd_font.XglcdFont(os.path.join(FONTS, 'Broadway17x15.c'), 17, 15))
+
+
+def test_portrait_rejected(glcd):
+    glcd.set_orientation(90)
+    with pytest.raises(ValueError):
+        TextConsole(glcd, neato())
+
+
+def test_write_matches_back_buffer(glcd):
+    console = TextConsole(glcd, neato())
+    console.write('Hello\nworld')
+    assert glcd.board.controller.frame().any()
+    assert (glcd.board.controller.frame() == glcd.get_panel_pixels()).all()
+
+
+def test_small_gaps_bridged(glcd):
+    console = TextConsole(glcd, neato())
+    console.write('abcdef')
+    # Changing cells one apart is one run, far apart cells are two
+    console.grid[0, 0] = ord('x')
+    console.grid[0, 2] = ord('y')
+    console.grid[0, 10] = ord('z')
+    assert console.get_runs(0) == [[0, 3], [10, 11]]
@@ -0,0 +1,56 @@
+import numpy as np
+from canvas import Canvas
+from display_list import DisplayList
+
+
+def record_random(display_list, seed):
+    """Records overlapping primitives, some off canvas or inverted"""
+    rng = np.random.default_rng(seed)
+    for _ in range(200):
+        x, y = (int(v) for v in rng.integers(-10, 130, 2))
+        w, h = (int(v) for v in rng.integers(1, 40, 2))
+        color = int(rng.integers(0, 2))
+        kind = int(rng.integers(0, 8))
+        if kind == 0:
+            display_list.draw_point(x % 128, y % 64, color)
+        elif kind == 1:
+            display_list.draw_line(x, y % 64, x + w, y % 64, color)
+        elif kind == 2:
+            display_list.draw_line(x, y, x, y + h, color)
+        elif kind == 3:
+            display_list.draw_line(x, y, x + w, y + h, color, invert=bool(color))
+        elif kind == 4:
+            display_list.draw_rectangle(x, y, w, h, color)
+        elif kind == 5:
+            display_list.fill_rectangle(x, y, w, h, color, invert=not color)
+        elif kind == 6:
+            display_list.fill_circle(x, y, w // 2, color)
+        else:
+            display_list.fill_rectangle(x, y, w, h, color, pattern=0.25)
+
+
+def test_optimized_matches_unoptimized():
+    for seed in range(5):
+        plain, optimized = DisplayList(), DisplayList()
+        record_random(plain, seed)
+        record_random(optimized, seed)
+        optimized.optimize()
+        assert len(optimized) < len(plain)
+        expected, actual = Canvas(128, 64), Canvas(128, 64)
+        plain.execute(expected)
+        optimized.execute(actual)
+        assert (actual.buffer == expected.buffer).all()
+        # Executing again (cached batch indices) gives the same pixels
+        actual = Canvas(128, 64)
+        optimized.execute(actual)
+        assert (actual.buffer == expected.buffer).all()
+
+
+def test_replay_matches_direct_drawing():
+    direct = Canvas(128, 64)
+    record_random(direct, 7)
+    display_list = DisplayList()
+    record_random(display_list, 7)
+    canvas = Canvas(128, 64)
+    display_list.optimize().execute(canvas)
+    assert (canvas.buffer == direct.buffer).all()
@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+import time
+from multiprocessing import shared_memory
+import emulator
+from display_server import DisplayServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLIENT = '''
+import sys
+from display_server import DisplayClient
+display = DisplayClient(sys.argv[1])
+display.fill_rectangle(0, 0, 16, 8)
+display.flip()
+display.close()
+'''
+
+
+def shared_memory_exists(name):
+    if os.path.isdir('/dev/shm'):
+        return os.path.exists(os.path.join('/dev/shm', name))
+    try:
+        shared_memory.SharedMemory(name=name).close()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def test_client_process_leaves_shared_memory(tmp_path):
+    board = emulator.EmulatedBoard()
+    socket_path = str(tmp_path / 'display.sock')
+    server = DisplayServer(board.glcd(), socket_path, max_fps=100)
+    server.start()
+    try:
+        client = subprocess.run([sys.executable, '-c', CLIENT, socket_path], cwd=ROOT,
+                                stderr=subprocess.PIPE, timeout=30)
+        assert client.returncode == 0, client.stderr
+        # The exiting client must not unlink (or warn about) the server's memory
+        assert b'resource_tracker' not in client.stderr
+        assert shared_memory_exists(server.shm.name)
+        deadline = time.time() + 2
+        while not board.controller.frame()[:8, :16].all() and time.time() < deadline:
+            time.sleep(.05)
+        assert board.controller.frame()[:8, :16].all()
+    finally:
+        server.close()
+
+
+def wait_until(condition, timeout=2):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(.01)
+    return condition()
+
+
+def test_failed_transfer_reported(tmp_path):
+    board = emulator.EmulatedBoard()
+    glcd = board.glcd()
+    server = DisplayServer(glcd, str(tmp_path / 'display.sock'), max_fps=100)
+    flip_region = glcd.flip_region
+    failures = [IOError('bus error')]
+
+    def failing_flip_region(*args):
+        if failures:
+            raise failures.pop()
+        flip_region(*args)
+    glcd.flip_region = failing_flip_region
+    try:
+        assert server.handle_request('flip', []) == 'ok'
+        assert wait_until(lambda: server.error is not None)
+        # The flip thread survives and the next request gets the error
+        glcd.fill_rectangle(0, 0, 16, 8)
+        assert server.handle_request('invalidate', [0, 0, 16, 8]).startswith('error')
+        assert wait_until(lambda: server.flips == 1)
+        assert board.controller.frame()[:8, :16].all()
+        assert server.handle_request('flip', []) == 'ok'
+    finally:
+        server.close()
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from dither import (KERNELS, bayer_matrix, bayer_thresholds, ordered_dither,
+                    error_diffusion, dither)
+from image_import import import_image
+
+
+def scalar_error_diffusion(levels, kernel):
+    """Reference raster scan, one pixel at a time"""
+    height, width = levels.shape
+    work = levels.astype('float64')
+    pixels = np.zeros((height, width), dtype='uint8')
+    for y in range(height):
+        for x in range(width):
+            on = work[y, x] >= 0.5
+            pixels[y, x] = on
+            error = work[y, x] - on
+            for dy, dx, weight in KERNELS[kernel]:
+                if y + dy < height and 0 <= x + dx < width:
+                    work[y + dy, x + dx] += error * weight
+    return pixels
+
+
+def test_bayer_matrix_ordering():
+    assert (bayer_matrix(2) == [[0, 2], [3, 1]]).all()
+    assert (bayer_matrix(4) == [[0, 8, 2, 10],
+                                [12, 4, 14, 6],
+                                [3, 11, 1, 9],
+                                [15, 7, 13, 5]]).all()
+    for size in (2, 4, 8):
+        matrix = bayer_matrix(size)
+        assert sorted(matrix.ravel()) == list(range(size * size))
+        # Each quadrant holds every fourth index (recursive dispersion)
+        half = size // 2
+        for quadrant in (matrix[:half, :half], matrix[:half, half:],
+                         matrix[half:, :half], matrix[half:, half:]):
+            assert len(set(quadrant.ravel() % 4)) == 1
+        assert 0 < bayer_thresholds(size).min() < bayer_thresholds(size).max() < 1
+
+
+@pytest.mark.parametrize('size', [2, 4, 8])
+def test_ordered_dither_density(size):
+    cells = size * size
+    for on in range(cells + 1):
+        pixels = ordered_dither(np.full((3 * size, 5 * size), on / cells), size)
+        assert pixels.sum() == on * 15
+    # Tiled from the image origin
+    pixels = ordered_dither(np.full((size + 3, size + 5), 0.5), size)
+    assert (pixels[:3, :5] == pixels[size:, size:]).all()
+
+
+@pytest.mark.parametrize('kernel', sorted(KERNELS))
+def test_wavefront_matches_scalar(kernel):
+    rng = np.random.default_rng(len(kernel))
+    gradient = np.tile(np.linspace(0, 1, 37), (23, 1))
+    for levels in (rng.random((23, 37)), gradient, gradient.T, rng.random((1, 9)),
+                   rng.random((9, 1)), np.full((16, 16), 0.25)):
+        assert (error_diffusion(levels, kernel) == scalar_error_diffusion(levels, kernel)).all()
+
+
+def test_dither_methods():
+    levels = np.random.default_rng(0).random((16, 24))
+    assert (dither(levels, 'threshold') == (levels >= 0.5)).all()
+    assert (dither(levels, 'bayer4') == ordered_dither(levels, 4)).all()
+    assert (dither(levels) == error_diffusion(levels, 'floyd-steinberg')).all()
+    with pytest.raises(ValueError):
+        dither(levels, 'unknown')
+
+
+def test_import_image_dithers_dark_areas(tmp_path):
+    gray = np.tile(np.arange(0, 256, 8, dtype='uint8'), (12, 1))
+    path = str(tmp_path / 'gradient.pgm')
+    with open(path, 'wb') as f:
+        f.write(b'P5\n32 12\n255\n' + gray.tobytes())
+    levels = 1.0 - gray / 255.0
+    assert (import_image(path, method='bayer8') == ordered_dither(levels, 8)).all()
+    pixels = import_image(path)
+    assert (pixels == scalar_error_diffusion(levels, 'floyd-steinberg')).all()
+    # Black on the left, white on the right
+    assert pixels[:, 0].all() and not pixels[:, -1].any()
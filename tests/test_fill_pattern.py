@@ -0,0 +1,67 @@
+import numpy as np
+from canvas import Canvas, get_pattern
+
+CHECKER = np.array([[1, 0], [0, 1]])
+
+
+def test_gray_level_density():
+    for on in range(65):
+        pattern = get_pattern(on / 64.0)
+        assert pattern.shape == (8, 8)
+        assert pattern.sum() == on
+
+
+def test_gray_levels_nested_and_dispersed():
+    previous = get_pattern(0.0)
+    for on in range(1, 65):
+        pattern = get_pattern(on / 64.0)
+        # Darker levels only add pixels
+        assert (pattern >= previous).all()
+        previous = pattern
+    # Half gray is spread evenly, two pixels in every 2 x 2 cell
+    half = get_pattern(0.5).reshape(4, 2, 4, 2).sum(axis=(1, 3))
+    assert (half == 2).all()
+
+
+def test_pattern_phase_follows_canvas_origin():
+    pattern = get_pattern(0.3)
+    whole, parts = Canvas(128, 64), Canvas(128, 64)
+    whole.fill_rectangle(5, 3, 60, 40, pattern=0.3)
+    # Adjoining shapes continue the same tiling without seams
+    parts.fill_rectangle(5, 3, 27, 40, pattern=0.3)
+    parts.fill_rectangle(32, 3, 33, 17, pattern=0.3)
+    parts.fill_rectangle(32, 20, 33, 23, pattern=0.3)
+    assert (whole.buffer == parts.buffer).all()
+    rows, cols = np.mgrid[3:43, 5:65]
+    assert (whole.buffer[3:43, 5:65] == pattern[rows % 8, cols % 8]).all()
+    # Outside the shape is untouched
+    assert whole.buffer.sum() == whole.buffer[3:43, 5:65].sum()
+
+
+def test_stipple_pattern_and_color():
+    canvas = Canvas(128, 64)
+    canvas.buffer[:] = 1
+    canvas.fill_rectangle(10, 10, 20, 20, color=0, pattern=CHECKER)
+    rows, cols = np.mgrid[10:30, 10:30]
+    # Pattern pixels get the color, the others the opposite
+    assert (canvas.buffer[10:30, 10:30] == (rows + cols) % 2).all()
+
+
+def test_shape_fill_masked_by_shape():
+    solid, patterned = Canvas(128, 64), Canvas(128, 64)
+    solid.fill_circle(64, 32, 20)
+    patterned.fill_circle(64, 32, 20, pattern=0.5)
+    rows, cols = np.nonzero(solid.buffer)
+    assert (patterned.buffer[rows, cols] == get_pattern(0.5)[rows % 8, cols % 8]).all()
+    assert patterned.buffer.sum() == patterned.buffer[rows, cols].sum()
+
+
+def test_invert_toggles_pattern_pixels():
+    canvas = Canvas(128, 64)
+    canvas.fill_rectangle(0, 0, 16, 16)
+    canvas.fill_rectangle(8, 0, 16, 16, invert=True, pattern=CHECKER)
+    rows, cols = np.mgrid[0:16, 8:24]
+    on = (rows + cols) % 2 == 0
+    assert (canvas.buffer[0:16, 8:16] == ~on[:, :8]).all()
+    assert (canvas.buffer[0:16, 16:24] == on[:, 8:]).all()
+    assert (canvas.buffer[0:16, 0:8] == 1).all()
@@ -0,0 +1,104 @@
+import threading
+import numpy as np
+import pytest
+import emulator
+from canvas import pack_pages
+from frame_stream import FrameStreamWriter, FrameStream, StreamPlayer
+
+
+def random_frames(count, seed=0):
+    """Packed frames where a few pages change between frames"""
+    rng = np.random.default_rng(seed)
+    frames = [rng.integers(0, 256, (8, 128), dtype='uint8')]
+    for _ in range(count - 1):
+        frame = frames[-1].copy()
+        pages = rng.integers(0, 8, 2)
+        frame[pages] = rng.integers(0, 256, (2, 128), dtype='uint8')
+        frames.append(frame)
+    return frames
+
+
+@pytest.mark.parametrize('delta, keyframe_interval', [(False, 0), (True, 0), (True, 4)])
+def test_round_trip(tmp_path, delta, keyframe_interval):
+    path = str(tmp_path / 'anim.fs')
+    frames = random_frames(12)
+    with FrameStreamWriter(path, delta, keyframe_interval) as writer:
+        for frame in frames:
+            writer.write(frame)
+    stream = FrameStream(path)
+    try:
+        assert len(stream) == len(frames)
+        # Random access, including backwards
+        for idx in (0, 11, 5, 6, 1):
+            assert (stream.get_frame(idx) == frames[idx]).all()
+    finally:
+        stream.close()
+
+
+def test_bad_stream_rejected(tmp_path):
+    path = str(tmp_path / 'bad.fs')
+    with open(path, 'wb') as f:
+        f.write(b'\x00' * 64)
+    with pytest.raises(ValueError):
+        FrameStream(path)
+
+
+def play(tmp_path, frames, loops=1):
+    path = str(tmp_path / 'play.fs')
+    with FrameStreamWriter(path, delta=True) as writer:
+        for frame in frames:
+            writer.write(frame)
+    board = emulator.EmulatedBoard()
+    glcd = board.glcd()
+    glcd.init()
+    stream = FrameStream(path)
+    player = StreamPlayer(glcd, stream, loops=loops)
+    thread = threading.Thread(target=player.play)
+    thread.start()
+    thread.join(5)
+    stopped = not thread.is_alive()
+    if not stopped:
+        player.stop()
+        thread.join()
+    stream.close()
+    return board, player, stopped
+
+
+def test_player_shows_last_frame(tmp_path):
+    frames = random_frames(6, seed=1)
+    board, player, stopped = play(tmp_path, frames)
+    assert stopped
+    assert player.frames == 6
+    assert (pack_pages(board.controller.frame()) == frames[-1]).all()
+
+
+def test_empty_stream_forever_ends(tmp_path):
+    _, player, stopped = play(tmp_path, [], loops=0)
+    assert stopped
+    assert player.frames == 0
+
+
+def test_delta_more_than_eight_pages(tmp_path):
+    path = str(tmp_path / 'tall.fs')
+    rng = np.random.default_rng(2)
+    frames = [rng.integers(0, 256, (16, 32), dtype='uint8')]
+    for pages in ([3], [9, 15], [], [0, 8, 12]):
+        frame = frames[-1].copy()
+        frame[pages] = rng.integers(0, 256, (len(pages), 32), dtype='uint8')
+        frames.append(frame)
+    with FrameStreamWriter(path, delta=True, pages=16, columns=32) as writer:
+        for frame in frames:
+            writer.write(frame)
+    stream = FrameStream(path)
+    try:
+        assert list(stream.read_changes(2)[0]) == [9, 15]
+        for idx in (4, 0, 3, 1):
+            assert (stream.get_frame(idx) == frames[idx]).all()
+    finally:
+        stream.close()
+
+
+def test_wrong_frame_shape_rejected(tmp_path):
+    with FrameStreamWriter(str(tmp_path / 'shape.fs')) as writer:
+        with pytest.raises(ValueError):
+            writer.write(np.zeros((4, 128), dtype='uint8'))
@@ -0,0 +1,27 @@
+import emulator
+
+
+def draw_and_restart(warm):
+    """Shows a frame, creates a new Glcd on the same board and inits it
+    Returns:
+        (Numpy 2D array, Numpy 2D array): Panel before and after the restart
+    """
+    board = emulator.EmulatedBoard()
+    glcd = board.glcd()
+    glcd.init()
+    glcd.draw_circle(64, 32, 20)
+    glcd.flip()
+    before = board.controller.frame()
+    board.glcd().init(warm=warm)
+    return before, board.controller.frame()
+
+
+def test_warm_init_keeps_display_ram():
+    before, after = draw_and_restart(warm=True)
+    assert before.any()
+    assert (after == before).all()
+
+
+def test_cold_init_resets_display():
+    before, after = draw_and_restart(warm=False)
+    assert not (after == before).all()
@@ -0,0 +1,28 @@
+import numpy as np
+import emulator
+from grayscale import GrayCanvas, GrayscaleDriver
+
+
+def test_planes_sum_to_levels():
+    canvas = GrayCanvas(128, 64, levels=4)
+    canvas.buffer[:] = np.random.default_rng(0).integers(0, 4, (64, 128))
+    planes = canvas.get_planes()
+    assert planes.shape == (3, 64, 128)
+    assert (planes.sum(axis=0) == canvas.buffer).all()
+
+
+def test_subframes_cycle_planes():
+    board = emulator.EmulatedBoard()
+    glcd = board.glcd()
+    glcd.init()
+    driver = GrayscaleDriver(glcd, levels=3)
+    driver.canvas.fill_rectangle(0, 0, 64, 64, color=1)
+    driver.canvas.fill_rectangle(64, 0, 64, 64, color=2)
+    driver.update()
+    shown = []
+    for _ in range(4):
+        driver.show_subframe()
+        shown.append(board.controller.frame())
+    # Level 2 is on in every subframe, level 1 in every other one
+    assert all(frame[:, 64:].all() for frame in shown)
+    assert sum(frame[:, :64].all() for frame in shown) == 2
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from image_import import (read_pnm_header, read_pnm, save_pbm, load_pbm,
+                          import_image, convert_directory)
+
+
+def write(path, data):
+    with open(str(path), 'wb') as f:
+        f.write(data)
+    return str(path)
+
+
+def test_header_with_comment():
+    magic, values, offset = read_pnm_header(b'P5\n# comment\n4 2\n255\n' + bytes(8))
+    assert magic == 'P5'
+    assert values == [4, 2, 255]
+    assert offset == 21
+
+
+@pytest.mark.parametrize('data', [
+    b'P5\n4 2\n255',        # Truncated after the last value
+    b'P5\n4 2',
+    b'P5\n# comment',       # Comment without newline
+    b'GIF89a\x04\x00\x02\x00',
+    b'',
+])
+def test_bad_header_raises(data):
+    with pytest.raises(ValueError):
+        read_pnm_header(data)
+
+
+def test_truncated_pixels_raise(tmp_path):
+    path = write(tmp_path / 'short.pgm', b'P5\n4 2\n255\n' + bytes(3))
+    with pytest.raises(ValueError):
+        read_pnm(path)
+
+
+def test_read_pgm_and_ascii_pbm(tmp_path):
+    pgm = write(tmp_path / 'a.pgm', b'P5\n2 1\n255\n\x00\xff')
+    assert read_pnm(pgm).tolist() == [[0.0, 1.0]]
+    pbm = write(tmp_path / 'a.pbm', b'P1\n3 2\n1 0 1\n0 1 0\n')
+    assert read_pnm(pbm).tolist() == [[0, 1, 0], [1, 0, 1]]
+
+
+def test_pbm_round_trip(tmp_path):
+    bitmap = np.random.default_rng(0).integers(0, 2, (13, 21), dtype='uint8')
+    path = str(tmp_path / 'r.pbm')
+    save_pbm(path, bitmap)
+    assert (load_pbm(path) == bitmap).all()
+
+
+def test_import_image_thresholds(tmp_path):
+    path = write(tmp_path / 'g.pgm', b'P5\n2 1\n255\n\x00\xff')
+    # Dark pixels are on
+    assert import_image(path, method='threshold').tolist() == [[1, 0]]
+
+
+def test_convert_directory_skips_bad_files(tmp_path):
+    source = tmp_path / 'src'
+    source.mkdir()
+    write(source / 'bad.pgm', b'GIF89a\x04\x00\x02\x00')
+    write(source / 'short.pgm', b'P5\n4 2\n255')
+    write(source / 'good.pgm', b'P5\n2 1\n255\n\x00\xff')
+    converted = convert_directory(str(source), str(tmp_path / 'out'))
+    assert [p.rsplit('/', 1)[-1] for p in converted] == ['good.pbm']
@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import numpy as np
+import kernels
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_line_points_match_loop():
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        x1, y1, x2, y2 = (int(v) for v in rng.integers(-20, 150, 4))
+        loop = kernels.line_points_loop(x1, y1, x2, y2)
+        vector = kernels.line_points_vector(x1, y1, x2, y2)
+        assert (loop[0] == vector[0]).all() and (loop[1] == vector[1]).all()
+
+
+def test_polygon_spans_match_loop():
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        coords = rng.integers(0, 64, (int(rng.integers(3, 8)), 2))
+        coords = np.vstack((coords, coords[:1])).astype('int64')
+        loop = kernels.polygon_spans_loop(coords)
+        vector = kernels.polygon_spans_vector(coords)
+        for a, b in zip(loop, vector):
+            assert (a == b).all()
+
+
+def test_fill_spans_match_loop():
+    rng = np.random.default_rng(2)
+    for invert in (False, True):
+        for _ in range(100):
+            count = int(rng.integers(1, 20))
+            rows = rng.integers(0, 16, count)
+            x1s = rng.integers(0, 20, count)
+            x2s = x1s + rng.integers(0, 10, count)
+            start = rng.integers(0, 2, (16, 32), dtype='uint8')
+            loop, vector = start.copy(), start.copy()
+            kernels.fill_spans_loop(loop, rows, x1s, x2s, 1, invert)
+            kernels.fill_spans_vector(vector, rows, x1s, x2s, 1, invert)
+            assert (loop == vector).all()
+
+
+def import_loads_numba(env):
+    code = 'import sys, st7565; print("numba" in sys.modules)'
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT,
+                                     env=dict(os.environ, **env))
+    return output.strip() == b'True'
+
+
+def test_import_does_not_load_numba():
+    assert not import_loads_numba({'ST7565_KERNELS': 'python'})
+    # Numba (when installed) is only loaded on the first draw
+    assert not import_loads_numba({'ST7565_KERNELS': 'numba'})
+
+
+def test_failed_compile_falls_back_to_python(monkeypatch, capsys):
+    def compile_kernels():
+        raise RuntimeError('no LLVM target')
+    monkeypatch.setattr(kernels, 'compile_kernels', compile_kernels)
+    monkeypatch.setitem(kernels.BACKENDS, 'numba', dict(
+        (name, kernels.compile_on_first_use(name)) for name in kernels.KERNELS))
+    try:
+        kernels.use_backend('numba')
+        xs, ys = kernels.line_points(0, 0, 5, 3)
+        expected = kernels.line_points_vector(0, 0, 5, 3)
+        assert (xs == expected[0]).all() and (ys == expected[1]).all()
+        assert kernels.backend == 'python'
+        assert 'numba' not in kernels.BACKENDS
+        assert 'no LLVM target' in capsys.readouterr().out
+    finally:
+        kernels.use_backend('python')
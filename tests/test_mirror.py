@@ -0,0 +1,140 @@
+import os
+import time
+import numpy as np
+import pytest
+import emulator
+import mirror
+from console import TextConsole
+from spi_bus import SharedSpiBus
+import st7565
+import xglcd_font
+
+FONT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                    'fonts', 'Neato5x7.c')
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    bytes(1024),
+    b'\x01\x02',
+    bytes(range(256)) * 3,
+    b'\xaa' * 130 + b'\x01' + b'\x00' * 2 + b'\x05' * 4,
+])
+def test_rle_round_trip(data):
+    assert mirror.rle_decode(mirror.rle_encode(data)) == data
+
+
+def test_rle_random_round_trip():
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        data = (rng.random(int(rng.integers(0, 1200))) < .1).astype(np.uint8).tobytes()
+        assert mirror.rle_decode(mirror.rle_encode(data)) == data
+
+
+def test_rle_compresses_sparse_delta():
+    assert len(mirror.rle_encode(bytes(1024))) == 16
+
+
+def test_parse_address():
+    assert mirror.parse_address('pi:7565') == ('pi', 7565)
+    assert mirror.parse_address('/tmp/mirror.sock') == '/tmp/mirror.sock'
+
+
+def wait_for(viewer, panel, timeout=2.0):
+    """Reads messages until the viewer shows the panel's pixels"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        viewer.update(.1)
+        if (viewer.get_pixels() == panel).all():
+            return True
+    return False
+
+
+@pytest.fixture
+def mirrored(tmp_path):
+    board = emulator.EmulatedBoard()
+    glcd = board.glcd()
+    frame_mirror = mirror.FrameMirror(glcd, str(tmp_path / 'mirror.sock'), max_fps=None)
+    glcd.init()
+    viewer = mirror.MirrorViewer(str(tmp_path / 'mirror.sock'))
+    yield board, glcd, frame_mirror, viewer
+    viewer.close()
+    frame_mirror.close()
+
+
+def test_flip_and_region(mirrored):
+    board, glcd, frame_mirror, viewer = mirrored
+    glcd.draw_circle(60, 30, 20)
+    glcd.flip()
+    assert wait_for(viewer, board.controller.frame())
+    glcd.fill_rectangle(0, 0, 10, 10)
+    glcd.flip_region(x=0, y=0, w=10, h=10)
+    assert wait_for(viewer, board.controller.frame())
+    glcd.clear_display()
+    assert wait_for(viewer, board.controller.frame())
+    assert not viewer.get_pixels().any()
+
+
+def test_write_only_console(mirrored):
+    board, glcd, frame_mirror, viewer = mirrored
+    console = TextConsole(glcd, xglcd_font.XglcdFont(FONT, 5, 7))
+    console.write('Hello mirror\nline two')
+    panel = board.controller.frame()
+    assert panel.any()
+    assert wait_for(viewer, panel)
+    assert frame_mirror.frames > 0
+
+
+def test_keyframe_for_late_viewer(mirrored, tmp_path):
+    board, glcd, frame_mirror, viewer = mirrored
+    glcd.draw_line(0, 0, 127, 63)
+    glcd.flip()
+    late = mirror.MirrorViewer(str(tmp_path / 'mirror.sock'))
+    try:
+        assert wait_for(late, board.controller.frame())
+    finally:
+        late.close()
+
+
+def test_shared_bus_flush(tmp_path):
+    board = emulator.EmulatedBoard()
+    bus = SharedSpiBus(gpio=board.gpio, spi=board.spi)
+    glcd = st7565.Glcd(board.a0, board.cs, board.rst, shared_bus=bus, gpio=board.gpio)
+    frame_mirror = mirror.FrameMirror(glcd, str(tmp_path / 'bus.sock'), max_fps=None)
+    viewer = mirror.MirrorViewer(str(tmp_path / 'bus.sock'))
+    try:
+        glcd.init()
+        glcd.draw_rectangle(10, 10, 40, 20)
+        bus.invalidate_all(glcd)
+        bus.flush()
+        assert wait_for(viewer, board.controller.frame())
+    finally:
+        viewer.close()
+        frame_mirror.close()
+
+
+def test_close_restores_methods(tmp_path):
+    board = emulator.EmulatedBoard()
+    glcd = board.glcd()
+    frame_mirror = mirror.FrameMirror(glcd, str(tmp_path / 'm.sock'))
+    frame_mirror.close()
+    assert 'write_page' not in glcd.__dict__ and 'end_frame' not in glcd.__dict__
+    assert not os.path.exists(str(tmp_path / 'm.sock'))
+
+
+def test_coalesced_publishing(tmp_path):
+    board = emulator.EmulatedBoard()
+    glcd = board.glcd()
+    frame_mirror = mirror.FrameMirror(glcd, str(tmp_path / 'fps.sock'), max_fps=20)
+    viewer = mirror.MirrorViewer(str(tmp_path / 'fps.sock'))
+    try:
+        glcd.init()
+        for idx in range(40):
+            glcd.draw_line(idx, 0, 127 - idx, 63)
+            glcd.flip()
+        assert wait_for(viewer, board.controller.frame())
+        # Frames ending within one interval are published together
+        assert frame_mirror.frames < 40
+    finally:
+        viewer.close()
+        frame_mirror.close()
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+import emulator
+from canvas import Canvas
+
+
+@pytest.fixture
+def board():
+    board = emulator.EmulatedBoard()
+    board.glcd_object = board.glcd()
+    board.glcd_object.init()
+    return board
+
+
+def draw_marker(glcd):
+    """Draws an asymmetric pattern and returns the canvas pixels"""
+    glcd.clear_back_buffer()
+    glcd.fill_rectangle(0, 0, 12, 6)
+    glcd.draw_line(0, 0, glcd.canvas.width - 1, glcd.canvas.height // 2)
+    glcd.draw_point(glcd.canvas.width - 3, glcd.canvas.height - 2)
+    glcd.flip()
+    return glcd.back_buffer.copy()
+
+
+@pytest.mark.parametrize('kwargs, view', [
+    ({}, lambda p: p),
+    ({'rotation': 180}, lambda p: np.rot90(p, 2)),
+    ({'rotation': 90}, lambda p: np.rot90(p, -1)),
+    ({'rotation': 270}, lambda p: np.rot90(p, 1)),
+    ({'mirror_x': True}, np.fliplr),
+    ({'mirror_y': True}, np.flipud),
+    ({'rotation': 180, 'mirror_x': True}, np.flipud),
+    ({'invert': True}, lambda p: 1 - p),
+    ({'rotation': 90, 'mirror_x': True}, lambda p: np.rot90(np.fliplr(p), -1)),
+    ({'rotation': 90, 'mirror_y': True}, lambda p: np.rot90(np.flipud(p), -1)),
+    ({'rotation': 270, 'mirror_x': True}, lambda p: np.rot90(np.fliplr(p), 1)),
+    ({'rotation': 270, 'mirror_y': True}, lambda p: np.rot90(np.flipud(p), 1)),
+    ({'rotation': 90, 'mirror_x': True, 'mirror_y': True}, lambda p: np.rot90(p, 1)),
+])
+def test_panel_shows_oriented_canvas(board, kwargs, view):
+    glcd = board.glcd_object
+    glcd.set_orientation(**kwargs)
+    pixels = draw_marker(glcd)
+    assert (board.controller.frame() == view(pixels)).all()
+
+
+@pytest.mark.parametrize('rotation', [0, 90, 180, 270])
+def test_flip_region_matches_flip(board, rotation):
+    glcd = board.glcd_object
+    glcd.set_orientation(rotation)
+    draw_marker(glcd)
+    glcd.fill_rectangle(3, 9, 20, 11)
+    glcd.flip_region(3, 9, 20, 11)
+    partial = board.controller.frame()
+    glcd.flip()
+    assert (board.controller.frame() == partial).all()
+
+
+def test_set_orientation_resends_frame(board):
+    glcd = board.glcd_object
+    pixels = draw_marker(glcd)
+    glcd.set_orientation(180)
+    assert (board.controller.frame() == np.rot90(pixels, 2)).all()
+
+
+@pytest.mark.parametrize('rotation', [90, 270])
+def test_contents_kept_when_portrait_changes(board, rotation):
+    glcd = board.glcd_object
+    draw_marker(glcd)
+    panel = board.controller.frame()
+    glcd.set_orientation(rotation)
+    assert glcd.canvas.width == 64
+    # The panel keeps its image
+    assert (board.controller.frame() == panel).all()
+    glcd.set_orientation(0)
+    assert (board.controller.frame() == panel).all()
+
+
+def test_portrait_refused_for_shared_buffer(board):
+    glcd = board.glcd_object
+    shared = bytearray(128 * 64)
+    buffer = np.ndarray((64, 128), dtype='uint8', buffer=shared)
+    glcd.canvas = Canvas(128, 64, buffer)
+    glcd.set_orientation(90)
+    assert glcd.rotation == 0
+    assert glcd.back_buffer is buffer
+    # Landscape changes keep the shared buffer
+    glcd.set_orientation(180)
+    assert glcd.rotation == 180 and glcd.back_buffer is buffer
@@ -0,0 +1,52 @@
+import numpy as np
+import emulator
+from canvas import pack_pages
+from frame_stream import FrameStream
+from prerender import prerender, render_frame, FrameCache
+
+
+def draw_ball(canvas, step):
+    """Module level so worker processes can run it"""
+    canvas.fill_circle(10 + step * 7, canvas.height // 2, 6)
+    canvas.draw_rectangle(0, 0, canvas.width, canvas.height)
+
+
+def test_pool_matches_serial_rendering():
+    cache = prerender(draw_ball, range(12), processes=2)
+    assert cache.frames.shape == (12, 8, 128)
+    for step in (0, 5, 11):
+        assert (cache[step] == render_frame(draw_ball, 128, 64, step)).all()
+
+
+def test_npy_round_trip(tmp_path):
+    path = str(tmp_path / 'frames.npy')
+    cache = prerender(draw_ball, range(6), processes=2, path=path)
+    loaded = FrameCache.load(path)
+    assert len(loaded) == 6
+    assert (loaded.frames == cache.frames).all()
+
+
+def test_stream_round_trip(tmp_path):
+    # Frames taller than 64 pixels need a delta mask over 8 pages
+    frames = [render_frame(draw_ball, 128, 128, step) for step in range(10)]
+    cache = FrameCache(np.array(frames))
+    for delta, keyframe_interval in ((False, 0), (True, 0), (True, 3)):
+        path = str(tmp_path / 'frames.fs')
+        cache.save_stream(path, delta, keyframe_interval)
+        stream = FrameStream(path)
+        try:
+            assert (stream.pages, stream.columns) == (16, 128)
+            assert len(stream) == len(cache)
+            for idx in (9, 0, 4, 5):
+                assert (stream.get_frame(idx) == cache[idx]).all()
+        finally:
+            stream.close()
+
+
+def test_play_shows_last_frame():
+    board = emulator.EmulatedBoard()
+    glcd = board.glcd()
+    glcd.init()
+    cache = FrameCache(np.array([render_frame(draw_ball, 128, 64, step) for step in range(4)]))
+    cache.play(glcd, loops=2)
+    assert (pack_pages(board.controller.frame()) == cache[-1]).all()
@@ -0,0 +1,104 @@
+import numpy as np
+import emulator
+import st7565
+from canvas import Canvas
+from spi_bus import SharedSpiBus, TiledDisplay
+from calibrate_spi import calibrate, best_setting
+
+
+class MockSpi(object):
+    """SPI device without a bufsiz attribute"""
+
+
+def test_transfers_chunked_to_bufsiz():
+    board = emulator.EmulatedBoard()
+    glcd = board.glcd()
+    assert glcd.chunk_size == board.spi.bufsiz
+    # The emulated device raises OverflowError above bufsiz
+    glcd.send_data([0] * (board.spi.bufsiz + 10))
+    assert board.spi.transfers == 2
+
+
+def test_chunk_size_limits_transfers():
+    board = emulator.EmulatedBoard()
+    glcd = board.glcd(chunk_size=100)
+    glcd.send_data(list(range(250)))
+    assert board.spi.transfers == 3
+
+
+def test_shared_bus_chunked():
+    board = emulator.EmulatedBoard()
+    bus = SharedSpiBus(gpio=board.gpio, spi=board.spi, chunk_size=64)
+    glcd = st7565.Glcd(board.a0, board.cs, board.rst, shared_bus=bus, gpio=board.gpio)
+    board.spi.reset_stats()
+    glcd.send_data([1] * 200)
+    assert board.spi.transfers == 4
+
+
+def make_tiles():
+    """Two emulated displays with their own chip select and reset on one bus"""
+    gpio = emulator.EmulatedGpio()
+    spi = emulator.EmulatedSpi(gpio)
+    bus = SharedSpiBus(gpio=gpio, spi=spi)
+    controllers, panels = [], []
+    for cs, rst in ((8, 25), (7, 23)):
+        controller = emulator.EmulatedController(gpio, rst)
+        spi.attach(controller, 24, cs)
+        glcd = st7565.Glcd(24, cs, rst, shared_bus=bus, gpio=gpio)
+        glcd.init()
+        controllers.append(controller)
+        panels.append(glcd)
+    return spi, bus, controllers, TiledDisplay(bus, panels, columns=2)
+
+
+def test_tiled_display_matches_large_canvas():
+    spi, bus, controllers, tiled = make_tiles()
+    reference = Canvas(256, 64)
+    for target in (tiled, reference):
+        target.draw_rectangle(100, 5, 50, 40)
+        target.fill_circle(128, 32, 20)
+        target.draw_line(0, 63, 255, 0)
+    tiled.flip()
+    frame = np.hstack([c.frame() for c in controllers])
+    assert (frame == reference.buffer).all()
+
+    # A change on the right display only sends its dirty pages
+    data = [c.data for c in controllers]
+    spi.reset_stats()
+    tiled.fill_rectangle(200, 20, 10, 4)
+    reference.fill_rectangle(200, 20, 10, 4)
+    assert tiled.flip() == 1
+    assert controllers[0].data == data[0]
+    assert controllers[1].data == data[1] + 10
+    frame = np.hstack([c.frame() for c in controllers])
+    assert (frame == reference.buffer).all()
+
+
+def test_shared_bus_round_robin():
+    spi, bus, controllers, tiled = make_tiles()
+    data = [c.data for c in controllers]
+    for glcd in tiled.panels:
+        glcd.fill_rectangle(0, 0, 128, 64)
+        bus.invalidate_all(glcd)
+    # Displays take turns one page at a time
+    assert bus.flush(max_segments=2) == 2
+    assert [c.data - d for c, d in zip(controllers, data)] == [128, 128]
+    # The next flush starts with the other display
+    assert bus.flush(max_segments=5) == 5
+    assert [c.data - d for c, d in zip(controllers, data)] == [128 * 3, 128 * 4]
+    assert bus.flush() == 9
+    assert not bus.is_dirty()
+    for glcd, controller in zip(tiled.panels, controllers):
+        assert (controller.frame() == glcd.back_buffer).all()
+
+
+def test_bufsiz_fallback():
+    assert st7565.get_spi_bufsiz(MockSpi()) > 0
+
+
+def test_calibration_finds_fastest_reliable_setting():
+    results = calibrate(speeds=(1000000, 2000000, 4000000), chunk_sizes=(16, 128), count=2,
+                        max_reliable_hz=2000000)
+    assert all(r.errors for r in results if r.speed_hz > 2000000)
+    best = best_setting(results)
+    assert (best.speed_hz, best.chunk_size) == (2000000, 128)
@@ -0,0 +1,82 @@
+import os
+import pytest
+import xglcd_font
+from text_layout import layout_text
+
+FONTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fonts')
+TEXT = 'The quick brown fox jumps over the lazy dog while 0123456789 counts along'
+
+
+@pytest.fixture(scope='module')
+def font():
+    return xglcd_font.XglcdFont(os.path.join(FONTS, 'Bally7x9.c'), 7, 9)
+
+
+def scalar_width(font, letter):
+    """Letter width from the font table one letter at a time"""
+    return int(font.letters[ord(letter) - font.start_letter, 0])
+
+
+def line_width(font, line, spacing=1):
+    return sum(scalar_width(font, c) + spacing for c in line) - spacing
+
+
+@pytest.mark.parametrize('spacing', [0, 1, 3])
+def test_measure_matches_scalar(font, spacing):
+    for text in ('', 'A', 'Hello, World!', TEXT):
+        advances = font.measure_advances(text, spacing)
+        assert list(advances) == [scalar_width(font, c) + spacing for c in text]
+        assert font.measure_text(text, spacing) == sum(advances)
+
+
+@pytest.mark.parametrize('width', [40, 64, 100])
+def test_wrap_fits_and_keeps_words(font, width):
+    layout = layout_text(font, TEXT, width)
+    lines = [text for text, _, _ in layout.lines]
+    assert len(lines) > 1
+    assert not layout.truncated
+    assert all(line_width(font, line) <= width for line in lines)
+    assert all(line == line.strip() for line in lines)
+    # Words longer than the box are broken, nothing is lost
+    assert ''.join(lines).replace(' ', '') == TEXT.replace(' ', '')
+    # Rows are one line height apart
+    assert [y for _, _, y in layout.lines] == [idx * (font.height + 1) for idx in range(len(lines))]
+
+
+def test_long_word_broken(font):
+    layout = layout_text(font, 'W' * 20, 50)
+    lines = [text for text, _, _ in layout.lines]
+    assert ''.join(lines) == 'W' * 20
+    assert all(line_width(font, line) <= 50 for line in lines)
+
+
+def test_ellipsis(font):
+    layout = layout_text(font, TEXT, 80, wrap=False)
+    (line, _, _), = layout.lines
+    assert layout.truncated
+    assert line.endswith('...')
+    assert line_width(font, line) <= 80
+    # One more letter would not fit
+    longer = TEXT[:len(line) - 2].rstrip() + '...'
+    assert line_width(font, longer) > 80 or longer == line
+    assert not layout_text(font, 'Short', 80, wrap=False).truncated
+
+
+def test_height_truncates_with_ellipsis(font):
+    layout = layout_text(font, TEXT, 64, height=2 * font.height + 1)
+    lines = [text for text, _, _ in layout.lines]
+    assert layout.truncated
+    assert len(lines) == 2
+    assert lines[-1].endswith('...')
+    assert line_width(font, lines[-1]) <= 64
+
+
+def test_alignment(font):
+    for text, dx, _ in layout_text(font, TEXT, 90, align='right').lines:
+        assert dx + line_width(font, text) == 90
+    for text, dx, _ in layout_text(font, TEXT, 90, align='center').lines:
+        assert dx == (90 - line_width(font, text)) // 2
+
+
+def test_layout_cached(font):
+    assert layout_text(font, TEXT, 70) is layout_text(font, TEXT, 70)
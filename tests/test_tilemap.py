@@ -0,0 +1,50 @@
+import numpy as np
+from canvas import Canvas
+from tilemap import TileMap, Viewport
+
+
+def make_map(seed=0):
+    rng = np.random.default_rng(seed)
+    tiles = rng.integers(0, 2, (6, 8, 8), dtype='uint8')
+    cells = rng.integers(0, 6, (20, 40))
+    return TileMap(tiles, cells)
+
+
+def test_slice_tiles_reading_order():
+    sheet = np.zeros((16, 24), dtype='uint8')
+    for idx in range(6):
+        sheet[(idx // 3) * 8, (idx % 3) * 8 + idx] = 1
+    tiles = TileMap.slice_tiles(sheet)
+    assert tiles.shape == (6, 8, 8)
+    for idx in range(6):
+        assert tiles[idx, 0, idx] == 1 and tiles[idx].sum() == 1
+
+
+def test_incremental_scroll_matches_render():
+    world = make_map()
+    view = Viewport(Canvas(128, 64), world)
+    rng = np.random.default_rng(1)
+    # Small steps, steps past the canvas size and steps clamped at the edges
+    steps = [(int(dx), int(dy)) for dx, dy in rng.integers(-20, 21, (60, 2))]
+    steps += [(200, 0), (-3, 70), (-500, -500), (7, 5), (1000, 1000)]
+    for dx, dy in steps:
+        view.scroll(dx, dy)
+        fresh = Viewport(Canvas(128, 64), world, view.x, view.y)
+        assert (view.canvas.buffer == fresh.canvas.buffer).all()
+        assert (view.canvas.buffer == world.get_pixels(view.x, view.y, 128, 64)).all()
+
+
+def test_scroll_composes_exposed_pixels_only():
+    view = Viewport(Canvas(128, 64), make_map())
+    view.pixels_rendered = 0
+    view.scroll(3, 2)
+    assert view.pixels_rendered == 128 * 2 + 3 * 62
+
+
+def test_set_cell_redraws_visible_part():
+    world = make_map()
+    view = Viewport(Canvas(128, 64), world, 4, 4)
+    assert view.set_cell(0, 0, 5) == (0, 0, 4, 4)
+    assert view.set_cell(19, 39, 5) is None
+    fresh = Viewport(Canvas(128, 64), world, 4, 4)
+    assert (view.canvas.buffer == fresh.canvas.buffer).all()
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from canvas import Canvas, get_transform_map
+
+
+def turn(bitmap, angle, x0=64, y0=32):
+    """Draws a transformed bitmap and cuts out the quarter turned result"""
+    canvas = Canvas(128, 64)
+    canvas.draw_bitmap_transformed(bitmap, x0, y0, angle)
+    h, w = bitmap.shape if angle % 180 == 0 else bitmap.shape[::-1]
+    return canvas.buffer[y0 - h // 2:y0 - h // 2 + h, x0 - w // 2:x0 - w // 2 + w].copy()
+
+
+@pytest.mark.parametrize('shape', [(7, 7), (8, 8), (7, 12), (10, 5)])
+def test_quarter_turns_exact(shape):
+    bitmap = np.random.default_rng(sum(shape)).integers(0, 2, shape, dtype='uint8')
+    for k in range(4):
+        # Every source pixel is used exactly once
+        _, _, src = get_transform_map(shape[0], shape[1], 90 * k, 1)
+        assert sorted(src) == list(range(bitmap.size))
+        assert (turn(bitmap, 90 * k) == np.rot90(bitmap, -k)).all()
+    assert (turn(bitmap, -90) == np.rot90(bitmap)).all()
+    turned = bitmap
+    for _ in range(4):
+        turned = turn(turned, 90)
+    assert (turned == bitmap).all()
+
+
+def test_unrotated_matches_draw_bitmap():
+    bitmap = np.random.default_rng(3).integers(0, 2, (9, 14), dtype='uint8')
+    transformed, plain = Canvas(128, 64), Canvas(128, 64)
+    transformed.draw_bitmap_transformed(bitmap, 40, 20)
+    plain.draw_bitmap(bitmap, 40 - 14 // 2, 20 - 9 // 2)
+    assert (transformed.buffer == plain.buffer).all()
+
+
+def test_scaled_rotation_covers_bitmap():
+    bitmap = np.ones((10, 10), dtype='uint8')
+    canvas = Canvas(128, 64)
+    canvas.draw_bitmap_transformed(bitmap, 64, 32, angle=45, scale=2)
+    # Area grows with the square of the scale (within edge rounding)
+    assert abs(int(canvas.buffer.sum()) - 400) < 40
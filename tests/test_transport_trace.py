@@ -0,0 +1,67 @@
+import os
+import pytest
+import emulator
+import transport_trace
+from console import TextConsole
+import xglcd_font
+
+FONT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                    'fonts', 'Neato5x7.c')
+
+
+def record(tmp_path, draw):
+    """Records draw(glcd) on an emulated display and returns the trace records"""
+    board = emulator.EmulatedBoard()
+    glcd = board.glcd()
+    glcd.init()
+    path = str(tmp_path / 'unit.trace')
+    with transport_trace.TraceRecorder(glcd, path):
+        draw(glcd)
+    assert 'send_data' not in glcd.__dict__
+    return board, transport_trace.read_trace(path)
+
+
+def test_round_trip_replay(tmp_path):
+    def draw(glcd):
+        glcd.draw_circle(64, 32, 20)
+        glcd.flip()
+        glcd.fill_rectangle(0, 0, 16, 16)
+        glcd.flip_region(x=0, y=0, w=16, h=16)
+    board, records = record(tmp_path, draw)
+    kinds = [kind for kind, _, _ in records]
+    assert kinds.count(transport_trace.FRAME) == 2
+    target = emulator.EmulatedBoard()
+    glcd = target.glcd()
+    glcd.init()
+    frames = transport_trace.replay(records, glcd, spi=target.spi)
+    assert len(frames) == 2
+    assert frames[0].data_bytes == 1024
+    assert frames[1].data_bytes == 16 * 2
+    assert all(f.bus > 0 for f in frames)
+    assert (target.controller.frame() == board.controller.frame()).all()
+
+
+def test_keyword_arguments_recorded(tmp_path):
+    def draw(glcd):
+        glcd.send_command(cmd=[glcd.CMD_DISPLAY_ON])
+        glcd.send_data(data=[1, 2, 3])
+    _, records = record(tmp_path, draw)
+    assert [(kind, bytes(payload)) for kind, _, payload in records] == [
+        (transport_trace.COMMAND, bytes([0xAF])), (transport_trace.DATA, b'\x01\x02\x03')]
+
+
+def test_console_updates_mark_frames(tmp_path):
+    def draw(glcd):
+        console = TextConsole(glcd, xglcd_font.XglcdFont(FONT, 5, 7))
+        console.write('one')
+        console.write(' two')
+    _, records = record(tmp_path, draw)
+    assert [kind for kind, _, _ in records].count(transport_trace.FRAME) == 2
+
+
+def test_bad_trace_rejected(tmp_path):
+    path = str(tmp_path / 'bad.trace')
+    with open(path, 'wb') as f:
+        f.write(b'NOTATRACE!')
+    with pytest.raises(ValueError):
+        transport_trace.read_trace(path)
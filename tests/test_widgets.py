@@ -0,0 +1,70 @@
+import emulator
+from widgets import Screen, Gauge, ProgressBar
+
+
+def make_screen():
+    board = emulator.EmulatedBoard()
+    glcd = board.glcd()
+    glcd.init()
+    screen = Screen(glcd)
+    bar = screen.add(ProgressBar(0, 40, 70, 8, pattern=0.5))
+    gauge = screen.add(Gauge(100, 31, 26, ticks=10))
+    screen.update()
+    return board, screen, bar, gauge
+
+
+def test_separate_regions_sent():
+    board, screen, bar, gauge = make_screen()
+    board.spi.reset_stats()
+    gauge.value = 40
+    bar.value = 0.5
+    regions = screen.update()
+    assert len(regions) == 2
+    # Less than a whole frame (1024 data bytes plus cursor commands)
+    assert board.spi.bytes < 600
+    # Same pixels as drawing everything from scratch
+    reference, _, ref_bar, ref_gauge = make_screen()
+    ref_gauge.value = 40
+    ref_bar.value = 0.5
+    ref_gauge.screen.invalidate(0, 0, 128, 64)
+    ref_gauge.screen.update()
+    assert (board.controller.frame() == reference.controller.frame()).all()
+
+
+def test_regions_on_same_pages_merged():
+    _, screen, _, _ = make_screen()
+    # A gap narrower than the cursor commands is cheaper to send
+    screen.invalidate(0, 0, 10, 8)
+    screen.invalidate(12, 0, 10, 8)
+    screen.invalidate(5, 2, 10, 4)
+    assert screen.get_regions() == [(0, 0, 22, 8)]
+    screen.damage = []
+    # A wide gap is sent as two regions
+    screen.invalidate(0, 0, 10, 8)
+    screen.invalidate(40, 0, 10, 8)
+    assert len(screen.get_regions()) == 2
+
+
+def test_large_damage_flips_whole_frame():
+    board, screen, _, _ = make_screen()
+    board.spi.reset_stats()
+    screen.invalidate(0, 0, 128, 64)
+    screen.update()
+    # One full flip: 8 pages of 128 bytes plus 3 cursor commands each
+    assert board.spi.bytes == 8 * (128 + 3)
+
+
+def test_nothing_damaged():
+    _, screen, _, _ = make_screen()
+    assert screen.update() == []
+
+
+def test_gauge_sweep_redraws():
+    board, screen, _, gauge = make_screen()
+    gauge.value = 50
+    screen.update()
+    before = board.controller.frame().copy()
+    gauge.sweep = 180
+    assert screen.get_regions()
+    screen.update()
+    assert (board.controller.frame() != before).any()
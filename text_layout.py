@@ -0,0 +1,141 @@
+from __future__ import print_function
+from functools import lru_cache
+import numpy as np
+
+ALIGNMENTS = ('left', 'center', 'right')
+
+
+class TextLayout(object):
+    """Lines of text positioned inside a box
+    Attributes:
+        lines: List of (text, x, y) with x, y relative to the box
+        font: XglcdFont object used to measure the text
+        spacing: Pixel spacing between letters
+        truncated: True if text was cut short with an ellipsis
+    """
+
+    def __init__(self, lines, font, spacing, truncated):
+        self.lines = lines
+        self.font = font
+        self.spacing = spacing
+        self.truncated = truncated
+
+    def draw(self, canvas, x, y, invert=False):
+        """Draws the laid out text
+        Args:
+            canvas (Canvas object): Target canvas
+            x, y (int): Top left coordinates of the box
+            invert (Optional boolean): If True inverts font monochrome color. Default is False
+        """
+        for text, dx, dy in self.lines:
+            canvas.draw_string(text, self.font, x + dx, y + dy, self.spacing, invert)
+
+
+def fit_ellipsis(font, text, width, spacing, ellipsis):
+    """Truncates text so it fits the width with an ellipsis appended
+    Args:
+        font (XglcdFont object): Font
+        text (string): Text
+        width (int): Maximum pixel width
+        spacing (int): Pixel spacing between letters
+        ellipsis (string): Appended to truncated text
+    Returns:
+        string: Truncated text with ellipsis
+    """
+    room = width - font.measure_text(ellipsis, spacing) + spacing
+    cum = np.concatenate(([0], np.cumsum(font.measure_advances(text, spacing))))
+    # Longest prefix whose advances fit in front of the ellipsis
+    end = int(np.searchsorted(cum, room, 'right')) - 1
+    return text[:max(end, 0)].rstrip() + ellipsis
+
+
+def wrap_paragraph(font, text, width, spacing):
+    """Greedy word wrap of a single paragraph
+    Args:
+        font (XglcdFont object): Font
+        text (string): Paragraph without newlines
+        width (int): Maximum pixel width
+        spacing (int): Pixel spacing between letters
+    Returns:
+        [string]: Lines
+    """
+    # Cumulative advances measured once for the whole paragraph
+    cum = np.concatenate(([0], np.cumsum(font.measure_advances(text, spacing))))
+    length = len(text)
+    lines = []
+    start = 0
+    while True:
+        # Skip spaces at the start of a wrapped line
+        while start < length and text[start] == ' ' and lines:
+            start += 1
+        if start >= length and lines:
+            return lines
+        # Furthest end where the line still fits
+        end = int(np.searchsorted(cum, cum[start] + width + spacing, 'right')) - 1
+        if end >= length:
+            lines.append(text[start:].rstrip())
+            return lines
+        # Break after the last space that fits, else break the word
+        brk = text.rfind(' ', start, end + 1)
+        if brk > start:
+            lines.append(text[start:brk].rstrip())
+            start = brk + 1
+        else:
+            end = max(end, start + 1)
+            lines.append(text[start:end])
+            start = end
+
+
+@lru_cache(maxsize=128)
+def layout_text(font, text, width, height=None, align='left', spacing=1,
+                line_spacing=1, wrap=True, ellipsis='...'):
+    """Lays out text in a box
+    Args:
+        font (XglcdFont object): Font
+        text (string): Text (newlines start new paragraphs)
+        width (int): Pixel width of box
+        height (Optional int): Pixel height of box. Default is None (unlimited).
+        align (Optional string): left, center or right. Default is left.
+        spacing (Optional int): Pixel spacing between letters. Default is 1.
+        line_spacing (Optional int): Pixel spacing between lines. Default is 1.
+        wrap (Optional boolean): Word wrap long lines. Default is True (else truncate).
+        ellipsis (Optional string): Marks truncated text. Default is '...'.
+    Returns:
+        TextLayout object
+    Note:
+        Layouts are cached so static labels are only laid out once.
+    """
+    if align not in ALIGNMENTS:
+        print('Invalid alignment.  Must be left, center or right.')
+        align = 'left'
+    lines = []
+    truncated = False
+    for paragraph in text.split('\n'):
+        if wrap:
+            lines.extend(wrap_paragraph(font, paragraph, width, spacing))
+        elif font.measure_text(paragraph, spacing) - spacing > width:
+            lines.append(fit_ellipsis(font, paragraph, width, spacing, ellipsis))
+            truncated = True
+        else:
+            lines.append(paragraph)
+    # Truncate lines that do not fit the box height
+    line_height = font.height + line_spacing
+    if height is not None:
+        max_lines = max((height + line_spacing) // line_height, 0)
+        if len(lines) > max_lines:
+            lines = lines[:max_lines]
+            if lines:
+                lines[-1] = fit_ellipsis(font, lines[-1], width, spacing, ellipsis)
+            truncated = True
+    # Position lines
+    positioned = []
+    for idx, line in enumerate(lines):
+        free = width - max(font.measure_text(line, spacing) - spacing, 0)
+        if align == 'center':
+            dx = free // 2
+        elif align == 'right':
+            dx = free
+        else:
+            dx = 0
+        positioned.append((line, max(dx, 0), idx * line_height))
+    return TextLayout(positioned, font, spacing, truncated)
@@ -0,0 +1,183 @@
+""" Tile maps and scrolling viewports for scenes larger than the display.
+
+A TileMap is a grid of indices into a set of 8 x 8 pixel tiles.  A Viewport
+shows part of the map on a canvas.  Scrolling moves the pixels already on
+the canvas and only composes the newly exposed columns and rows from tiles.
+
+Usage:
+    tiles = TileMap.slice_tiles(load_bitmap('tiles.pbm', 0, 0))
+    world = TileMap(tiles, cells)
+    view = Viewport(glcd.canvas, world)
+    view.scroll(3, 0)
+    glcd.flip()
+"""
+from __future__ import print_function
+import numpy as np
+
+TILE_SIZE = 8
+
+
+class TileMap(object):
+    """Grid of 8 x 8 pixel tiles
+    Attributes:
+        tiles: A 3D Numpy array of tile pixels (tiles, 8, 8)
+        cells: A 2D Numpy array of tile indices (rows, columns)
+        width: Pixel width of map
+        height: Pixel height of map
+    """
+
+    def __init__(self, tiles, cells):
+        """Constructor for tile map.
+        Args:
+            tiles (Numpy 3D array): Tile pixels (tiles, 8, 8)
+            cells (Numpy 2D array): Tile index of each cell (rows, columns)
+        """
+        self.tiles = np.asarray(tiles, dtype='uint8')
+        self.cells = np.array(cells, dtype='intp')
+        self.height = self.cells.shape[0] * TILE_SIZE
+        self.width = self.cells.shape[1] * TILE_SIZE
+
+    @staticmethod
+    def slice_tiles(bitmap):
+        """Cuts a bitmap into tiles
+        Args:
+            bitmap (Numpy 2D array): Tile sheet (dimensions are multiples of 8)
+        Returns:
+            Numpy 3D array (uint8): Tiles in reading order (tiles, 8, 8)
+        """
+        rows, cols = bitmap.shape[0] // TILE_SIZE, bitmap.shape[1] // TILE_SIZE
+        sheet = bitmap[:rows * TILE_SIZE, :cols * TILE_SIZE]
+        return sheet.reshape(rows, TILE_SIZE, cols, TILE_SIZE).swapaxes(1, 2).reshape(
+            -1, TILE_SIZE, TILE_SIZE)
+
+    def get_pixels(self, x, y, w, h):
+        """Composes a region of the map from tiles
+        Args:
+            x, y (int): Top left map coordinates of region
+            w, h (int): Width & height in pixels of region
+        Returns:
+            Numpy 2D array (uint8): Region pixels (areas outside the map are 0)
+        """
+        pixels = np.zeros((h, w), dtype='uint8')
+        # Clip region to map
+        x1, y1 = max(x, 0), max(y, 0)
+        x2, y2 = min(x + w, self.width), min(y + h, self.height)
+        if x1 >= x2 or y1 >= y2:
+            return pixels
+        # Gather covering tiles in one operation then lay them out as pixels
+        c1, r1 = x1 // TILE_SIZE, y1 // TILE_SIZE
+        c2, r2 = (x2 - 1) // TILE_SIZE + 1, (y2 - 1) // TILE_SIZE + 1
+        block = self.tiles[self.cells[r1:r2, c1:c2]]
+        block = block.swapaxes(1, 2).reshape((r2 - r1) * TILE_SIZE, (c2 - c1) * TILE_SIZE)
+        ox, oy = x1 - c1 * TILE_SIZE, y1 - r1 * TILE_SIZE
+        pixels[y1 - y:y2 - y, x1 - x:x2 - x] = block[oy:oy + y2 - y1, ox:ox + x2 - x1]
+        return pixels
+
+
+class Viewport(object):
+    """Visible part of a tile map drawn on a canvas
+    Attributes:
+        canvas: Target canvas (the whole canvas shows the viewport)
+        tilemap: TileMap object
+        x, y: Map coordinates of the top left corner
+        pixels_rendered: Number of pixels composed from tiles
+    """
+
+    def __init__(self, canvas, tilemap, x=0, y=0):
+        """Constructor for viewport.
+        Args:
+            canvas (Canvas object): Target canvas (e.g. glcd.canvas)
+            tilemap (TileMap object): Map to show
+            x, y (Optional int): Map coordinates of the top left corner. Default is 0.
+        """
+        self.canvas = canvas
+        self.tilemap = tilemap
+        self.pixels_rendered = 0
+        self.x, self.y = self.clamp(x, y)
+        self.render()
+
+    def clamp(self, x, y):
+        """Limits a position so the viewport stays on the map
+        Args:
+            x, y (int): Map coordinates of the top left corner
+        Returns:
+            int, int: Clamped coordinates
+        """
+        max_x = max(self.tilemap.width - self.canvas.width, 0)
+        max_y = max(self.tilemap.height - self.canvas.height, 0)
+        return min(max(x, 0), max_x), min(max(y, 0), max_y)
+
+    def render_region(self, x, y, w, h):
+        """Composes a canvas region from tiles
+        Args:
+            x, y (int): Top left canvas coordinates of region
+            w, h (int): Width & height in pixels of region
+        """
+        if w <= 0 or h <= 0:
+            return
+        self.canvas.buffer[y:y + h, x:x + w] = self.tilemap.get_pixels(
+            self.x + x, self.y + y, w, h)
+        self.pixels_rendered += w * h
+
+    def render(self):
+        """Composes the whole viewport"""
+        self.render_region(0, 0, self.canvas.width, self.canvas.height)
+
+    def scroll_to(self, x, y):
+        """Moves the viewport
+        Args:
+            x, y (int): Map coordinates of the top left corner
+        Returns:
+            boolean: True if the viewport moved
+        """
+        x, y = self.clamp(x, y)
+        dx, dy = x - self.x, y - self.y
+        if not dx and not dy:
+            return False
+        self.x, self.y = x, y
+        w, h = self.canvas.width, self.canvas.height
+        if abs(dx) >= w or abs(dy) >= h:
+            self.render()
+            return True
+        # Move pixels still visible
+        buffer = self.canvas.buffer
+        buffer[max(-dy, 0):h - max(dy, 0), max(-dx, 0):w - max(dx, 0)] = \
+            buffer[max(dy, 0):h - max(-dy, 0), max(dx, 0):w - max(-dx, 0)].copy()
+        # Compose exposed rows then exposed columns (without the rows)
+        if dy > 0:
+            self.render_region(0, h - dy, w, dy)
+        elif dy < 0:
+            self.render_region(0, 0, w, -dy)
+        y1, y2 = max(-dy, 0), h - max(dy, 0)
+        if dx > 0:
+            self.render_region(w - dx, y1, dx, y2 - y1)
+        elif dx < 0:
+            self.render_region(0, y1, -dx, y2 - y1)
+        return True
+
+    def scroll(self, dx, dy):
+        """Moves the viewport relative to its position
+        Args:
+            dx, dy (int): Pixels to move (positive moves right and down)
+        Returns:
+            boolean: True if the viewport moved
+        """
+        return self.scroll_to(self.x + dx, self.y + dy)
+
+    def set_cell(self, row, col, tile):
+        """Changes a map cell and redraws it if visible
+        Args:
+            row, col (int): Map cell
+            tile (int): Tile index
+        Returns:
+            (int, int, int, int): Changed canvas region x, y, w, h or None if not visible
+        """
+        self.tilemap.cells[row, col] = tile
+        x1 = max(col * TILE_SIZE - self.x, 0)
+        y1 = max(row * TILE_SIZE - self.y, 0)
+        x2 = min((col + 1) * TILE_SIZE - self.x, self.canvas.width)
+        y2 = min((row + 1) * TILE_SIZE - self.y, self.canvas.height)
+        if x1 >= x2 or y1 >= y2:
+            return None
+        self.render_region(x1, y1, x2 - x1, y2 - y1)
+        return x1, y1, x2 - x1, y2 - y1
@@ -0,0 +1,251 @@
+""" Records and replays the command/data stream sent to the display.
+
+TraceRecorder wraps send_command and send_data of a Glcd and writes every
+transfer with a timestamp to a compact binary trace.  Frame markers are
+written at each Glcd.end_frame, which follows every flip, flip_region,
+clear_display and the page writes of consoles, stream players, grayscale
+drivers and shared bus flushes.  Call mark_frame for other transfers.
+Traces can be replayed into the emulated board (or a real display) at the
+original pace or as fast as possible to analyse where transfer time goes.
+
+File layout (little endian):
+    header    magic 'ST7565TR', version (H)
+    records   kind (B), microseconds since previous record (I), length (H), payload
+
+Replay a trace:
+    python transport_trace.py unit7.trace --speed 1000000
+"""
+from __future__ import print_function
+import argparse
+from inspect import signature
+import struct
+import time
+
+MAGIC = b'ST7565TR'
+VERSION = 1
+HEADER = struct.Struct('<8sH')
+RECORD = struct.Struct('<BIH')
+# Record kinds
+COMMAND = 0
+DATA = 1
+FRAME = 2
+
+
+class TraceRecorder(object):
+    """Records the transfers of a Glcd
+    Attributes:
+        records: Number of records written
+    """
+
+    def __init__(self, glcd, path):
+        """Constructor for trace recorder.
+        Args:
+            glcd (Glcd object): Display to record (its methods are wrapped until close)
+            path (string): Full trace file path
+        """
+        self.glcd = glcd
+        self.records = 0
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION))
+        self.last = time.time()
+        # Wrap instance methods (later calls inside the Glcd go through them)
+        self.wrapped = {}
+        self.wrap('send_command', COMMAND)
+        self.wrap('send_data', DATA)
+        self.wrap('end_frame', FRAME)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def wrap(self, name, kind):
+        """Replaces a Glcd method with one that records its calls
+        Args:
+            name (string): Method name
+            kind (int): COMMAND or DATA records the bytes, FRAME marks the end of a frame
+        """
+        method = getattr(self.glcd, name)
+        self.wrapped[name] = method
+        sig = signature(method)
+
+        def recorded(*args, **kwargs):
+            if kind == FRAME:
+                method(*args, **kwargs)
+                self.mark_frame()
+            else:
+                # Bytes are the first argument whatever it is named
+                bound = sig.bind(*args, **kwargs)
+                self.record(kind, next(iter(bound.arguments.values())))
+                method(*args, **kwargs)
+        setattr(self.glcd, name, recorded)
+
+    def record(self, kind, payload=()):
+        """Writes a record
+        Args:
+            kind (int): COMMAND, DATA or FRAME
+            payload ([int]): Bytes sent
+        """
+        now = time.time()
+        elapsed = min(int((now - self.last) * 1e6), 0xffffffff)
+        self.last = now
+        payload = bytearray(payload)
+        self.file.write(RECORD.pack(kind, elapsed, len(payload)))
+        self.file.write(payload)
+        self.records += 1
+
+    def mark_frame(self):
+        """Marks the end of a frame"""
+        self.record(FRAME)
+
+    def close(self):
+        """Restores the Glcd methods and closes the trace"""
+        for name in self.wrapped:
+            # Remove the instance attribute so the class method is used again
+            delattr(self.glcd, name)
+        self.wrapped = {}
+        if not self.file.closed:
+            self.file.close()
+
+
+def read_trace(path):
+    """Reads a trace
+    Args:
+        path (string): Full trace file path
+    Returns:
+        [(int, float, bytes)]: Kind, seconds since the start and payload of each record
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('{0} is not a version {1} display trace.'.format(path, VERSION))
+    records = []
+    pos = HEADER.size
+    timestamp = 0.0
+    while pos + RECORD.size <= len(data):
+        kind, elapsed, length = RECORD.unpack_from(data, pos)
+        pos += RECORD.size
+        timestamp += elapsed / 1e6
+        records.append((kind, timestamp, data[pos:pos + length]))
+        pos += length
+    return records
+
+
+class FrameStats(object):
+    """Transfer statistics of one frame
+    Attributes:
+        command_bytes, data_bytes: Bytes sent in command and data mode
+        transfers: Number of transfers
+        recorded: Seconds the frame took when recorded
+        replayed: Seconds the frame took to replay
+        bus: Seconds the transfers occupied the emulated bus (None for real SPI)
+    """
+
+    def __init__(self):
+        self.command_bytes = 0
+        self.data_bytes = 0
+        self.transfers = 0
+        self.recorded = 0.0
+        self.replayed = 0.0
+        self.bus = None
+
+
+def replay(records, glcd, realtime=False, spi=None):
+    """Sends recorded transfers to a display
+    Args:
+        records ([(int, float, bytes)]): Trace records (see read_trace)
+        glcd (Glcd object): Target display (emulated or real)
+        realtime (Optional boolean): Keep the recorded pace. Default is False (maximum speed).
+        spi (Optional EmulatedSpi): Emulated transport of glcd to measure bus time.
+    Returns:
+        [FrameStats]: Statistics per frame (transfers after the last marker form a final frame)
+    """
+    frames = []
+    stats = FrameStats()
+    start = time.time()
+    frame_start, frame_recorded = start, records[0][1] if records else 0.0
+    bus_start = spi.busy_time if spi is not None else 0.0
+    for kind, timestamp, payload in records:
+        if realtime:
+            delay = timestamp - (time.time() - start)
+            if delay > 0:
+                time.sleep(delay)
+        if kind == FRAME:
+            now = time.time()
+            stats.recorded = timestamp - frame_recorded
+            stats.replayed = now - frame_start
+            if spi is not None:
+                stats.bus = spi.busy_time - bus_start
+                bus_start = spi.busy_time
+            frames.append(stats)
+            stats = FrameStats()
+            frame_start, frame_recorded = now, timestamp
+            continue
+        if kind == COMMAND:
+            glcd.send_command(list(payload))
+            stats.command_bytes += len(payload)
+        else:
+            glcd.send_data(list(payload))
+            stats.data_bytes += len(payload)
+        stats.transfers += 1
+    if stats.transfers:
+        stats.recorded = records[-1][1] - frame_recorded
+        stats.replayed = time.time() - frame_start
+        if spi is not None:
+            stats.bus = spi.busy_time - bus_start
+        frames.append(stats)
+    return frames
+
+
+def print_report(frames):
+    """Prints a summary of frame statistics
+    Args:
+        frames ([FrameStats]): Statistics per frame
+    """
+    if not frames:
+        print('No transfers in trace.')
+        return
+    count = float(len(frames))
+    commands = sum(f.command_bytes for f in frames)
+    data = sum(f.data_bytes for f in frames)
+    transfers = sum(f.transfers for f in frames)
+    print('Frames:            {0}'.format(len(frames)))
+    print('Bytes per frame:   {0:.1f} data, {1:.1f} command'.format(data / count, commands / count))
+    print('Command overhead:  {0:.1f}% of bytes, {1:.1f} transfers per frame'.format(
+        100.0 * commands / max(commands + data, 1), transfers / count))
+    print('Time per frame:    {0:.2f} ms recorded, {1:.2f} ms replayed'.format(
+        sum(f.recorded for f in frames) * 1000 / count,
+        sum(f.replayed for f in frames) * 1000 / count))
+    if frames[0].bus is not None:
+        print('Bus time:          {0:.2f} ms per frame'.format(
+            sum(f.bus for f in frames) * 1000 / count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('trace', help='trace file')
+    parser.add_argument('--realtime', action='store_true', help='keep the recorded pace')
+    parser.add_argument('--hardware', action='store_true', help='replay to the real display')
+    parser.add_argument('--speed', type=int, default=250000, help='emulated SPI clock in Hz')
+    args = parser.parse_args()
+
+    records = read_trace(args.trace)
+    spi = None
+    if args.hardware:
+        import st7565
+        glcd = st7565.Glcd()
+    else:
+        import emulator
+        board = emulator.EmulatedBoard(speed_hz=args.speed, realtime=args.realtime)
+        glcd = board.glcd()
+        spi = board.spi
+    print_report(replay(records, glcd, args.realtime, spi))
+    if not args.hardware:
+        # Cleanup clears the display, so a real panel keeps the last frame
+        glcd.cleanup()
+
+
+if __name__ == '__main__':
+    main()
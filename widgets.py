@@ -0,0 +1,324 @@
+""" Retained mode widgets with damage region updates.
+
+Widgets keep their own state and bounding box.  Changing a widget property
+marks its bounding box as damaged.  Screen.update redraws only the widgets
+overlapping the damage and sends each damaged region with flip_region.
+Regions are merged when one transfer is no larger than two, and the whole
+frame is flipped when that is cheaper than the regions.
+
+Usage:
+    screen = Screen(glcd)
+    temp = screen.add(Label(0, 0, 64, 8, 'Temp', font))
+    bar = screen.add(ProgressBar(0, 10, 64, 6))
+    screen.update()
+    bar.value = 0.5
+    screen.update()    # Only sends the page under the bar
+"""
+from __future__ import print_function
+import math
+from canvas import Canvas
+
+
+class Widget(object):
+    """Base class for widgets
+    Attributes:
+        x, y: Top left coordinates
+        w, h: Width & height in pixels
+        visible: Draw the widget
+        screen: Screen showing the widget (None until added)
+    Note:
+        Setting an attribute listed in PROPERTIES damages the widget's old
+        and new bounding boxes.  Subclasses implement draw.
+    """
+    # Attributes that change the widget's appearance
+    PROPERTIES = ('x', 'y', 'w', 'h', 'visible')
+
+    def __init__(self, x, y, w, h):
+        self.screen = None
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+        self.visible = True
+
+    def __setattr__(self, name, value):
+        if name in self.PROPERTIES and name in self.__dict__:
+            try:
+                changed = bool(self.__dict__[name] != value)
+            except ValueError:
+                # Arrays are always treated as changed
+                changed = True
+            if not changed:
+                return
+            self.invalidate()
+            object.__setattr__(self, name, value)
+            self.invalidate()
+            return
+        object.__setattr__(self, name, value)
+
+    @property
+    def bounds(self):
+        """Bounding box x, y, w, h"""
+        return self.x, self.y, self.w, self.h
+
+    def invalidate(self):
+        """Marks the widget's bounding box as damaged"""
+        if self.screen is not None:
+            self.screen.invalidate(*self.bounds)
+
+    def draw(self, canvas):
+        """Draws the widget
+        Args:
+            canvas (Canvas object): Target canvas
+        """
+        raise NotImplementedError
+
+
+class Label(Widget):
+    """Text in a box (see Canvas.draw_text_box)"""
+    PROPERTIES = Widget.PROPERTIES + ('text', 'font', 'align', 'spacing', 'invert')
+
+    def __init__(self, x, y, w, h, text, font, align='left', spacing=1, invert=False):
+        """Constructor for label.
+        Args:
+            x, y (int): Top left coordinates
+            w, h (int): Width & height in pixels
+            text (string): Text
+            font (XglcdFont object): Font
+            align (Optional string): left, center or right. Default is left.
+            spacing (Optional int): Pixel spacing between letters. Default is 1.
+            invert (Optional boolean): Light text on a dark box. Default is False.
+        """
+        super(Label, self).__init__(x, y, w, h)
+        self.text = text
+        self.font = font
+        self.align = align
+        self.spacing = spacing
+        self.invert = invert
+
+    def draw(self, canvas):
+        if self.invert:
+            canvas.fill_rectangle(self.x, self.y, self.w, self.h)
+        canvas.draw_text_box(self.text, self.font, self.x, self.y, self.w, self.h,
+                             self.align, self.spacing, invert=self.invert)
+
+
+class Bitmap(Widget):
+    """Monochrome bitmap"""
+    PROPERTIES = Widget.PROPERTIES + ('bitmap',)
+
+    def __init__(self, x, y, bitmap):
+        """Constructor for bitmap.
+        Args:
+            x, y (int): Top left coordinates
+            bitmap (Numpy 2D array): Pixels (assign a new array to change it)
+        """
+        height, width = bitmap.shape
+        super(Bitmap, self).__init__(x, y, width, height)
+        self.bitmap = bitmap
+
+    def draw(self, canvas):
+        canvas.blit(Canvas(self.bitmap.shape[1], self.bitmap.shape[0], self.bitmap),
+                    self.x, self.y)
+
+
+class ProgressBar(Widget):
+    """Horizontal bar filled to a fraction"""
+    PROPERTIES = Widget.PROPERTIES + ('value', 'pattern')
+
+    def __init__(self, x, y, w, h, value=0, pattern=None):
+        """Constructor for progress bar.
+        Args:
+            x, y (int): Top left coordinates
+            w, h (int): Width & height in pixels (including outline)
+            value (Optional float): Fraction filled 0.0 to 1.0. Default is 0.
+            pattern (Optional Numpy 2D array or float): Fill pattern or gray
+                level (see Canvas.fill_rectangle). Default is None (solid).
+        """
+        super(ProgressBar, self).__init__(x, y, w, h)
+        self.value = value
+        self.pattern = pattern
+
+    def draw(self, canvas):
+        canvas.draw_rectangle(self.x, self.y, self.w, self.h)
+        fill = int(round((self.w - 2) * min(max(self.value, 0), 1)))
+        if fill > 0 and self.h > 2:
+            canvas.fill_rectangle(self.x + 1, self.y + 1, fill, self.h - 2,
+                                  pattern=self.pattern)
+
+
+class Gauge(Widget):
+    """Round dial with a needle"""
+    PROPERTIES = Widget.PROPERTIES + ('value', 'minimum', 'maximum', 'ticks',
+                                     'start', 'sweep')
+
+    def __init__(self, x0, y0, r, value=0, minimum=0, maximum=100, ticks=0,
+                 start=135, sweep=270):
+        """Constructor for gauge.
+        Args:
+            x0, y0 (int): Center point coordinates
+            r (int): Radius
+            value (Optional float): Needle value. Default is 0.
+            minimum, maximum (Optional float): Scale range. Default is 0 to 100.
+            ticks (Optional int): Number of scale divisions marked. Default is 0.
+            start (Optional float): Angle of the minimum in degrees clockwise
+                from 3 o'clock. Default is 135.
+            sweep (Optional float): Degrees from minimum to maximum. Default is 270.
+        """
+        super(Gauge, self).__init__(x0 - r, y0 - r, 2 * r + 1, 2 * r + 1)
+        self.value = value
+        self.minimum = minimum
+        self.maximum = maximum
+        self.ticks = ticks
+        self.start = start
+        self.sweep = sweep
+
+    def get_point(self, value, radius):
+        """Gets the coordinates of a scale value at a distance from the center"""
+        fraction = (value - self.minimum) / float(self.maximum - self.minimum)
+        theta = math.radians(self.start + self.sweep * min(max(fraction, 0), 1))
+        r = self.w // 2
+        return (int(round(self.x + r + radius * math.cos(theta))),
+                int(round(self.y + r + radius * math.sin(theta))))
+
+    def draw(self, canvas):
+        r = self.w // 2
+        x0, y0 = self.x + r, self.y + r
+        canvas.draw_circle(x0, y0, r)
+        # Scale divisions
+        for idx in range(self.ticks + 1 if self.ticks else 0):
+            value = self.minimum + (self.maximum - self.minimum) * idx / float(self.ticks)
+            canvas.draw_line(*(self.get_point(value, r - 3) + self.get_point(value, r - 1)))
+        canvas.draw_line(x0, y0, *self.get_point(self.value, r - 4))
+
+
+def get_union(a, b):
+    """Gets the bounding box of two regions (x, y, w, h)"""
+    x1, y1 = min(a[0], b[0]), min(a[1], b[1])
+    x2, y2 = max(a[0] + a[2], b[0] + b[2]), max(a[1] + a[3], b[1] + b[3])
+    return x1, y1, x2 - x1, y2 - y1
+
+
+class Screen(object):
+    """Widgets shown on a display
+    Attributes:
+        display: Glcd (or any object with a canvas and flip_region)
+        widgets: Widgets in drawing order
+        damage: Damaged regions (x, y, w, h) since the last update
+    """
+    # Command bytes sent to position the cursor for each page write
+    PAGE_OVERHEAD = 3
+
+    def __init__(self, display):
+        """Constructor for screen.
+        Args:
+            display (Glcd object): Display to draw on
+        """
+        self.display = display
+        self.widgets = []
+        self.damage = []
+        canvas = display.canvas
+        self.invalidate(0, 0, canvas.width, canvas.height)
+
+    def add(self, widget):
+        """Adds a widget on top of the others
+        Args:
+            widget (Widget object): Widget
+        Returns:
+            Widget object: The added widget
+        """
+        widget.screen = self
+        self.widgets.append(widget)
+        widget.invalidate()
+        return widget
+
+    def remove(self, widget):
+        """Removes a widget
+        Args:
+            widget (Widget object): Widget
+        """
+        widget.invalidate()
+        self.widgets.remove(widget)
+        widget.screen = None
+
+    def invalidate(self, x, y, w, h):
+        """Marks a region as damaged
+        Args:
+            x, y (int): Top left coordinates of region
+            w, h (int): Width & height in pixels of region
+        """
+        canvas = self.display.canvas
+        # Clip region to canvas
+        x1, y1 = max(x, 0), max(y, 0)
+        x2, y2 = min(x + w, canvas.width), min(y + h, canvas.height)
+        if x1 < x2 and y1 < y2:
+            self.damage.append((x1, y1, x2 - x1, y2 - y1))
+
+    def get_cost(self, region):
+        """Gets the bytes sent to flip a region
+        Args:
+            region ((int, int, int, int)): x, y, w, h
+        Returns:
+            int: Data and cursor command bytes
+        """
+        x, y, w, h = region
+        get_panel_region = getattr(self.display, 'get_panel_region', None)
+        if get_panel_region is not None:
+            # Pages run along the panel, not the rotated canvas
+            x, y, w, h = get_panel_region(x, y, w, h)
+        pages = ((y + h - 1) >> 3) - (y >> 3) + 1
+        return (w + self.PAGE_OVERHEAD) * pages
+
+    def get_regions(self):
+        """Merges the damaged regions
+        Returns:
+            [(int, int, int, int)]: Regions x, y, w, h to send
+        Note:
+            Two regions are merged when their bounding box costs no more to
+            send than the pair (e.g. overlapping or sharing the same pages).
+        """
+        regions = list(self.damage)
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(regions)):
+                for j in range(i + 1, len(regions)):
+                    union = get_union(regions[i], regions[j])
+                    if self.get_cost(union) <= self.get_cost(regions[i]) + self.get_cost(regions[j]):
+                        regions[i] = union
+                        del regions[j]
+                        merged = True
+                        break
+                if merged:
+                    break
+        return regions
+
+    def update(self, flip=True):
+        """Redraws damaged widgets
+        Args:
+            flip (Optional boolean): Send the damaged regions to the display. Default is True.
+        Returns:
+            [(int, int, int, int)]: Regions redrawn x, y, w, h (empty if nothing changed)
+        """
+        regions = self.get_regions()
+        self.damage = []
+        if not regions:
+            return regions
+        canvas = self.display.canvas
+        # Draw overlapping widgets on scratch so only the damaged regions change
+        scratch = Canvas(canvas.width, canvas.height)
+        for widget in self.widgets:
+            wx, wy, ww, wh = widget.bounds
+            if widget.visible and any(wx < x + w and x < wx + ww and wy < y + h and y < wy + wh
+                                      for x, y, w, h in regions):
+                widget.draw(scratch)
+        for x, y, w, h in regions:
+            canvas.buffer[y:y + h, x:x + w] = scratch.buffer[y:y + h, x:x + w]
+        if flip:
+            full = (0, 0, canvas.width, canvas.height)
+            if sum(self.get_cost(r) for r in regions) >= self.get_cost(full):
+                self.display.flip()
+            else:
+                for region in regions:
+                    self.display.flip_region(*region)
+        return regions
@@ -9,6 +9,7 @@ class XglcdFont(object):
         height: Pixel height of font
         start_letter: ASCII number of first letter
         height_bytes: How many bytes comprises letter height
+        widths: A 1D Numpy array of letter widths indexed by ASCII number
         
     Note: 
         Font files can be generated with the free version of MikroElektronika 
@@ -32,6 +33,9 @@ class XglcdFont(object):
         self.start_letter = start_letter
         self.letters = self.__load_xglcd_font(path)
         self.height_bytes = int((self.letters.shape[1] - 1) / width)
+        # Width table indexed by ASCII number (0 below start letter)
+        self.widths = np.zeros(start_letter + len(self.letters), dtype='int32')
+        self.widths[start_letter:] = self.letters[:, 0]
 
                       
     def __load_xglcd_font(self, path):
@@ -90,6 +94,25 @@ class XglcdFont(object):
             return letter[: , -self.height :]
             
             
+    def get_codes(self, text):
+        """Converts text to an array of ASCII numbers
+        Args:
+            text (string): Text string
+        Returns:
+            Numpy Array(intp): ASCII number of each letter
+        """
+        return np.frombuffer(text.encode('utf-32-le'), dtype='<u4').astype(np.intp)
+
+    def measure_advances(self, text, spacing=1):
+        """Measure horizontal advance of each letter in pixels
+        Args:
+            text (string): Text string to measure
+            spacing (optional int): Pixel spacing between letters.  Default is 1.
+        Returns:
+            Numpy Array(int32): Width plus spacing of each letter
+        """
+        return self.widths[self.get_codes(text)] + spacing
+
     def measure_text(self, text, spacing=1):
         """Measure length of text string in pixels
         Args:
@@ -98,13 +121,5 @@ class XglcdFont(object):
         Returns:
             int: length of text
         """
-        length = 0
-        for letter in text:
-            # Get index of letter
-            letter_ord = ord(letter) - self.start_letter
-            # Add length of letter and spacing
-            length += self.letters[letter_ord, 0] + spacing
-        return length
-            
-            
-            
+        # Sum width and spacing of all letters using the width table
+        return int(self.widths[self.get_codes(text)].sum()) + spacing * len(text)